@@ -0,0 +1,123 @@
+# VaaniSeva – IVF approximate nearest-neighbour index
+# Brute force (one mat-vec over every knowledge vector) is fine for thousands of
+# rows; district-level scheme variants and mandi FAQs take the index into the
+# hundreds of thousands, where it no longer fits a turn's budget.
+#
+# Inverted file (IVF): spherical k-means splits the unit-length rows into
+# n_lists clusters. A query scores the centroids, takes the n_probe nearest
+# lists and scores only the rows in them. Recall is tuned with n_probe
+# (ANN_NPROBE): more lists probed → higher recall, more rows scored.
+#
+# Built offline by vector_index.publish_snapshot() (seed scripts) and stored next
+# to the knowledge snapshot as v{version}-{id}.ivf.npz. Admin edits in the Lambda
+# re-assign rows to the existing centroids instead of re-training.
+
+import io
+import os
+
+import numpy as np
+
+BUILD_MIN_ROWS = int(os.environ.get("ANN_BUILD_MIN_ROWS", "5000"))   # below this brute force wins
+NPROBE         = int(os.environ.get("ANN_NPROBE", "8"))
+KMEANS_ITERS   = 12
+TRAIN_PER_LIST = 64        # k-means trains on at most n_lists * TRAIN_PER_LIST sampled rows
+_BATCH         = 8192      # rows per assignment mat-mul (bounds peak memory)
+
+
+def default_lists(n_rows: int) -> int:
+    """≈ √n lists, the usual IVF sizing."""
+    return max(1, int(np.sqrt(n_rows)))
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid (max inner product) for every row."""
+    out = np.empty(matrix.shape[0], dtype=np.int32)
+    for start in range(0, matrix.shape[0], _BATCH):
+        block = np.asarray(matrix[start:start + _BATCH], dtype=np.float32)
+        out[start:start + _BATCH] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def train_centroids(matrix: np.ndarray, n_lists: int, iters: int = KMEANS_ITERS, seed: int = 0) -> np.ndarray:
+    """Spherical k-means over (a sample of) unit rows. Returns (n_lists, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    n = matrix.shape[0]
+    n_lists = min(n_lists, n)
+    sample_size = min(n, n_lists * TRAIN_PER_LIST)
+    sample = np.asarray(matrix[np.sort(rng.choice(n, sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+    for _ in range(iters):
+        labels = _assign(sample, centroids)
+        counts = np.bincount(labels, minlength=n_lists)
+        empty = counts == 0
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[~empty]
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(sample[np.argsort(labels, kind="stable")], starts, axis=0)
+        if empty.any():   # re-seed empty lists from random sample rows
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+        centroids = _normalise(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted lists over the rows of a unit-row matrix (the matrix itself is not stored)."""
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray):
+        self.centroids = np.asarray(centroids, dtype=np.float32)   # (n_lists, dim)
+        self.order     = np.asarray(order, dtype=np.int32)         # row ids grouped by list
+        self.offsets   = np.asarray(offsets, dtype=np.int64)       # list i = order[offsets[i]:offsets[i+1]]
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, n_lists: int | None = None, centroids: np.ndarray | None = None,
+              seed: int = 0) -> "IVFIndex":
+        """Train centroids (unless given) and bucket every row of matrix."""
+        if centroids is None:
+            centroids = train_centroids(matrix, n_lists or default_lists(matrix.shape[0]), seed=seed)
+        labels = _assign(matrix, centroids)
+        order = np.argsort(labels, kind="stable").astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(centroids)))])
+        return cls(centroids, order, offsets)
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.order)
+
+    def candidates(self, query: np.ndarray, n_probe: int = NPROBE) -> np.ndarray:
+        """Row ids in the n_probe lists whose centroids are nearest to the (unit) query."""
+        n_probe = max(1, min(n_probe, self.n_lists))
+        sims = self.centroids @ query
+        lists = np.argpartition(-sims, n_probe - 1)[:n_probe] if n_probe < self.n_lists else np.arange(self.n_lists)
+        return np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in lists])
+
+    def search(self, matrix: np.ndarray, query: np.ndarray, k: int, n_probe: int = NPROBE) -> tuple:
+        """(scores, row ids) of the approximate top k, best first."""
+        rows = self.candidates(query, n_probe)
+        if not len(rows):
+            return np.zeros(0, dtype=np.float32), rows
+        scores = np.asarray(matrix[rows] @ query)
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return scores[top], rows[top]
+
+    # ── Serialisation ─────────────────────────────────────────
+    def to_bytes(self) -> bytes:
+        buf = io.BytesIO()
+        np.savez(buf, centroids=self.centroids, order=self.order, offsets=self.offsets)
+        return buf.getvalue()
+
+    @classmethod
+    def from_file(cls, path_or_buffer) -> "IVFIndex":
+        with np.load(path_or_buffer, allow_pickle=False) as data:
+            return cls(data["centroids"], data["order"], data["offsets"])
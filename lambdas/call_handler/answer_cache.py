@@ -0,0 +1,161 @@
+# VaaniSeva – Semantic answer cache
+# Callers ask the same few questions all day (PM-Kisan amount, Ayushman card,
+# MGNREGA days). A fast-path answer to a self-contained question is stored with
+# the embedding of the normalised question and the TTS cache keys of its audio;
+# the next caller whose question embeds within ANSWER_CACHE_THRESHOLD (cosine) of
+# it, in the same language and with the same agent, is served the stored answer
+# and audio — no Bedrock stream, no TTS call.
+#
+# Entries live in vaaniseva-answer-cache, partitioned by
+#   bucket = "{language}#{agent}#v{knowledge index version}"
+# so an admin RAG edit (which bumps the version stamp, see vector_index.py) moves
+# every container to a fresh, empty bucket; old entries simply expire by TTL.
+# Each container keeps the buckets it has used as a NumPy matrix and re-reads
+# them from the table at most every ANSWER_CACHE_REFRESH_SECONDS, so a lookup is
+# one mat-vec product. Embeddings are stored as raw float32 bytes.
+#
+# Table: DYNAMODB_ANSWER_CACHE_TABLE, bucket (hash) + entry_id (range), TTL "ttl"
+#   — created by scripts/create_answer_cache_table.py
+
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+
+import numpy as np
+from boto3.dynamodb.conditions import Key
+
+from phrase_matcher import normalize
+
+logger = logging.getLogger()
+
+TABLE_NAME           = os.environ.get("DYNAMODB_ANSWER_CACHE_TABLE", "vaaniseva-answer-cache")
+SIMILARITY_THRESHOLD = float(os.environ.get("ANSWER_CACHE_THRESHOLD", "0.93"))
+TTL_SECONDS          = int(float(os.environ.get("ANSWER_CACHE_TTL_HOURS", "24")) * 3600)
+REFRESH_SECONDS      = float(os.environ.get("ANSWER_CACHE_REFRESH_SECONDS", "60"))
+MAX_BUCKET_ENTRIES   = 1000   # per language/agent in memory
+
+_PUNCT = re.compile(r"[^\w\s\u0900-\u0DFF]")
+
+
+def normalise_query(text: str) -> str:
+    """Casefolded, punctuation-free form of a question — what gets embedded."""
+    return re.sub(r"\s+", " ", _PUNCT.sub(" ", normalize(text))).strip()
+
+
+def _unit(vector) -> np.ndarray | None:
+    v = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(v)
+    return v / norm if norm else None
+
+
+class _Bucket:
+    def __init__(self, entries: list, matrix: np.ndarray):
+        self.entries   = entries
+        self.matrix    = matrix
+        self.loaded_at = time.time()
+
+
+class AnswerCache:
+    """Nearest-question lookup over stored fast-path answers."""
+
+    def __init__(self, table, version_fn):
+        """version_fn() -> current knowledge index version stamp (int)."""
+        self.table      = table
+        self.version_fn = version_fn
+        self._buckets   = {}
+        self._lock      = threading.Lock()
+
+    def _bucket_key(self, language: str, agent: str) -> str:
+        return f"{language}#{agent}#v{self.version_fn()}"
+
+    # ── Loading ───────────────────────────────────────────────
+    def _read(self, bucket_key: str) -> _Bucket:
+        now = int(time.time())
+        entries, vectors = [], []
+        kwargs = {"KeyConditionExpression": Key("bucket").eq(bucket_key)}
+        while True:
+            resp = self.table.query(**kwargs)
+            for item in resp.get("Items", []):
+                if int(item.get("ttl", 0)) <= now or not item.get("embedding"):
+                    continue
+                vec = _unit(np.frombuffer(bytes(item["embedding"]), dtype=np.float32))
+                if vec is None:
+                    continue
+                entries.append({k: v for k, v in item.items() if k != "embedding"})
+                vectors.append(vec)
+            if "LastEvaluatedKey" not in resp:
+                break
+            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+        entries, vectors = entries[-MAX_BUCKET_ENTRIES:], vectors[-MAX_BUCKET_ENTRIES:]
+        matrix = np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+        return _Bucket(entries, matrix)
+
+    def _get_bucket(self, bucket_key: str) -> _Bucket:
+        bucket = self._buckets.get(bucket_key)
+        if bucket is not None and time.time() - bucket.loaded_at < REFRESH_SECONDS:
+            return bucket
+        bucket = self._read(bucket_key)
+        with self._lock:
+            self._buckets[bucket_key] = bucket
+        return bucket
+
+    # ── Public API ────────────────────────────────────────────
+    def lookup(self, language: str, agent: str, embedding) -> dict | None:
+        """Closest stored answer above the threshold: the entry plus its "score", or None."""
+        q = _unit(embedding)
+        if q is None:
+            return None
+        try:
+            bucket = self._get_bucket(self._bucket_key(language, agent))
+        except Exception as e:
+            logger.warning(f"Answer cache read failed: {e}")
+            return None
+        if not bucket.entries or bucket.matrix.shape[1] != q.shape[0]:
+            return None
+        scores = bucket.matrix @ q
+        best = int(np.argmax(scores))
+        if scores[best] < SIMILARITY_THRESHOLD:
+            return None
+        return {**bucket.entries[best], "score": float(scores[best])}
+
+    def store(self, language: str, agent: str, query: str, embedding, answer: str,
+              audio_keys: list, gen_ms: int) -> None:
+        """Persist one answer and add it to this container's copy of the bucket."""
+        vec = _unit(embedding)
+        if vec is None or not answer:
+            return
+        normalised = normalise_query(query)
+        bucket_key = self._bucket_key(language, agent)
+        item = {
+            "bucket":     bucket_key,
+            "entry_id":   hashlib.sha256(normalised.encode("utf-8")).hexdigest()[:24],
+            "query":      normalised,
+            "answer":     answer,
+            "audio_keys": list(audio_keys),
+            "gen_ms":     int(gen_ms),
+            "created_at": int(time.time()),
+            "ttl":        int(time.time()) + TTL_SECONDS,
+        }
+        try:
+            self.table.put_item(Item={**item, "embedding": vec.astype(np.float32).tobytes()})
+        except Exception as e:
+            logger.warning(f"Answer cache write failed: {e}")
+            return
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is not None and (not bucket.entries or bucket.matrix.shape[1] == vec.shape[0]):
+                entries = (bucket.entries + [item])[-MAX_BUCKET_ENTRIES:]
+                rows = [bucket.matrix] if bucket.entries else []
+                matrix = np.vstack(rows + [vec[None, :]])[-MAX_BUCKET_ENTRIES:]
+                fresh = _Bucket(entries, matrix)
+                fresh.loaded_at = bucket.loaded_at
+                self._buckets[bucket_key] = fresh
+        logger.info(f"Answer cached bucket={bucket_key} query='{normalised[:60]}' gen_ms={gen_ms}")
+
+    def clear(self) -> None:
+        """Drop every in-memory bucket (after an admin RAG edit in this container)."""
+        with self._lock:
+            self._buckets = {}
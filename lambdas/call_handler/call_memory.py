@@ -0,0 +1,96 @@
+# VaaniSeva – Rolling summary memory for long calls
+# The LLM used to get the last 10 raw turns on every request: with 500-char
+# answers that is thousands of input tokens by mid-call, and time-to-first-token
+# rises turn after turn. Instead, turns older than the most recent
+# MEMORY_RECENT_TURNS are folded into a short running summary kept on the call
+# record (memory_summary / memory_upto); the prompt gets summary + recent turns.
+#
+# Compaction runs as an async job (its own Lambda invocation, started by the
+# handler after a turn is written), and only once MEMORY_COMPACT_BATCH turns have
+# piled up beyond the recent window, so it costs one small utility-model call
+# every few turns, never on the response path.
+
+import os
+import logging
+
+logger = logging.getLogger()
+
+RECENT_TURNS      = int(os.environ.get("MEMORY_RECENT_TURNS", "3"))
+COMPACT_BATCH     = int(os.environ.get("MEMORY_COMPACT_BATCH", "3"))
+MAX_PROMPT_TURNS  = 10      # hard cap if compaction has fallen behind
+SUMMARY_MAX_TOKENS = 160
+
+
+def unsummarised(history: list, summary_upto: int) -> list:
+    """Turns not yet folded into the summary (turns still being written count as new)."""
+    return [t for t in history if t.get("turn_no", summary_upto + 1) > summary_upto]
+
+
+def prompt_turns(history: list, summary_upto: int) -> list:
+    """The raw turns to send alongside the summary, oldest first."""
+    return unsummarised(history, summary_upto)[-MAX_PROMPT_TURNS:]
+
+
+def system_suffix(summary: str) -> str:
+    """Text appended to the system prompt (after its static part) carrying the summary."""
+    if not summary:
+        return ""
+    return ("\n\nEARLIER IN THIS CALL (summary of previous turns — treat as things already "
+            f"discussed):\n{summary}")
+
+
+def needs_compaction(history: list, summary_upto: int) -> bool:
+    return len(unsummarised(history, summary_upto)) >= RECENT_TURNS + COMPACT_BATCH
+
+
+def _summary_prompt(summary: str, turns: list) -> str:
+    lines = []
+    for t in turns:
+        if t.get("query"):
+            lines.append(f"Caller: {t['query']}")
+        if t.get("answer"):
+            lines.append(f"Assistant: {t['answer']}")
+    return f"""Update the running summary of a phone call between a caller and a government-services assistant.
+Keep it under 80 words, in English. Keep every specific detail the caller gave (name, district, crop, family situation, scheme names, numbers) and note which questions were already answered and what was said.
+
+Current summary: {summary or "(none)"}
+
+New turns:
+{chr(10).join(lines)}
+
+Reply with only the updated summary."""
+
+
+def compact(session, summarise) -> bool:
+    """Fold turns older than the recent window into the session's summary.
+
+    summarise(prompt, max_tokens) -> str is the utility model call
+    (handler.call_bedrock_simple). Returns True when a new summary was stored.
+    """
+    history = session.history
+    upto = session.summary_upto
+    if not needs_compaction(history, upto):
+        return False
+    fold = [t for t in unsummarised(history, upto)[:-RECENT_TURNS] if "turn_no" in t]
+    if not fold:
+        return False
+
+    summary = summarise(_summary_prompt(session.summary, fold), max_tokens=SUMMARY_MAX_TOKENS)
+    if not summary:
+        return False
+    new_upto = int(fold[-1]["turn_no"])
+    try:
+        # Conditional: a concurrent compaction that got further must not be rolled back
+        session.table.update_item(
+            Key={"call_id": session.call_id, "timestamp": session.ts},
+            UpdateExpression="SET memory_summary = :s, memory_upto = :u",
+            ConditionExpression="attribute_not_exists(memory_upto) OR memory_upto < :u",
+            ExpressionAttributeValues={":s": summary, ":u": new_upto},
+        )
+    except Exception as e:
+        logger.info(f"Memory compaction not stored call={session.call_id}: {e}")
+        return False
+    session.item["memory_summary"] = summary
+    session.item["memory_upto"] = new_upto
+    logger.info(f"Memory compacted call={session.call_id} upto={new_upto} chars={len(summary)}")
+    return True
@@ -0,0 +1,194 @@
+# VaaniSeva – Per-request call session with write-behind
+# A Twilio turn used to look the call record up several times (history, voice,
+# turn logging, language/voice updates) — each a get_call_timestamp Query plus its
+# own get/update. A CallSession loads the record once per request and queues every
+# mutation; flush() writes them all in a single update_item (plus the new turn rows).
+#
+# The record's sort key is carried in TwiML action URLs as ?ts=..., so later hops
+# load it with one get_item instead of a Query. The record is read on first use,
+# so a hop that only needs the sort key for its URLs never reads it.
+#
+# The handler creates one session per request, passes it explicitly to whatever
+# needs it, and flushes it before the response is returned — work left on a
+# thread after that is frozen with the container.
+#
+# Conversation turns go to the turns table (turn_store.py): history is the last N
+# turns, read lazily, and flush() takes turn numbers from the queries_count it
+# increments in the same update.
+
+import time
+import logging
+import threading
+
+from boto3.dynamodb.conditions import Key
+
+logger = logging.getLogger()
+
+
+class CallSession:
+    """One call record, loaded once on first use; set()/append_turn() are queued until flush()."""
+
+    def __init__(self, table, call_id: str, item: dict | None = None, turns=None, ts=None):
+        self.table    = table
+        self.call_id  = call_id
+        self.turns    = turns      # TurnStore
+        self._item    = dict(item) if item is not None else None
+        self._ts_hint = ts         # sort key from ?ts=, if the caller has it
+        self._history = None       # last N turns, loaded on first use
+        self.load_failed = False   # the read errored — not the same as "no record"
+        self._sets    = {}
+        self._turns   = []
+        self._lock    = threading.Lock()
+
+    # ── Loaded state ─────────────────────────────────────────
+    @property
+    def item(self) -> dict:
+        """The call record ({} if there is none or it could not be read), read on first access."""
+        if self._item is None:
+            try:
+                self._item = _read(self.table, self.call_id, self._ts_hint)
+            except Exception as e:
+                logger.warning(f"Call session load failed call={self.call_id}: {e}")
+                self.load_failed = True
+                self._item = {}
+        return self._item
+
+    @property
+    def exists(self) -> bool:
+        return bool(self.item)
+
+    @property
+    def ts(self) -> int:
+        return int(self.item.get("timestamp", 0))
+
+    @property
+    def known_ts(self) -> str:
+        """Sort key for TwiML URLs without a read: the loaded record's, else the ?ts= hint."""
+        if self._item:
+            return str(self.ts)
+        return str(self._ts_hint or "")
+
+    @property
+    def history(self) -> list:
+        """The most recent turns (legacy list turns included), oldest first."""
+        if self._history is None:
+            self._history = self.turns.recent(self.call_id, legacy=self.item.get("conversation_history"))
+        return list(self._history)
+
+    @property
+    def history_loaded(self) -> bool:
+        return self._history is not None
+
+    @property
+    def language(self) -> str:
+        return self.item.get("language", "")
+
+    @property
+    def voice(self) -> str:
+        return self.item.get("voice_speaker", "")
+
+    @property
+    def agent(self) -> str:
+        return self.item.get("agent", "")
+
+    @property
+    def summary(self) -> str:
+        """Rolling summary of earlier turns (call_memory.py)."""
+        return self.item.get("memory_summary", "")
+
+    @property
+    def summary_upto(self) -> int:
+        """Last turn_no folded into the summary."""
+        return int(self.item.get("memory_upto", 0))
+
+    # ── Queued mutations ─────────────────────────────────────
+    @property
+    def dirty(self) -> bool:
+        with self._lock:
+            return bool(self._sets or self._turns)
+
+    def set(self, **fields) -> None:
+        """Queue SET field=value for every field whose value actually changes."""
+        with self._lock:
+            for k, v in fields.items():
+                if self.item.get(k) != v:
+                    self.item[k] = v
+                    self._sets[k] = v
+
+    def append_turn(self, query: str, answer: str, language: str) -> None:
+        entry = {"query": query, "answer": answer, "language": language, "ts": int(time.time())}
+        with self._lock:
+            if self._history is not None:
+                self._history.append(entry)
+            self._turns.append(entry)
+
+    def flush(self) -> bool:
+        """Write every queued mutation in one update_item. Returns False if the write failed."""
+        with self._lock:
+            sets, turns = self._sets, self._turns
+            self._sets, self._turns = {}, []
+        if not sets and not turns:
+            return True
+        if "timestamp" not in self.item:
+            # Never loaded (missing or a failed read): an update here would create a
+            # phantom record at timestamp 0 and overwrite the real call's turn rows
+            logger.warning(f"Call session flush skipped call={self.call_id}: record "
+                           f"{'could not be read' if self.load_failed else 'not found'}")
+            return False
+
+        names, values, parts = {}, {}, []
+        for i, (k, v) in enumerate(sets.items()):
+            names[f"#s{i}"] = k
+            values[f":s{i}"] = v
+            parts.append(f"#s{i} = :s{i}")
+        expr = "SET " + ", ".join(parts) if parts else ""
+        if turns:
+            # queries_count doubles as the turn counter — ADD is atomic across containers
+            values[":n"] = len(turns)
+            expr += " ADD queries_count :n"
+
+        kwargs = {
+            "Key": {"call_id": self.call_id, "timestamp": self.ts},
+            "UpdateExpression": expr.strip(),
+            "ExpressionAttributeValues": values,
+            "ConditionExpression": "attribute_exists(call_id)",
+        }
+        if names:
+            kwargs["ExpressionAttributeNames"] = names
+        if turns:
+            kwargs["ReturnValues"] = "UPDATED_NEW"
+        try:
+            resp = self.table.update_item(**kwargs)
+            if turns:
+                count = int(resp.get("Attributes", {}).get("queries_count", len(turns)))
+                first = count - len(turns) + 1
+                for i, entry in enumerate(turns):
+                    entry["turn_no"] = first + i   # same dicts as in history
+                self.item["queries_count"] = count
+                self.turns.put(self.call_id, first, turns, ttl=self.item.get("ttl"))
+            return True
+        except Exception as e:
+            logger.warning(f"Call session flush failed call={self.call_id}: {e}")
+            return False
+
+
+def _read(table, call_id: str, ts=None) -> dict:
+    """The call record — get_item when the sort key is known, else one Query.
+
+    {} if there is none; read errors propagate so callers can tell the two apart.
+    """
+    if not call_id:
+        return {}
+    if ts not in (None, ""):
+        item = table.get_item(Key={"call_id": call_id, "timestamp": int(ts)}).get("Item")
+        if item:
+            return item
+    items = table.query(KeyConditionExpression=Key("call_id").eq(call_id), Limit=1).get("Items", [])
+    return items[0] if items else {}
+
+
+def load(table, call_id: str, ts=None, turns=None) -> CallSession:
+    """Load the call record now (see CallSession for the lazy form)."""
+    session = CallSession(table, call_id, turns=turns, ts=ts)
+    session.item
+    return session
@@ -31,8 +31,10 @@ from handler import (
     rag_pipeline,
     sarvam_tts,
     get_call_timestamp,
+    call_turns,
     SYSTEM_PROMPT,
 )
+import call_session
 
 
 # ══════════════════════════════════════════════════════════════
@@ -77,7 +79,6 @@ def _init_call(contact_id, customer_number):
         "status":               "in-progress",
         "language":             "en",
         "queries_count":        0,
-        "conversation_history": [],
         "source":               "amazon-connect",
     })
     return {
@@ -173,23 +174,8 @@ def _handle_query(contact_id, parameters, attributes):
 
 # ── helper ───────────────────────────────────────────────────
 def _log_query(contact_id, query, answer, language):
-    try:
-        ts = get_call_timestamp(contact_id)
-        calls_table.update_item(
-            Key={"call_id": contact_id, "timestamp": ts},
-            UpdateExpression=(
-                "SET queries_count = queries_count + :one, "
-                "conversation_history = list_append(conversation_history, :entry)"
-            ),
-            ExpressionAttributeValues={
-                ":one":  1,
-                ":entry": [{
-                    "query":    query,
-                    "answer":   answer,
-                    "language": language,
-                    "ts":       int(datetime.now().timestamp()),
-                }],
-            },
-        )
-    except Exception as e:
-        logger.warning(f"Connect log_query failed: {e}")
+    # Turn goes to the turns table; the call record only gets its counter bumped
+    session = call_session.load(calls_table, contact_id, turns=call_turns)
+    session.append_turn(query, answer, language)
+    if not session.flush():
+        logger.warning(f"Connect log_query failed call={contact_id}")
@@ -0,0 +1,205 @@
+# VaaniSeva – Titan embedding service
+# Every embedding goes through one EmbeddingService instead of a bare
+# bedrock.invoke_model per text:
+#
+#   1. In-process LRU keyed by hash(model id, text) — a warm container never
+#      re-embeds an utterance it has seen (repeat questions, retries, the answer
+#      cache lookup followed by RAG).
+#   2. Content-addressed S3 objects under EMBEDDING_CACHE_PREFIX, raw float32 —
+#      shared by the seed scripts, so re-seeding unchanged text costs a GET
+#      instead of a model call. The call path skips this layer (use_store=False):
+#      a one-off caller utterance rarely repeats across containers, and an S3
+#      GET miss plus PUT costs more than the Titan call it would save.
+#   3. embed_many(): bounded parallel Titan calls for bulk jobs (seeding, admin
+#      re-embeds). A throttling error pauses every worker for a jittered,
+#      doubling cool-down instead of each thread hammering the endpoint on its own.
+#
+# Vectors are NumPy float32 end to end. encode()/decode() convert to and from the
+# DynamoDB Binary form (raw little-endian float32) used in vaaniseva-vectors;
+# decode() still reads the older list-of-Decimal rows.
+
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+logger = logging.getLogger()
+
+MODEL_ID          = os.environ.get("BEDROCK_EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0")
+CACHE_PREFIX      = os.environ.get("EMBEDDING_CACHE_PREFIX", "embedding-cache")
+CACHE_MAX_ENTRIES = int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", "4096"))
+BATCH_WORKERS     = int(os.environ.get("EMBEDDING_BATCH_WORKERS", "8"))
+MAX_INPUT_CHARS   = 8000    # Titan's limit is 8k tokens; characters are a safe bound
+MAX_ATTEMPTS      = 6
+BACKOFF_INITIAL   = 0.5
+BACKOFF_MAX       = 10.0
+
+_RETRYABLE = {"ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException",
+              "ModelNotReadyException", "InternalServerException"}
+
+
+def make_key(model_id: str, text: str) -> str:
+    """Stable content hash for one embedding request."""
+    return hashlib.sha256(f"{model_id}\x1f{text}".encode("utf-8")).hexdigest()
+
+
+def encode(vector) -> bytes:
+    """float32 bytes for a DynamoDB Binary attribute."""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def decode(value) -> np.ndarray:
+    """float32 vector from a stored embedding: Binary/bytes, or a legacy list of Decimals."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(bytes(value), dtype="<f4")
+    if hasattr(value, "value") and isinstance(value.value, (bytes, bytearray)):   # boto3 Binary
+        return np.frombuffer(bytes(value.value), dtype="<f4")
+    return np.asarray([float(x) for x in value], dtype=np.float32)
+
+
+def _error_code(exc: Exception) -> str:
+    return getattr(exc, "response", {}).get("Error", {}).get("Code", "")
+
+
+class EmbeddingService:
+    """Cached, batch-capable Titan text embeddings."""
+
+    def __init__(self, bedrock_client, s3_client=None, bucket: str = "", model_id: str = MODEL_ID,
+                 prefix: str = CACHE_PREFIX, max_entries: int = CACHE_MAX_ENTRIES, rate_limiter=None):
+        """rate_limiter: optional object whose acquire() blocks until one model call may go out."""
+        self.bedrock     = bedrock_client
+        self.s3_client   = s3_client
+        self.bucket      = bucket
+        self.model_id    = model_id
+        self.prefix      = prefix
+        self.max_entries = max_entries
+        self.rate_limiter = rate_limiter
+        self._vectors    = OrderedDict()   # key → float32 vector
+        self._lock       = threading.Lock()
+        self._cooldown_until = 0.0         # shared throttling pause (embed_many)
+        self.stats       = {"memory": 0, "s3": 0, "model": 0, "throttled": 0}
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}.f32"
+
+    # ── Cache layers ──────────────────────────────────────────
+    def _remember(self, key: str, vector: np.ndarray):
+        vector.setflags(write=False)   # shared between callers
+        with self._lock:
+            self._vectors[key] = vector
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+
+    def _recall(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is not None:
+                self._vectors.move_to_end(key)
+                self.stats["memory"] += 1
+            return vector
+
+    def _load(self, key: str) -> np.ndarray | None:
+        if not (self.s3_client and self.bucket):
+            return None
+        try:
+            obj = self.s3_client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+            vector = np.frombuffer(obj["Body"].read(), dtype="<f4")
+        except Exception:
+            return None
+        self.stats["s3"] += 1
+        return vector if vector.size else None
+
+    def _store(self, key: str, vector: np.ndarray):
+        if not (self.s3_client and self.bucket):
+            return
+        try:
+            self.s3_client.put_object(Bucket=self.bucket, Key=self.object_key(key), Body=encode(vector),
+                                      ContentType="application/octet-stream",
+                                      Metadata={"model": self.model_id, "dim": str(vector.size)})
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed for {key[:12]}: {e}")
+
+    # ── Model call ────────────────────────────────────────────
+    def _wait_cooldown(self):
+        pause = self._cooldown_until - time.time()
+        if pause > 0:
+            time.sleep(pause)
+
+    def _invoke(self, text: str) -> np.ndarray:
+        """One Titan call, retried with jittered exponential backoff on throttling / 5xx."""
+        delay = BACKOFF_INITIAL
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self._wait_cooldown()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.bedrock.invoke_model(
+                    modelId=self.model_id,
+                    body=json.dumps({"inputText": text[:MAX_INPUT_CHARS]}),
+                    contentType="application/json",
+                    accept="application/json",
+                )
+                self.stats["model"] += 1
+                return np.asarray(json.loads(response["body"].read())["embedding"], dtype=np.float32)
+            except Exception as e:
+                if _error_code(e) not in _RETRYABLE or attempt == MAX_ATTEMPTS:
+                    raise
+                self.stats["throttled"] += 1
+                pause = delay * (0.5 + random.random())
+                with self._lock:
+                    self._cooldown_until = max(self._cooldown_until, time.time() + pause)
+                logger.info(f"Embedding throttled ({_error_code(e)}), attempt {attempt}, backing off {pause:.1f}s")
+                delay = min(delay * 2, BACKOFF_MAX)
+
+    # ── Public API ────────────────────────────────────────────
+    def embed(self, text: str, use_store: bool = True) -> np.ndarray:
+        """float32 embedding for text: memory → S3 → Titan.
+
+        use_store=False skips the S3 layer entirely (the request path); bulk jobs
+        read and write it so re-seeding unchanged text is free.
+        """
+        key = make_key(self.model_id, text)
+        vector = self._recall(key)
+        if vector is not None:
+            return vector
+        vector = self._load(key) if use_store else None
+        if vector is None:
+            vector = self._invoke(text)
+            if use_store:
+                self._store(key, vector)
+        self._remember(key, vector)
+        return vector
+
+    def embed_many(self, texts: list, workers: int = BATCH_WORKERS, on_done=None) -> list:
+        """Embed texts with at most `workers` concurrent calls. Returns vectors in input order.
+
+        A text whose embedding ultimately fails gets None. Identical texts are embedded once.
+        on_done(index, vector_or_None, error_or_None) is called as each distinct text finishes.
+        """
+        results = [None] * len(texts)
+        positions = {}
+        for i, text in enumerate(texts):
+            positions.setdefault(text, []).append(i)
+
+        def _one(text):
+            try:
+                return text, self.embed(text), None
+            except Exception as e:
+                return text, None, e
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for future in as_completed([pool.submit(_one, text) for text in positions]):
+                text, vector, error = future.result()
+                for i in positions[text]:
+                    results[i] = vector
+                if on_done:
+                    on_done(positions[text][0], vector, error)
+        return results
@@ -0,0 +1,119 @@
+# VaaniSeva – Deadline-aware concurrent fan-out
+# Used by the [FETCH_DATA] path: every context source (RAG, mandi API, web search)
+# runs under one total budget, and the web search providers are hedged: tried in
+# priority order, the next one started only when the current one is slow or
+# fails, so metered providers are not all billed for every search. Whatever
+# finished in time is returned; stragglers are cancelled (queued work is
+# dropped, in-flight HTTP calls end at their own timeout).
+#
+# Every task gets a timing entry: {"ms": int, "status": ok|empty|error|timeout},
+# small enough to store on the DynamoDB job record as-is.
+
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger()
+
+# Shared across requests in a warm container. Sized for a source fan-out plus a
+# nested provider hedge, with headroom for stragglers still finishing.
+_POOL = ThreadPoolExecutor(max_workers=int(os.environ.get("FANOUT_MAX_WORKERS", "16")))
+
+
+def _timed(fn):
+    """Run fn and return (result, elapsed_ms, error)."""
+    t0 = time.time()
+    try:
+        return fn(), int((time.time() - t0) * 1000), None
+    except Exception as e:
+        return None, int((time.time() - t0) * 1000), e
+
+
+def _status(result, error) -> str:
+    if error is not None:
+        return "error"
+    return "ok" if result else "empty"
+
+
+def gather(tasks: dict, budget: float) -> tuple:
+    """Run {name: fn} concurrently for at most `budget` seconds.
+
+    Returns ({name: result} for tasks that finished with a truthy result, {name: timing}).
+    """
+    t0 = time.time()
+    futures = {_POOL.submit(_timed, fn): name for name, fn in tasks.items()}
+    done, pending = wait(futures, timeout=budget)
+
+    results, timings = {}, {}
+    for fut in done:
+        name = futures[fut]
+        result, ms, error = fut.result()
+        if error is not None:
+            logger.warning(f"Fan-out source {name} failed: {error}")
+        elif result:
+            results[name] = result
+        timings[name] = {"ms": ms, "status": _status(result, error)}
+    for fut in pending:
+        fut.cancel()
+        timings[futures[fut]] = {"ms": int((time.time() - t0) * 1000), "status": "timeout"}
+    return results, timings
+
+
+def _collect(done, futures, timings, is_good, label):
+    """Record timings for finished futures; return (name, result) of the first good one, or None."""
+    first = None
+    for fut in done:
+        name = futures[fut]
+        result, ms, error = fut.result()
+        if error is not None:
+            logger.warning(f"{label} {name} failed: {error}")
+        good = error is None and is_good(result)
+        timings[name] = {"ms": ms, "status": "ok" if good else _status(result, error)}
+        if good and first is None:
+            first = (name, result)
+    return first
+
+
+def hedge(tasks: list, budget: float, delay: float, is_good=bool) -> tuple:
+    """Run [(name, fn), ...] in priority order for at most `budget` seconds; the first
+    result passing is_good wins.
+
+    Entrants start one at a time: the next once `delay` seconds pass without a good
+    result, or straight away when every running entrant has finished without one.
+    Returns (winner name or None, result or None, {name: timing}) — timings as in
+    gather(); entrants still running are "cancelled" (or "timeout" if none won),
+    entrants that never started are "skipped".
+    """
+    t0 = time.time()
+    deadline = t0 + budget
+    queue = list(tasks)
+    futures, pending, timings = {}, set(), {}
+    winner, best = None, None
+    next_start = t0
+
+    while winner is None:
+        now = time.time()
+        if now >= deadline:
+            break
+        if queue and (not pending or now >= next_start):
+            name, fn = queue.pop(0)
+            fut = _POOL.submit(_timed, fn)
+            futures[fut] = name
+            pending.add(fut)
+            next_start = now + delay
+        if not pending:
+            break
+        wake = min(deadline, next_start) if queue else deadline
+        done, pending = wait(pending, timeout=max(wake - time.time(), 0), return_when=FIRST_COMPLETED)
+        first = _collect(done, futures, timings, is_good, "Hedged entrant")
+        if first:
+            winner, best = first
+
+    for fut in pending:
+        fut.cancel()
+        timings[futures[fut]] = {"ms": int((time.time() - t0) * 1000),
+                                 "status": "cancelled" if winner else "timeout"}
+    for name, _ in queue:
+        timings[name] = {"ms": 0, "status": "skipped"}
+    return winner, best, timings
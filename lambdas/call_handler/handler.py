@@ -8,6 +8,7 @@
 
 import json
 import os
+import array
 import base64
 import math
 import uuid
@@ -15,11 +16,22 @@ import logging
 import threading
 import hashlib
 import hmac
+import functools
 import time
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import boto3
 import requests
+import http_client
+import fanout
+import job_board
+import user_repository
+import call_session
+import turn_store
+import call_memory
+import intent_phrases
+import lang_id
+import passages
 from twilio.twiml.voice_response import VoiceResponse, Gather
 from datetime import datetime
 
@@ -37,6 +49,33 @@ try:
 except ImportError:
     _OPENAI_AVAILABLE = False
 
+# Optional NumPy vector index — falls back to a per-query table scan if not installed
+try:
+    import vector_index as _vector_index_mod
+    from vector_index import VectorIndex
+    _VECTOR_INDEX_AVAILABLE = True
+except ImportError:
+    _VECTOR_INDEX_AVAILABLE = False
+
+# Optional embedding service (NumPy) — LRU + S3 cache and float32 vectors; bare Titan calls otherwise
+try:
+    import embeddings as _embeddings_mod
+    _EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    _EMBEDDINGS_AVAILABLE = False
+
+# Optional semantic answer cache (NumPy) — every question goes to the LLM without it
+try:
+    import answer_cache as _answer_cache_mod
+    _ANSWER_CACHE_AVAILABLE = True
+except ImportError:
+    _ANSWER_CACHE_AVAILABLE = False
+
+import tts_cache as _tts_cache_mod
+import static_prompts
+import metrics
+import prompt_cache
+
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
@@ -44,11 +83,35 @@ logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 dynamodb  = boto3.resource("dynamodb", region_name=os.environ["AWS_REGION"])
 bedrock   = boto3.client("bedrock-runtime", region_name=os.environ["AWS_REGION"])
 s3_client = boto3.client("s3", region_name=os.environ["AWS_REGION"])
+lambda_client = boto3.client("lambda", region_name=os.environ["AWS_REGION"])
 
 calls_table     = dynamodb.Table(os.environ["DYNAMODB_CALLS_TABLE"])
 knowledge_table = dynamodb.Table(os.environ["DYNAMODB_KNOWLEDGE_TABLE"])
 vectors_table   = dynamodb.Table(os.environ["DYNAMODB_VECTORS_TABLE"])
 
+# ── Vector index (loaded lazily, once per warm container) ────
+vector_index = VectorIndex(vectors_table, s3_client, os.environ["S3_DOCUMENTS_BUCKET"]) if _VECTOR_INDEX_AVAILABLE else None
+
+# ── Embedding service (in-process LRU in front of Titan; the S3 layer is for seeding) ──
+embedding_service = (_embeddings_mod.EmbeddingService(bedrock, s3_client, os.environ["S3_DOCUMENTS_BUCKET"])
+                     if _EMBEDDINGS_AVAILABLE else None)
+
+# ── Semantic answer cache (repeat questions skip LLM + TTS; keyed to the index version) ──
+ANSWER_CACHE_ENABLED = os.environ.get("ANSWER_CACHE_ENABLED", "1") == "1"
+answer_cache = (
+    _answer_cache_mod.AnswerCache(dynamodb.Table(_answer_cache_mod.TABLE_NAME), vector_index.stamp)
+    if (ANSWER_CACHE_ENABLED and _ANSWER_CACHE_AVAILABLE and vector_index is not None) else None
+)
+
+# ── TTS audio cache (content-addressed S3 prefix + in-process LRU) ──
+tts_cache = _tts_cache_mod.TTSCache(s3_client, os.environ["S3_DOCUMENTS_BUCKET"])
+# Static prompts pre-rendered by scripts/generate_welcome_audio.py — never hit the TTS API at runtime
+STATIC_AUDIO_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static_audio_manifest.json")
+tts_cache.load_manifest(STATIC_AUDIO_MANIFEST)
+# "s3": upload, then hand Twilio a presigned URL (default)
+# "lambda": hand Twilio {BASE_URL}/voice/audio/{key}.wav, serve bytes from memory, upload in background
+TTS_DELIVERY = os.environ.get("TTS_DELIVERY", "s3")
+
 # ── OpenAI client ────────────────────────────────────────────
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 openai_client  = _OpenAI(api_key=OPENAI_API_KEY) if (_OPENAI_AVAILABLE and OPENAI_API_KEY) else None
@@ -59,18 +122,19 @@ BEDROCK_MODEL_ID           = os.environ["BEDROCK_MODEL_ID"]
 BEDROCK_EMBEDDING_MODEL_ID = os.environ["BEDROCK_EMBEDDING_MODEL_ID"]
 SARVAM_API_KEY             = os.environ.get("SARVAM_API_KEY", "")
 S3_BUCKET                  = os.environ["S3_DOCUMENTS_BUCKET"]
+FUNCTION_NAME              = os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "")  # async jobs self-invoke
 BASE_URL                   = ""  # Set at runtime from API Gateway event
 _jwt_secret_raw            = os.environ.get("JWT_SECRET", "")
 JWT_SECRET                 = _jwt_secret_raw if _jwt_secret_raw else os.urandom(32).hex()
 USERS_TABLE_NAME           = os.environ.get("DYNAMODB_USERS_TABLE", "vaaniseva-users")
 users_table                = dynamodb.Table(USERS_TABLE_NAME)
+users                      = user_repository.UserRepository(users_table)
+call_turns                 = turn_store.TurnStore(dynamodb.Table(turn_store.TURNS_TABLE_NAME))
 DATA_GOV_API_KEY           = os.environ.get("DATA_GOV_API_KEY", "")
 
 # ── Phone profiles table (cross-call memory) ─────────────────
 PHONE_PROFILES_TABLE_NAME  = os.environ.get("DYNAMODB_PHONE_PROFILES_TABLE", "vaaniseva-phone-profiles")
 
-# ── In-memory TTS cache for static phrases (survives across warm invocations) ──
-_tts_audio_cache = {}
 CARTESIA_API_KEY           = os.environ.get("CARTESIA_API_KEY", "")
 TTS_PROVIDER               = os.environ.get("TTS_PROVIDER", "sarvam")  # "sarvam" or "cartesia"
 PHONE_HASH_SALT            = os.environ.get("PHONE_HASH_SALT", "vaaniseva-salt-2026")
@@ -177,10 +241,9 @@ IMPORTANT: You are female. In Hindi always use feminine verb forms: करती
 DEFAULT_AGENT = "arya"
 
 
-def build_system_prompt(agent_key: str, language: str,
-                        user_name: str = None,
-                        cross_call_context: str = None) -> str:
-    """Build a system prompt for the given agent and language."""
+@functools.lru_cache(maxsize=32)
+def _static_system_prompt(agent_key: str, language: str) -> str:
+    """The per-agent, per-language part of the system prompt — the cached prefix."""
     agent = AGENT_REGISTRY.get(agent_key, AGENT_REGISTRY["arya"])
 
     name_display = agent["name_hi"] if language == "hi" else agent["name"]
@@ -231,55 +294,54 @@ CURRENCY RULE: India uses Indian Rupees (₹ / Rs). NEVER quote any price in dol
 
 FOLLOW-UP: After each response, end with ONE short natural follow-up question relevant to what was just discussed. Be SPECIFIC — ask about their crop name, their state, their specific symptom, their scheme eligibility, etc. NEVER use generic phrases like 'aur kuch janna hai?', 'kuch aur chahiye?', 'kya aur batao?', 'or batao', 'aur kuch'. Make it sound like a real person who actually listened. Vary it every single time. EXCEPTION: if the caller said bye/goodbye/thanks, do NOT add a follow-up."""
 
+    return base.strip()
+
+
+@functools.lru_cache(maxsize=256)
+def build_system_prompt_parts(agent_key: str, language: str,
+                              user_name: str = None,
+                              cross_call_context: str = None) -> tuple:
+    """(static prefix, per-caller suffix) of the system prompt, memoised.
+
+    The static prefix is shared by every caller of an agent/language, so it can
+    sit in front of a Bedrock cache point (prompt_cache.system_blocks).
+    """
+    dynamic = ""
     if user_name:
-        base += f"\nThe caller's name is {user_name}. Address them by name occasionally but naturally."
+        dynamic += f"\nThe caller's name is {user_name}. Address them by name occasionally but naturally."
 
     if cross_call_context:
-        base += f"\nContext from their previous calls: {cross_call_context}"
+        dynamic += f"\nContext from their previous calls: {cross_call_context}"
 
-    return base.strip()
+    return _static_system_prompt(agent_key, language), dynamic.rstrip()
 
 
-def detect_agent_from_intent(speech_text: str, language: str) -> str:
-    """Route to the right agent based on utterance intent."""
+def build_system_prompt(agent_key: str, language: str,
+                        user_name: str = None,
+                        cross_call_context: str = None) -> str:
+    """Build a system prompt for the given agent and language."""
+    static, dynamic = build_system_prompt_parts(agent_key, language, user_name, cross_call_context)
+    return static + dynamic
 
-    # Direct name mentions — highest priority
-    # Include common STT mis-transcriptions of Indian names
-    name_triggers = {
-        "arya":   ["arya", "aria", "aarya", "आर्या", "ariya", "ஆர்யா"],
-        "hitesh": ["hitesh", "hitesha", "हितेश", "ஹிதேஷ்"],
-        "vidya":  ["vidya", "vidhya", "विद्या", "வித்யா"],
-    }
-    # Switch request phrases — check these WITH the name
-    switch_phrases = ["se baat", "ko bulao", "se milana", "se milao", "ko do",
-                      "ko bolo", "connect karo", "baat karao", "baat karo",
-                      "bulao", "la do", "de do", "transfer"]
-    text_lower = speech_text.lower()
-
-    # If a name is found AND a switch phrase is nearby → prioritise that agent
-    for agent, triggers in name_triggers.items():
-        if any(t.lower() in text_lower for t in triggers):
-            if any(p in text_lower for p in switch_phrases):
-                return agent  # definitive switch intent
-            # Name alone (e.g. addressing current agent) — still return the match
-            return agent
 
-    # Domain keyword routing
-    agriculture_keywords = [
-        "fasal", "फसल", "khet", "खेत", "mandi", "मंडी", "beej", "बीज",
-        "kisan", "किसान", "crop", "wheat", "gehu", "गेहूं", "onion", "pyaaz",
-        "baarish", "बारिश", "irrigation", "sinchai", "सिंचाई", "fertilizer"
-    ]
-    health_keywords = [
-        "bimar", "बीमार", "hospital", "doctor", "dawai", "दवाई", "health",
-        "swasthya", "स्वास्थ्य", "ayushman", "आयुष्मान", "mental", "sad",
-        "dukhi", "दुखी", "anxiety", "depression", "asha", "nurse", "fever",
-        "bukhar", "बुखार", "pregnancy", "garbh"
-    ]
+def detect_agent_from_intent(speech_text: str, language: str, hits=None) -> str:
+    """Route to the right agent based on utterance intent.
+
+    hits: intent_phrases.match(speech_text), if the caller already has it.
+    """
+    if hits is None:
+        hits = intent_phrases.match(speech_text)
+
+    # Direct name mentions — highest priority (a switch phrase alongside is
+    # definitive, but the name alone still selects that agent)
+    named = hits.first("agent")
+    if named:
+        return named
 
-    if any(kw in text_lower for kw in agriculture_keywords):
+    # Domain keyword routing
+    if "agriculture" in hits:
         return "hitesh"
-    if any(kw in text_lower for kw in health_keywords):
+    if "health" in hits:
         return "vidya"
 
     return "arya"  # default for schemes/legal
@@ -289,17 +351,25 @@ def detect_agent_from_intent(speech_text: str, language: str) -> str:
 #  TTS: Sarvam AI → Amazon Polly fallback
 # ══════════════════════════════════════════════════════════════
 
-def sarvam_tts(text: str, language: str, speaker: str = "") -> str | None:
+def sarvam_tts(text: str, language: str, speaker: str = "", cache_lookup: bool = True) -> str | None:
     """
     Call TTS. Tries Cartesia first (if TTS_PROVIDER=cartesia), then falls back to Sarvam Bulbul v2.
     Hitesh always uses Sarvam (Cartesia has no good Hindi male voice).
+    Audio is stored content-addressed, so repeated phrases skip synthesis entirely.
+    cache_lookup=False skips the S3 HEAD for one-off text (LLM answers).
     Returns None only if ALL providers fail.
     """
+    rendered = tts_render(text, language, speaker=speaker, cache_lookup=cache_lookup)
+    return rendered[1] if rendered else None
+
+
+def tts_render(text: str, language: str, speaker: str = "", cache_lookup: bool = True) -> tuple | None:
+    """sarvam_tts, but returns (cache_key, presigned_url) — used to build the static audio manifest."""
     if not text or not text.strip():
         return None
     # Hitesh always uses Sarvam Bulbul v2
     if speaker != "hitesh" and TTS_PROVIDER == "cartesia" and CARTESIA_API_KEY:
-        result = _cartesia_tts(text, language, speaker=speaker or "arya")
+        result = _cartesia_tts(text, language, speaker=speaker or "arya", cache_lookup=cache_lookup)
         if result:
             return result
         logger.warning("Cartesia failed — falling back to Sarvam Bulbul v2")
@@ -311,6 +381,10 @@ def sarvam_tts(text: str, language: str, speaker: str = "") -> str | None:
         # Map internal persona names to actual Sarvam Bulbul v2 speaker IDs
         _SARVAM_VOICE_MAP = {"hitesh": "abhilash", "arya": "arya", "vidya": "vidya"}
         resolved_speaker = _SARVAM_VOICE_MAP.get(speaker, speaker if speaker in VOICE_OPTIONS else cfg["sarvam_speaker"])
+        cache_key = _tts_cache_mod.make_key("sarvam", "bulbul:v2", resolved_speaker, cfg["sarvam_code"], 1.25, text)
+        cached = tts_cache.get_url(cache_key, lookup_store=cache_lookup)
+        if cached:
+            return cache_key, cached
         payload = {
             "inputs": [text],
             "target_language_code": cfg["sarvam_code"],
@@ -318,26 +392,64 @@ def sarvam_tts(text: str, language: str, speaker: str = "") -> str | None:
             "model": "bulbul:v2",
             "pace": 1.25
         }
-        resp = requests.post(
-            "https://api.sarvam.ai/text-to-speech",
+        resp = http_client.post(
+            "sarvam", "https://api.sarvam.ai/text-to-speech",
             json=payload,
             headers={"api-subscription-key": SARVAM_API_KEY},
-            timeout=8
         )
         resp.raise_for_status()
         audio_bytes = base64.b64decode(resp.json()["audios"][0])
-        key = f"tts/{uuid.uuid4()}.wav"
-        s3_client.put_object(Bucket=S3_BUCKET, Key=key, Body=audio_bytes, ContentType="audio/wav")
-        url = s3_client.generate_presigned_url(
-            "get_object", Params={"Bucket": S3_BUCKET, "Key": key}, ExpiresIn=3600
-        )
-        logger.info(f"Sarvam TTS OK → {key} (lang={language})")
-        return url
+        url = _deliver_tts(cache_key, audio_bytes, {
+            "provider": "sarvam", "model": "bulbul:v2", "speaker": resolved_speaker,
+            "language": cfg["sarvam_code"], "pace": "1.25",
+        })
+        logger.info(f"Sarvam TTS OK → {cache_key[:12]} (lang={language})")
+        return cache_key, url
     except Exception as e:
         logger.warning(f"Sarvam TTS failed, falling back to Polly: {e}")
         return None
 
 
+def _deliver_tts(cache_key: str, audio_bytes: bytes, meta: dict) -> str:
+    """Store freshly synthesised audio and return the URL Twilio should <Play> (see TTS_DELIVERY)."""
+    t0 = time.time()
+    # Twilio needs an absolute URL, so direct delivery only works once BASE_URL is known
+    mode = "lambda" if (TTS_DELIVERY == "lambda" and BASE_URL) else "s3"
+    if mode == "lambda":
+        tts_cache.put_async(cache_key, audio_bytes, meta)
+        url = f"{BASE_URL}/voice/audio/{cache_key}.wav"
+    else:
+        url = tts_cache.put(cache_key, audio_bytes, meta)
+    logger.info(f"TTS delivery={mode} store_ms={int((time.time() - t0) * 1000)} bytes={len(audio_bytes)}")
+    return url
+
+
+def _tts_cached_url(cache_key: str) -> str | None:
+    """URL Twilio should <Play> for audio already in the TTS cache (same delivery as fresh audio)."""
+    if TTS_DELIVERY == "lambda" and BASE_URL:
+        # /voice/audio would 404 on a clip that was pruned or never uploaded
+        return f"{BASE_URL}/voice/audio/{cache_key}.wav" if tts_cache.has_audio(cache_key) else None
+    return tts_cache.get_url(cache_key)
+
+
+def handle_audio(path: str):
+    """GET /voice/audio/{key}.wav — serve TTS audio from the in-process cache, else the S3 store."""
+    m = re.search(r'/voice/audio/([0-9a-f]{64})(?:\.wav)?$', path)
+    if not m:
+        return {"statusCode": 404, "body": ""}
+    t0 = time.time()
+    audio, source = tts_cache.get_audio(m.group(1))
+    logger.info(f"TTS audio serve source={source} ms={int((time.time() - t0) * 1000)}")
+    if audio is None:
+        return {"statusCode": 404, "body": ""}
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "audio/wav", "Cache-Control": "public, max-age=86400"},
+        "body": base64.b64encode(audio).decode("ascii"),
+        "isBase64Encoded": True,
+    }
+
+
 # Cartesia Sonic-3 voice mapping: Sarvam speaker → Cartesia voice ID
 _CARTESIA_VOICE_MAP = {
     "arya":   "95d51f79-c397-46f9-b49a-23763d3eaa2d",  # Arushi - Hinglish Speaker (female)
@@ -347,8 +459,8 @@ _CARTESIA_VOICE_MAP = {
 _CARTESIA_LANG_MAP = {"hi": "hi", "mr": "hi", "ta": "hi", "en": "en"}
 
 
-def _cartesia_tts(text: str, language: str, speaker: str = "arya") -> str | None:
-    """Call Cartesia Sonic-3 TTS. 40ms TTFA, Hindi/Hinglish, emotion support. Returns presigned S3 URL."""
+def _cartesia_tts(text: str, language: str, speaker: str = "arya", cache_lookup: bool = True) -> tuple | None:
+    """Call Cartesia Sonic-3 TTS. 40ms TTFA, Hindi/Hinglish, emotion support. Returns (cache_key, presigned S3 URL)."""
     if not text or not text.strip():
         return None
     try:
@@ -358,6 +470,10 @@ def _cartesia_tts(text: str, language: str, speaker: str = "arya") -> str | None
             effective_speaker = "vidya"
         voice_id  = _CARTESIA_VOICE_MAP.get(effective_speaker, _CARTESIA_VOICE_MAP["arya"])
         lang_code = _CARTESIA_LANG_MAP.get(language, "hi")
+        cache_key = _tts_cache_mod.make_key("cartesia", "sonic-3", voice_id, lang_code, "8000", text)
+        cached = tts_cache.get_url(cache_key, lookup_store=cache_lookup)
+        if cached:
+            return cache_key, cached
         payload = {
             "model_id": "sonic-3",
             "transcript": text,
@@ -365,24 +481,22 @@ def _cartesia_tts(text: str, language: str, speaker: str = "arya") -> str | None
             "output_format": {"container": "wav", "encoding": "pcm_s16le", "sample_rate": 8000},
             "language": lang_code,
         }
-        resp = requests.post(
-            "https://api.cartesia.ai/tts/bytes",
+        resp = http_client.post(
+            "cartesia", "https://api.cartesia.ai/tts/bytes",
             headers={
                 "Authorization": f"Bearer {CARTESIA_API_KEY}",
                 "Cartesia-Version": "2025-04-16",
                 "Content-Type": "application/json",
             },
             json=payload,
-            timeout=12,
         )
         resp.raise_for_status()
-        key = f"tts/{uuid.uuid4()}.wav"
-        s3_client.put_object(Bucket=S3_BUCKET, Key=key, Body=resp.content, ContentType="audio/wav")
-        url = s3_client.generate_presigned_url(
-            "get_object", Params={"Bucket": S3_BUCKET, "Key": key}, ExpiresIn=3600
-        )
-        logger.info(f"Cartesia TTS OK → {key} (lang={language}, speaker={speaker}, bytes={len(resp.content)})")
-        return url
+        url = _deliver_tts(cache_key, resp.content, {
+            "provider": "cartesia", "model": "sonic-3", "speaker": effective_speaker,
+            "language": lang_code, "sample-rate": "8000",
+        })
+        logger.info(f"Cartesia TTS OK → {cache_key[:12]} (lang={language}, speaker={speaker}, bytes={len(resp.content)})")
+        return cache_key, url
     except Exception as e:
         err_body = getattr(e, 'response', None)
         err_detail = err_body.text[:200] if err_body is not None else str(e)
@@ -395,12 +509,11 @@ def _sarvam_stt(audio_bytes: bytes, language: str = "hi") -> str:
     try:
         lang_code = LANG_CONFIG.get(language, LANG_CONFIG["hi"])["sarvam_code"]
         mode = "codemix" if language in ("hi", "mr") else "transcribe"
-        resp = requests.post(
-            "https://api.sarvam.ai/speech-to-text",
+        resp = http_client.post(
+            "sarvam_stt", "https://api.sarvam.ai/speech-to-text",
             headers={"api-subscription-key": SARVAM_API_KEY},
             files={"file": ("audio.wav", audio_bytes, "audio/wav")},
             data={"model": "saaras:v3", "language_code": lang_code, "mode": mode},
-            timeout=15,
         )
         resp.raise_for_status()
         transcript = resp.json().get("transcript", "").strip()
@@ -411,19 +524,6 @@ def _sarvam_stt(audio_bytes: bytes, language: str = "hi") -> str:
         return ""
 
 
-def _cached_tts(text: str, language: str, speaker: str = "") -> str | None:
-    """Cache-first TTS for static/repeated phrases. Uses in-memory cache keyed by text+lang+speaker."""
-    key = f"{text[:60]}|{language}|{speaker}"
-    cached = _tts_audio_cache.get(key)
-    if cached:
-        logger.info(f"TTS cache hit: {key[:40]}")
-        return cached
-    url = sarvam_tts(text, language, speaker=speaker)
-    if url:
-        _tts_audio_cache[key] = url
-    return url
-
-
 def tts_say(target, text: str, language: str, speaker: str = ""):
     """
     Add TTS audio to a TwiML Gather or Response object.
@@ -439,11 +539,51 @@ def tts_say(target, text: str, language: str, speaker: str = ""):
         target.say(text, voice=voice)  # Polly via Twilio — zero extra config
 
 
+# Shared pool for all concurrent TTS work (batch clips, answer chunks, streamed sentences)
+_TTS_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.environ.get("TTS_MAX_WORKERS", "8")))
+
+
+def _tts_submit(clips: list, cache_lookup: bool = True) -> list:
+    """Start synthesis of every (text, language, speaker) clip on the shared pool. Returns futures in clip order."""
+    return [_TTS_EXECUTOR.submit(sarvam_tts, text, language, speaker=speaker, cache_lookup=cache_lookup)
+            for text, language, speaker in clips]
+
+
+def _play_clips(target, clips: list, futures: list, pause: int = 0):
+    """Append clips to target in order as their futures resolve; Polly <Say> for any that failed.
+    pause: seconds of silence between consecutive clips.
+    """
+    for i, ((text, language, _), future) in enumerate(zip(clips, futures)):
+        if i and pause:
+            target.pause(length=pause)
+        try:
+            audio_url = future.result()
+        except Exception as e:
+            logger.warning(f"TTS clip failed: {e}")
+            audio_url = None
+        if audio_url:
+            target.play(audio_url)
+        else:
+            target.say(text, voice=LANG_CONFIG.get(language, LANG_CONFIG["en"])["polly_voice"])
+
+
+def tts_say_many(target, clips: list, pause: int = 0, cache_lookup: bool = True):
+    """
+    Batch tts_say: synthesise all (text, language, speaker) clips concurrently,
+    then append them to a TwiML Gather or Response in order.
+    """
+    _play_clips(target, clips, _tts_submit(clips, cache_lookup=cache_lookup), pause=pause)
+
+
 # ── Main Lambda handler ──────────────────────────────────────
 def lambda_handler(event, context):
     global BASE_URL
     logger.info(f"Event: {json.dumps(event)}")
 
+    # ── Async job (self-invoked, see _start_job) ─────────────
+    if event.get("vaaniseva_job"):
+        return _run_job(event)
+
     # ── Handle CORS preflight ────────────────────────────────
     http_method = event.get("httpMethod", "")
     if http_method == "OPTIONS":
@@ -461,7 +601,10 @@ def lambda_handler(event, context):
     BASE_URL = f"https://{domain}/{stage}" if domain else ""
 
     path = event.get("path", "/voice/incoming")
+    return _route(event, path)
 
+
+def _route(event, path):
     # ── REST JSON endpoints (web frontend) ───────────────────
     if "/auth/" in path:
         return handle_auth_routes(event, path)
@@ -479,6 +622,8 @@ def lambda_handler(event, context):
         return handle_transcribe_token_sts(event)
     elif "/voice/transcribe" in path:
         return handle_transcribe_audio(event)
+    elif "/voice/audio/" in path:
+        return handle_audio(path)
 
     # ── Twilio voice endpoints ───────────────────────────────
     body = event.get("body", "")
@@ -496,20 +641,49 @@ def lambda_handler(event, context):
 
     if "/incoming" in path:
         return handle_incoming(params)
-    elif "/voice-select" in path:
-        return handle_voice_select(params)
-    elif "/language-detect" in path:
-        return handle_language_detect(params)
-    elif "/language" in path:
-        return handle_language_select(params)
-    elif "/poll" in path:
-        return handle_poll(params)
-    elif "/stt" in path:
-        return handle_stt(params)
-    elif "/gather" in path:
-        return handle_gather(params)
-    else:
-        return twiml_response(VoiceResponse())
+
+    # One call session per request: the record is read on first use (the ?ts= sort
+    # key makes that a get_item) and every change is written before we respond
+    session = call_session.CallSession(calls_table, params.get("CallSid", ""),
+                                       ts=params.get("ts", ""), turns=call_turns)
+    try:
+        if "/voice-select" in path:
+            return handle_voice_select(params, session)
+        elif "/language-detect" in path:
+            return handle_language_detect(params, session)
+        elif "/language" in path:
+            return handle_language_select(params, session)
+        elif "/poll" in path:
+            return handle_poll(params, session)
+        elif "/stt" in path:
+            return handle_stt(params, session)
+        elif "/gather" in path:
+            return handle_gather(params, session)
+        else:
+            return twiml_response(VoiceResponse())
+    finally:
+        _flush_session(session)
+
+
+# ── Call session (one record load per request, one write at the end) ──
+def _flush_session(session):
+    """Write a session's queued call-record changes in one update_item, synchronously —
+    Lambda freezes threads once the handler returns.
+
+    Folding older turns into the rolling summary (a Bedrock call) stays off the
+    response path: it runs as an async job in its own invocation (_start_job).
+    """
+    if session is None or not session.dirty:
+        return
+    if not session.flush():
+        return
+    if session.history_loaded and call_memory.needs_compaction(session.history, session.summary_upto):
+        _start_job("compact_memory", call_id=session.call_id, ts=session.ts)
+
+
+def _ts_qs(session) -> str:
+    ts = session.known_ts if session is not None else ""
+    return f"&ts={ts}" if ts else ""
 
 
 def cors_json_response(status_code, body):
@@ -683,7 +857,6 @@ def _ensure_chat_session(session_id: str, language: str):
                 "call_id": session_id,
                 "timestamp": 0,
                 "language": language,
-                "conversation_history": [],
                 "queries_count": 0,
                 "source": "web",
                 "created_at": int(datetime.now().timestamp()),
@@ -718,18 +891,21 @@ def handle_chat(event):
     profile_context = _build_profile_context(user_profile) if user_profile else ""
 
     chat_system_prompt = build_system_prompt(DEFAULT_AGENT, language)
+    session = call_session.load(calls_table, session_id, turns=call_turns) if session_id else None
     try:
-        answer = rag_pipeline(query, language, session_id, profile_context=profile_context, system_prompt=chat_system_prompt)
+        answer = rag_pipeline(query, language, session_id, profile_context=profile_context,
+                              system_prompt=chat_system_prompt, session=session)
     except Exception as e:
         logger.error(f"Chat RAG error: {e}")
         answer = "I'm having trouble right now. Please try again."
 
     # Persist this turn to conversation history
-    if session_id:
-        log_query(session_id, query, answer, language)
+    if session is not None:
+        log_query(session, query, answer, language)
+        _flush_session(session)
 
     # Generate TTS audio with chosen voice
-    audio_url = sarvam_tts(answer, language, speaker=voice)
+    audio_url = sarvam_tts(answer, language, speaker=voice, cache_lookup=False)
 
     return cors_json_response(200, {
         "answer": answer,
@@ -835,7 +1011,7 @@ def handle_transcribe_audio(event):
             status = result["TranscriptionJob"]["TranscriptionJobStatus"]
             if status == "COMPLETED":
                 transcript_uri = result["TranscriptionJob"]["Transcript"]["TranscriptFileUri"]
-                tr_resp = requests.get(transcript_uri, timeout=5)
+                tr_resp = http_client.get("transcribe", transcript_uri)
                 transcript = tr_resp.json()["results"]["transcripts"][0]["transcript"]
                 break
             elif status == "FAILED":
@@ -1047,7 +1223,6 @@ def _handle_admin_create_rag(event, user):
         if embed_text.strip():
             try:
                 embedding = get_embedding(embed_text)
-                from decimal import Decimal
                 vectors_table.put_item(Item={
                     "embedding_id": f"{entry_id}#admin#all",
                     "scheme_id": entry_id,
@@ -1058,11 +1233,12 @@ def _handle_admin_create_rag(event, user):
                     "text_mr": entry["text_mr"],
                     "text_ta": entry["text_ta"],
                     "text_en": entry["text_en"],
-                    "embedding": [Decimal(str(round(x, 8))) for x in embedding],
+                    "embedding": _embedding_attr(embedding),
                     "category": entry["category"],
                 })
             except Exception as emb_err:
                 logger.warning(f"Embedding generation failed (non-fatal): {emb_err}")
+            _invalidate_vector_index()
 
         entry.pop("embedding", None)
         return cors_json_response(201, entry)
@@ -1112,14 +1288,13 @@ def _handle_admin_update_rag(event, entry_id):
                 ).get("Item", {})
                 embed_text = " ".join(filter(None, [full.get("text_en", ""), full.get("text_hi", "")]))
                 if embed_text.strip():
-                    from decimal import Decimal
                     embedding = get_embedding(embed_text)
                     emb_key = f"{scheme_id}#{section_id}#all"
                     vectors_table.update_item(
                         Key={"embedding_id": emb_key},
                         UpdateExpression="SET embedding = :emb, text_hi = :hi, text_mr = :mr, text_ta = :ta, text_en = :en",
                         ExpressionAttributeValues={
-                            ":emb": [Decimal(str(round(x, 8))) for x in embedding],
+                            ":emb": _embedding_attr(embedding),
                             ":hi": full.get("text_hi", ""),
                             ":mr": full.get("text_mr", ""),
                             ":ta": full.get("text_ta", ""),
@@ -1128,6 +1303,7 @@ def _handle_admin_update_rag(event, entry_id):
                     )
             except Exception as emb_err:
                 logger.warning(f"Embedding re-gen failed (non-fatal): {emb_err}")
+            _invalidate_vector_index()
 
         result = knowledge_table.get_item(Key={"scheme_id": scheme_id, "section_id": section_id})
         item = result.get("Item", {})
@@ -1148,12 +1324,60 @@ def _handle_admin_delete_rag(entry_id):
             vectors_table.delete_item(Key={"embedding_id": f"{scheme_id}#{section_id}#all"})
         except Exception:
             pass
+        _invalidate_vector_index()
         return cors_json_response(200, {"message": "Entry deleted", "id": entry_id})
     except Exception as e:
         logger.error(f"Admin delete RAG error: {e}")
         return cors_json_response(500, {"error": "Failed to delete entry"})
 
 
+def _embedding_attr(embedding):
+    """DynamoDB value for a vectors-table embedding: float32 Binary, or Decimals without NumPy."""
+    if _EMBEDDINGS_AVAILABLE:
+        return _embeddings_mod.encode(embedding)
+    from decimal import Decimal
+    return [Decimal(str(round(x, 8))) for x in embedding]
+
+
+def _invalidate_vector_index():
+    """Bump the vector index version so every warm container reloads, and rebuild the
+    S3 snapshot in an async job (a full table scan is too slow for the admin request).
+    The bump also retires every cached answer (their bucket key carries the version)."""
+    if vector_index is not None:
+        _vector_index_mod.bump_version(vectors_table)
+        vector_index.invalidate()
+        _start_job("publish_knowledge_snapshot")
+    if answer_cache is not None:
+        answer_cache.clear()
+
+
+# ── Async jobs ───────────────────────────────────────────────
+def _start_job(job: str, **params):
+    """Run a slow job in a separate async (InvocationType=Event) invocation of this function.
+    Outside Lambda (scripts/local_server.py) it runs on a background thread instead."""
+    payload = {"vaaniseva_job": job, **params}
+    if not FUNCTION_NAME:
+        threading.Thread(target=_run_job, args=(payload,), daemon=True).start()
+        return
+    try:
+        lambda_client.invoke(FunctionName=FUNCTION_NAME, InvocationType="Event",
+                             Payload=json.dumps(payload).encode("utf-8"))
+        logger.info(f"Async job started: {job}")
+    except Exception as e:
+        logger.error(f"Async job {job} could not be started: {e}")
+
+
+def _run_job(event):
+    job = event.get("vaaniseva_job")
+    if job == "publish_knowledge_snapshot" and vector_index is not None:
+        return {"job": job, "version": vector_index.publish()}
+    if job == "compact_memory":
+        session = call_session.load(calls_table, event.get("call_id", ""), ts=event.get("ts"), turns=call_turns)
+        return {"job": job, "compacted": session.exists and call_memory.compact(session, call_bedrock_simple)}
+    logger.warning(f"Unknown async job: {job}")
+    return {"job": job, "status": "ignored"}
+
+
 def _handle_admin_verify_rag(event, entry_id, user):
     """POST /admin/rag/{id}/verify — Mark entry as verified."""
     scheme_id, section_id = _parse_rag_key(entry_id)
@@ -1317,8 +1541,7 @@ def _get_user_from_event(event) -> dict | None:
     if not payload:
         return None
     try:
-        result = users_table.get_item(Key={"user_id": payload["sub"]})
-        return result.get("Item")
+        return users.get(payload["sub"])
     except Exception as e:
         logger.warning(f"Failed to fetch user: {e}")
         return None
@@ -1358,17 +1581,12 @@ def _handle_register(event):
     if len(password) < 6:
         return cors_json_response(400, {"error": "Password must be at least 6 characters."})
 
-    # Check if email already exists (scan — fine for hackathon scale)
+    # Check if email already exists (uncached email-index query; create() enforces it too)
     try:
-        existing = users_table.scan(
-            FilterExpression="email = :e",
-            ExpressionAttributeValues={":e": email},
-            Limit=1,
-        )
-        if existing.get("Items"):
+        if users.by_email(email):
             return cors_json_response(409, {"error": "An account with this email already exists."})
     except Exception as e:
-        logger.error(f"DynamoDB scan error: {e}")
+        logger.error(f"User email lookup error: {e}")
 
     user_id = str(uuid.uuid4())
     pw_hash, salt = _hash_password(password)
@@ -1394,9 +1612,11 @@ def _handle_register(event):
     }
 
     try:
-        users_table.put_item(Item=user_item)
+        users.create(user_item)
         logger.info(f"New user registered: {user_id} ({email})")
         return cors_json_response(201, {"message": "Account created successfully.", "user_id": user_id})
+    except user_repository.EmailTaken:
+        return cors_json_response(409, {"error": "An account with this email already exists."})
     except Exception as e:
         logger.error(f"Failed to create user: {e}")
         return cors_json_response(500, {"error": "Failed to create account. Please try again."})
@@ -1415,18 +1635,12 @@ def _handle_login(event):
     if not email or not password:
         return cors_json_response(400, {"error": "Email and password are required."})
 
-    # Look up user by email
+    # Look up user by email (uncached — a password changed elsewhere must apply at once)
     try:
-        result = users_table.scan(
-            FilterExpression="email = :e",
-            ExpressionAttributeValues={":e": email},
-            Limit=1,
-        )
-        items = result.get("Items", [])
-        if not items:
+        user = users.by_email(email)
+        if not user:
             return cors_json_response(401, {"error": "Invalid email or password."})
 
-        user = items[0]
         pw_hash, _ = _hash_password(password, user.get("pw_salt", ""))
         if pw_hash != user.get("pw_hash"):
             return cors_json_response(401, {"error": "Invalid email or password."})
@@ -1509,33 +1723,19 @@ def _handle_update_profile(event, user):
     updates["updated_at"] = int(time.time())
 
     try:
-        expr_parts = []
-        expr_values = {}
-        expr_names = {}
-        for i, (k, v) in enumerate(updates.items()):
-            attr_name = f"#f{i}"
-            attr_val = f":v{i}"
-            expr_parts.append(f"{attr_name} = {attr_val}")
-            expr_names[attr_name] = k
-            expr_values[attr_val] = v
-
-        users_table.update_item(
-            Key={"user_id": user["user_id"]},
-            UpdateExpression="SET " + ", ".join(expr_parts),
-            ExpressionAttributeNames=expr_names,
-            ExpressionAttributeValues=expr_values,
-            ReturnValues="ALL_NEW",
-        )
-
-        # Fetch and return updated profile
-        result = users_table.get_item(Key={"user_id": user["user_id"]})
-        updated = result.get("Item", user)
+        # ALL_NEW gives the updated profile without a second read
+        updated = users.update(user, updates)
         return _handle_get_profile(updated)
     except Exception as e:
         logger.error(f"Profile update failed: {e}")
         return cors_json_response(500, {"error": "Failed to update profile."})
 
 
+# /profile/history: the most recent calls, each with its first turns
+PROFILE_HISTORY_CALLS = int(os.environ.get("PROFILE_HISTORY_CALLS", "10"))
+PROFILE_HISTORY_TURNS = 10
+
+
 def _handle_call_history(event, user):
     """GET /profile/history — Return user's call history."""
     phone = user.get("phone", "")
@@ -1548,15 +1748,21 @@ def _handle_call_history(event, user):
             FilterExpression="from_number = :ph",
             ExpressionAttributeValues={":ph": phone},
         )
-        calls = sorted(result.get("Items", []), key=lambda x: x.get("timestamp", 0), reverse=True)[:20]
+        calls = sorted(result.get("Items", []), key=lambda x: x.get("timestamp", 0),
+                       reverse=True)[:PROFILE_HISTORY_CALLS]
 
+        # First turns of every listed call in one batched read (not a query per call)
+        conversations = call_turns.first_many(
+            [(call.get("call_id", ""), call.get("conversation_history")) for call in calls],
+            PROFILE_HISTORY_TURNS,
+        )
         history = []
         for call in calls:
             history.append({
                 "call_id": call.get("call_id", ""),
                 "timestamp": int(call.get("timestamp", 0)),
                 "language": call.get("language", ""),
-                "conversation": call.get("conversation_history", [])[:10],  # Last 10 turns
+                "conversation": conversations.get(call.get("call_id", ""), []),
             })
 
         return cors_json_response(200, {"calls": history})
@@ -1582,36 +1788,22 @@ def _get_phone_profile(phone_number: str) -> dict | None:
         return None
 
 
-def detect_language_from_speech(speech_text: str) -> str:
-    """Fast character-based language detection — no API call, instant."""
-    if not speech_text or not speech_text.strip():
-        return "hi"
-    text  = speech_text.strip()
-    total = max(len(text), 1)
-    tamil = sum(1 for c in text if '\u0B80' <= c <= '\u0BFF')
-    deva  = sum(1 for c in text if '\u0900' <= c <= '\u097F')
-    if tamil / total > 0.15:
-        return "ta"
-    if deva / total > 0.15:
-        # Marathi-specific function words (Marathi uses same Devanagari as Hindi)
-        if any(w in text for w in ["आहे", "आहात", "आहेत", "नाही", "केला", "बोला", "सांगा",
-                                    "आम्ही", "तुम्ही", "आणि", "करा", "होय", "मला",
-                                    "तुम्हाला", "आपण", "करतो", "जाते", "आलो"]):
-            return "mr"
-        return "hi"
-    # ASCII / Hinglish — check common Hindi romanized words
-    t = text.lower()
-    if any(f" {w} " in f" {t} " or t.startswith(w + " ") or t.endswith(" " + w)
-           for w in ["hai", "hain", "kya", "nahi", "aur", "mera", "mujhe", "karo",
-                     "bolo", "batao", "haan", "acha", "theek", "matlab", "yaar",
-                     "bhai", "kaise", "kyun", "kaun", "kab", "abhi"]):
-        return "hi"
-    return "en"
-
-
-def handle_language_detect(params):
+# Auto-detect only overrides the call language when this sure (lang_id.py scores)
+LANG_ID_MIN_CONFIDENCE = float(os.environ.get("LANG_ID_MIN_CONFIDENCE", "0.6"))
+
+
+def detect_language_from_speech(speech_text: str, default: str = "hi") -> str:
+    """Fast script-based language detection (lang_id.py) — no API call, instant.
+
+    Only call languages (LANG_CONFIG) are returned; default when the transcript is
+    empty, in another language, or too ambiguous.
+    """
+    return lang_id.detect(speech_text, supported=LANG_CONFIG, default=default,
+                          min_confidence=LANG_ID_MIN_CONFIDENCE)[0]
+
+
+def handle_language_detect(params, session):
     """Handle first speech utterance for language detection (first-time callers)."""
-    call_sid    = params.get("CallSid", "")
     speech_text = params.get("SpeechResult", "")
     digit       = params.get("Digits", "")
     from_number = params.get("From", "unknown")
@@ -1650,19 +1842,8 @@ def handle_language_detect(params):
             except Exception:
                 pass
 
-    # Update call record with detected language
-    def _update_lang():
-        try:
-            ts = get_call_timestamp(call_sid)
-            calls_table.update_item(
-                Key={"call_id": call_sid, "timestamp": ts},
-                UpdateExpression="SET #lang = :lang",
-                ExpressionAttributeNames={"#lang": "language"},
-                ExpressionAttributeValues={":lang": language}
-            )
-        except Exception as e:
-            logger.warning(f"DynamoDB lang update failed: {e}")
-    threading.Thread(target=_update_lang, daemon=True).start()
+    # Update call record with detected language (written before the response returns)
+    session.set(language=language)
 
     # Now go straight to gather with detected language + default agent
     agent = DEFAULT_AGENT
@@ -1674,7 +1855,7 @@ def handle_language_detect(params):
     cfg = LANG_CONFIG.get(language, LANG_CONFIG["en"])
     response = VoiceResponse()
     tts_say(response, greeting, language, speaker=agent_voice)
-    _append_listen_gather(response, language, agent_voice, agent)
+    _append_listen_gather(response, language, agent_voice, agent, session=session)
     return twiml_response(response)
 
 
@@ -1692,8 +1873,8 @@ def handle_incoming(params):
         caller_profile.get("language", "en") if caller_profile else "en"
     )
 
-    # Save call to DynamoDB
-    calls_table.put_item(Item={
+    # Save call to DynamoDB — this request's session starts from the new record
+    call_item = {
         "call_id": call_sid,
         "timestamp": int(datetime.now().timestamp()),
         "from_number": from_number,
@@ -1701,14 +1882,15 @@ def handle_incoming(params):
         "language": language,
         "voice_speaker": voice_param if voice_param in VOICE_OPTIONS else "",
         "queries_count": 0,
-        "conversation_history": [],
         "user_id": caller_profile.get("user_id", "") if caller_profile else "",
         "source": "browser" if lang_param else "phone",
-    })
+    }
+    calls_table.put_item(Item=call_item)
+    session = call_session.CallSession(calls_table, call_sid, call_item, turns=call_turns)
 
     # Browser call: skip language menu, go to voice select (or straight to gather if voice pre-set)
     if lang_param and lang_param in LANG_CONFIG:
-        return _browser_call_welcome(call_sid, language, voice=voice_param)
+        return _browser_call_welcome(call_sid, language, session, voice=voice_param)
 
     # ── Returning phone caller? Check phone_profiles for stored language ──
     phone_profile = _get_phone_profile(from_number)
@@ -1728,18 +1910,14 @@ def handle_incoming(params):
         stt_url = f"{BASE_URL}/voice/stt?lang={stored_lang}&voice={agent_voice}&agent={stored_agent}" if BASE_URL else f"/voice/stt?lang={stored_lang}&voice={agent_voice}&agent={stored_agent}"  # noqa: F841 (kept for logging only)
 
         resp = VoiceResponse()
-        # Use cached TTS where possible (same text reuses S3 URL on warm Lambda)
-        g_url = _cached_tts(greeting, stored_lang, speaker=agent_voice) if not stored_name else None
-        if g_url:
-            resp.play(g_url)
-        else:
-            tts_say(resp, greeting, stored_lang, speaker=agent_voice)
-        _append_listen_gather(resp, stored_lang, agent_voice, stored_agent)
+        # Greeting audio is content-addressed, so the same text is synthesised once across all containers
+        tts_say(resp, greeting, stored_lang, speaker=agent_voice)
+        _append_listen_gather(resp, stored_lang, agent_voice, stored_agent, session=session)
         return twiml_response(resp)
 
     # ── First-time phone caller — TTS welcome + digit/speech gather for language detection ──
     response = VoiceResponse()
-    detect_url = f"{BASE_URL}/voice/language-detect" if BASE_URL else "/voice/language-detect"
+    detect_url = f"{BASE_URL}/voice/language-detect?ts={session.ts}" if BASE_URL else f"/voice/language-detect?ts={session.ts}"
     gather = Gather(
         input="speech dtmf", action=detect_url, method="POST",
         timeout=10, num_digits=1,
@@ -1747,39 +1925,25 @@ def handle_incoming(params):
         hints="hindi, marathi, tamil, english, हाँ, हिंदी, मराठी",
     )
 
-    # Welcome in each language so every caller hears their own language
-    tts_say(gather,
-            "नमस्ते! वाणीसेवा में आपका स्वागत है। हिंदी के लिए 1 दबाएं।",
-            "hi", speaker="arya")
-    tts_say(gather,
-            "नमस्कार! मराठीसाठी 2 दाबा।",
-            "mr", speaker="arya")
-    tts_say(gather,
-            "வணக்கம்! தமிழுக்கு 3 அழுத்தவும்।",
-            "ta", speaker="arya")
-    tts_say(gather,
-            "Welcome! Press 4 for English.",
-            "en", speaker="vidya")
+    # Welcome in each language so every caller hears their own language.
+    # Menu clips and the no-input prompt are all synthesised at once.
+    no_input_clips   = [static_prompts.WELCOME_NO_INPUT]
+    menu_futures     = _tts_submit(static_prompts.WELCOME_MENU)
+    no_input_futures = _tts_submit(no_input_clips)
+    _play_clips(gather, static_prompts.WELCOME_MENU, menu_futures)
     response.append(gather)
 
     # No-input fallback — prompt again via TTS
-    tts_say(response,
-            "कोई इनपुट नहीं मिला। कृपया दोबारा कॉल करें और 1, 2, 3 या 4 दबाएं।",
-            "hi", speaker="arya")
+    _play_clips(response, no_input_clips, no_input_futures)
 
     return twiml_response(response)
 
 
-def _browser_call_welcome(call_sid: str, language: str, voice: str = ""):
+def _browser_call_welcome(call_sid: str, language: str, session, voice: str = ""):
     """Skip DTMF menu for browser calls — go to voice select then gather."""
     if voice and voice in VOICE_OPTIONS:
         # Web pre-selected voice — skip voice menu, greet and go straight to gather
-        greetings = {
-            "hi": "नमस्ते! मैं वाणीसेवा हूँ, आपकी अपनी दीदी। बताइए, आज मैं आपकी किस बात में मदद करूँ?",
-            "mr": "नमस्कार! मी वाणीसेवा, तुमची ताई. बोला, आज मी तुम्हाला कशात मदत करू?",
-            "ta": "வணக்கம்! நான் வாணீசேவா, உங்கள் அக்கா. சொல்லுங்க, இன்று நான் எப்படி உதவ வேண்டும்?",
-            "en": "Hello! I'm VaaniSeva, your friendly helper. Tell me, how can I help you today?",
-        }
+        greetings = static_prompts.BROWSER_GREETINGS
         fallbacks = {
             "hi": "अरे, आवाज़ नहीं आई। एक बार फिर से बोलिए ना?",
             "mr": "अरे, ऐकू आलं नाही. पुन्हा एकदा सांगा ना?",
@@ -1789,7 +1953,7 @@ def _browser_call_welcome(call_sid: str, language: str, voice: str = ""):
         cfg        = LANG_CONFIG[language]
         response = VoiceResponse()
         tts_say(response, greetings.get(language, greetings["en"]), language, speaker=voice)
-        _append_listen_gather(response, language, voice, voice)  # voice==agent for browser calls
+        _append_listen_gather(response, language, voice, voice, session=session)  # voice==agent for browser calls
         return twiml_response(response)
 
     # No voice pre-selected — go straight to Arya (default) greeting
@@ -1800,29 +1964,17 @@ def _browser_call_welcome(call_sid: str, language: str, voice: str = ""):
     greeting   = agent_cfg.get(greeting_key, agent_cfg["greeting_hi"])
     response   = VoiceResponse()
     tts_say(response, greeting, language, speaker=agent_voice)
-    _append_listen_gather(response, language, agent_voice, agent)
+    _append_listen_gather(response, language, agent_voice, agent, session=session)
     return twiml_response(response)
 
 
 # ── Step 2: Language selected → go to voice selection ───────
-def handle_language_select(params):
-    call_sid = params.get("CallSid", "")
+def handle_language_select(params, session):
     digit    = params.get("Digits", "2")
     language = DIGIT_TO_LANG.get(digit, "hi")  # 1=hi, 2=mr, 3=ta, 4=en
 
-    # Update DynamoDB on background thread (non-blocking)
-    def _update_lang():
-        try:
-            ts = get_call_timestamp(call_sid)
-            calls_table.update_item(
-                Key={"call_id": call_sid, "timestamp": ts},
-                UpdateExpression="SET #lang = :lang",
-                ExpressionAttributeNames={"#lang": "language"},
-                ExpressionAttributeValues={":lang": language}
-            )
-        except Exception as e:
-            logger.warning(f"DynamoDB lang update failed: {e}")
-    threading.Thread(target=_update_lang, daemon=True).start()
+    # Update call record (written before the response returns)
+    session.set(language=language)
 
     # Skip voice menu — go straight to default agent greeting
     agent      = DEFAULT_AGENT
@@ -1832,11 +1984,11 @@ def handle_language_select(params):
     greeting   = agent_cfg.get(greeting_key, agent_cfg["greeting_hi"])
     response   = VoiceResponse()
     tts_say(response, greeting, language, speaker=agent_voice)
-    _append_listen_gather(response, language, agent_voice, agent)
+    _append_listen_gather(response, language, agent_voice, agent, session=session)
     return twiml_response(response)
 
 
-def _play_voice_select_menu(call_sid: str, language: str):
+def _play_voice_select_menu(call_sid: str, language: str, session):
     """Play the voice selection IVR menu (1=Arya, 2=Vidya, 3=Hitesh)."""
     prompts = {
         "hi": "अब आवाज़ चुनिए। आर्या के लिए 1 दबाएं, विद्या के लिए 2, और हितेश के लिए 3 दबाएं।",
@@ -1844,7 +1996,7 @@ def _play_voice_select_menu(call_sid: str, language: str):
         "ta": "இப்போது குரலை தேர்வு செய்யுங்கள். ஆர்யாவிற்கு 1, வித்யாவிற்கு 2, ஹிதேஷிற்கு 3 அழுத்துங்கள்.",
         "en": "Now choose a voice. Press 1 for Arya, 2 for Vidya, or 3 for Hitesh.",
     }
-    voice_select_url = f"{BASE_URL}/voice/voice-select?lang={language}" if BASE_URL else f"/voice/voice-select?lang={language}"
+    voice_select_url = f"{BASE_URL}/voice/voice-select?lang={language}{_ts_qs(session)}" if BASE_URL else f"/voice/voice-select?lang={language}{_ts_qs(session)}"
     cfg = LANG_CONFIG.get(language, LANG_CONFIG["en"])
     response = VoiceResponse()
     gather = Gather(num_digits=1, action=voice_select_url, method="POST", timeout=8)
@@ -1857,39 +2009,15 @@ def _play_voice_select_menu(call_sid: str, language: str):
 
 
 # ── Step 2b: Voice selected ───────────────────────────────────
-def handle_voice_select(params):
-    call_sid = params.get("CallSid", "")
+def handle_voice_select(params, session):
     language = params.get("lang", "hi")
     digit    = params.get("Digits", "1")
     voice    = DIGIT_TO_VOICE.get(digit, "arya")
 
     # Persist chosen voice on the call record
-    def _update_voice():
-        try:
-            ts = get_call_timestamp(call_sid)
-            calls_table.update_item(
-                Key={"call_id": call_sid, "timestamp": ts},
-                UpdateExpression="SET voice_speaker = :v",
-                ExpressionAttributeValues={":v": voice}
-            )
-        except Exception as e:
-            logger.warning(f"DynamoDB voice update failed: {e}")
-    threading.Thread(target=_update_voice, daemon=True).start()
-
-    confirmations = {
-        "hi":   {"arya": "ठीक है! आर्या की आवाज़ में बात करेंगे। बताइए आपका सवाल!",
-                 "vidya": "ठीक है! विद्या की आवाज़ में बात करेंगे। बताइए आपका सवाल!",
-                 "hitesh": "ठीक है! हितेश की आवाज़ में बात करेंगे। बताइए आपका सवाल!"},
-        "mr":   {"arya": "ठीक आहे! आर्याच्या आवाजात बोलू. बोला तुमचा प्रश्न!",
-                 "vidya": "ठीक आहे! विद्याच्या आवाजात बोलू. बोला तुमचा प्रश्न!",
-                 "hitesh": "ठीक आहे! हितेशच्या आवाजात बोलू. बोला तुमचा प्रश्न!"},
-        "ta":   {"arya": "சரி! ஆர்யா குரலில் பேசுவோம். கேளுங்கள்!",
-                 "vidya": "சரி! வித்யா குரலில் பேசுவோம். கேளுங்கள்!",
-                 "hitesh": "சரி! ஹிதேஷ் குரலில் பேசுவோம். கேளுங்கள்!"},
-        "en":   {"arya": "Got it! You'll hear Arya's voice. Go ahead, ask your question!",
-                 "vidya": "Got it! You'll hear Vidya's voice. Go ahead, ask your question!",
-                 "hitesh": "Got it! You'll hear Hitesh's voice. Go ahead, ask your question!"},
-    }
+    session.set(voice_speaker=voice)
+
+    confirmations = static_prompts.VOICE_CONFIRMATIONS
     fallbacks = {
         "hi": "कुछ सुनाई नहीं दिया। दोबारा कॉल करके बात कीजिए ना।",
         "mr": "काही ऐकू आलं नाही. पुन्हा कॉल करा ना.",
@@ -1898,25 +2026,15 @@ def handle_voice_select(params):
     }
 
     cfg = LANG_CONFIG.get(language, LANG_CONFIG["en"])
-    confirmation = confirmations.get(language, confirmations["en"]).get(voice, "Let's go! Ask your question.")
+    confirmation = confirmations.get(language, confirmations["en"]).get(voice, static_prompts.VOICE_CONFIRMATION_DEFAULT)
     response = VoiceResponse()
     tts_say(response, confirmation, language, speaker=voice)
-    _append_listen_gather(response, language, voice, voice)  # voice==agent
+    _append_listen_gather(response, language, voice, voice, session=session)  # voice==agent
     return twiml_response(response)
 
 
-def _get_call_voice(call_sid: str, fallback_voice: str = "arya") -> str:
-    """Read the caller's chosen voice from DynamoDB."""
-    try:
-        ts = get_call_timestamp(call_sid)
-        item = calls_table.get_item(Key={"call_id": call_sid, "timestamp": ts}).get("Item", {})
-        return item.get("voice_speaker", fallback_voice)
-    except Exception:
-        return fallback_voice
-
-
 # ── Step 3: User spoke — kick off async processing ──────────
-def handle_stt(params):
+def handle_stt(params, session):
     """POST /voice/stt — Twilio <Record> callback. Downloads recording, transcribes via Sarvam Saaras v3."""
     call_sid     = params.get("CallSid", "")
     language     = params.get("lang", "hi")
@@ -1925,21 +2043,20 @@ def handle_stt(params):
 
     if duration < 1 or not recording_url:
         logger.info(f"Empty recording call={call_sid}, asking again")
-        return ask_again(language)
+        return ask_again(language, session=session)
 
     try:
         account_sid = os.environ.get("TWILIO_ACCOUNT_SID", "")
         auth_token  = os.environ.get("TWILIO_AUTH_TOKEN", "")
-        audio_r = requests.get(
-            f"{recording_url}.wav",
+        audio_r = http_client.get(
+            "twilio", f"{recording_url}.wav",
             auth=(account_sid, auth_token),
-            timeout=10,
         )
         audio_r.raise_for_status()
         audio_bytes = audio_r.content
     except Exception as e:
         logger.warning(f"Failed to download recording call={call_sid}: {e}")
-        return ask_again(language)
+        return ask_again(language, session=session)
 
     # Delete recording from Twilio for privacy (fire-and-forget)
     try:
@@ -1947,7 +2064,7 @@ def handle_stt(params):
         _tok  = os.environ.get("TWILIO_AUTH_TOKEN", "")
         if _acct and _tok:
             threading.Thread(
-                target=lambda: requests.delete(recording_url, auth=(_acct, _tok)),
+                target=lambda: http_client.delete("twilio", recording_url, auth=(_acct, _tok)),
                 daemon=True,
             ).start()
     except Exception:
@@ -1956,10 +2073,10 @@ def handle_stt(params):
     transcript = _sarvam_stt(audio_bytes, language)
     if not transcript:
         logger.info(f"Empty transcript call={call_sid}, asking again")
-        return ask_again(language)
+        return ask_again(language, session=session)
 
     # Auto-detect language from what user actually said (overrides URL param)
-    detected_lang = detect_language_from_speech(transcript)
+    detected_lang = detect_language_from_speech(transcript, default=language)
     if detected_lang and detected_lang != language:
         logger.info(f"Language auto-corrected: {language} → {detected_lang} for call={call_sid}")
         language = detected_lang
@@ -1968,10 +2085,10 @@ def handle_stt(params):
     new_params = dict(params)
     new_params["SpeechResult"] = transcript
     new_params["lang"] = language
-    return handle_gather(new_params)
+    return handle_gather(new_params, session)
 
 
-def handle_gather(params):
+def handle_gather(params, session):
     """
     Immediately responds with a "please wait" message and redirects to
     /voice/poll, while processing RAG + TTS in a background thread.
@@ -1980,37 +2097,20 @@ def handle_gather(params):
     call_sid    = params.get("CallSid", "")
     speech_text = params.get("SpeechResult", "")
     language    = params.get("lang", "hi")
-    voice       = params.get("voice", "") or _get_call_voice(call_sid)
+    voice       = params.get("voice", "") or session.voice or "arya"   # the one call-record read for this turn
     current_agent = params.get("agent", "")
 
     logger.info(f"Speech: '{speech_text}' | Lang: {language} | Voice: {voice} | Agent: {current_agent} | Call: {call_sid}")
 
+    # Every keyword category in one pass over the utterance (intent_phrases.py)
+    hits = intent_phrases.match(speech_text)
+
     # ── Goodbye detection — end the call immediately ──────────────
-    # Multi-word phrases: unambiguous even inside longer sentences
-    bye_phrases = [
-        "band karo", "बंद करो", "rakh do", "रख दो",
-        "phone rakh", "फोन रख", "phone band",
-        "cut the call", "call end", "hang up", "hang up the call",
-        "kaat do", "काट दो", "phone kaat", "फोन काट",
-        "call kaat", "call band", "call rok",
-        "shukriya bye", "शुक्रिया बाय", "thank you bye",
-        "alvida", "अलविदा", "விடை", "போதும்",
-        "dhanyavaad", "धन्यवाद", "shukriya", "शुक्रिया",
-    ]
-    # Single-word goodbyes: only trigger when utterance is short (≤5 words)
-    bye_words = {"bye", "goodbye", "tata", "ciao", "thanks", "thankyou"}
-    _words = speech_text.lower().split() if speech_text else []
-    _is_goodbye = (
-        (speech_text and any(p in speech_text.lower() for p in bye_phrases))
-        or (len(_words) <= 5 and bool(bye_words & set(_words)))
-    )
+    # Goodbye phrases are unambiguous even inside longer sentences; single-word
+    # goodbyes only count when the utterance is short (≤5 words)
+    _is_goodbye = "bye" in hits or ("bye_word" in hits and len(speech_text.split()) <= 5)
     if _is_goodbye:
-        goodbyes = {
-            "hi": "अच्छा चलिए, ख्याल रखिए! फिर कभी कॉल कीजिए।",
-            "mr": "बरं चला, काळजी घ्या! पुन्हा कॉल करा.",
-            "ta": "சரி, கவனமா இருங்க! மீண்டும் அழையுங்க.",
-            "en": "Take care! Call again anytime.",
-        }
+        goodbyes = static_prompts.GOODBYES_CALLER
         response = VoiceResponse()
         tts_say(response, goodbyes.get(language, goodbyes["en"]), language, speaker=voice)
         response.hangup()
@@ -2019,114 +2119,63 @@ def handle_gather(params):
     # ── Mid-call language switch (run BEFORE auto-detect) ───────────
     # IMPORTANT: Only switch the CONVERSATION language when user clearly wants the whole
     # conversation in another language — NOT when they ask the agent to "say something in Tamil".
-    # Require BOTH a language name AND an explicit switch phrase.
-    lang_switch_map = {
-        "hindi": "hi", "हिंदी": "hi", "हिन्दी": "hi", "hindi mein": "hi",
-        "english": "en", "अंग्रेजी": "en", "इंग्लिश": "en",
-        "marathi": "mr", "मराठी": "mr",
-        "tamil": "ta", "तमिल": "ta", "தமிழ்": "ta",
-    }
-    # These MUST appear together with a language name — "bol" alone is too broad
-    lang_switch_triggers = [
-        "talk in", "speak in", "switch to", "change to",
-        "mein baat", "mein bol", "mein bolo", "mein bolna",
-        "baat karo", "baat karna", "baat karein",
-        "bhasha badlo", "bhasha", "language change", "language switch",
-        "में बोलो", "में बात", "भाषा बदलो", "भाषा",
-    ]
+    # Require BOTH a language name AND an explicit switch phrase ("bol" alone is too broad).
     _explicit_lang_switch = False
-    if speech_text:
-        text_lower = speech_text.lower()
-        if any(t in text_lower for t in lang_switch_triggers):
-            new_lang = None
-            for trigger_word, lang_code in lang_switch_map.items():
-                if trigger_word.lower() in text_lower:
-                    new_lang = lang_code
-                    break
-            if new_lang and new_lang != language:
-                _explicit_lang_switch = True
-                language = new_lang
-                cfg = LANG_CONFIG.get(language, LANG_CONFIG["en"])
-                switch_confirms = {
-                    "hi": "ठीक है, अब मैं हिंदी में बात करूँगी।",
-                    "mr": "ठीक आहे, आता मी मराठीत बोलतो.",
-                    "ta": "சரி, இனிமேல் தமிழில் பேசுகிறேன்.",
-                    "en": "Sure, I'll speak in English now.",
-                }
-                response = VoiceResponse()
-                tts_say(response, switch_confirms.get(language, switch_confirms["en"]), language, speaker=voice)
-                _append_listen_gather(response, language, voice, current_agent)
-                return twiml_response(response)
+    if "lang_switch" in hits:
+        new_lang = hits.first("lang")
+        if new_lang and new_lang != language:
+            _explicit_lang_switch = True
+            language = new_lang
+            switch_confirms = static_prompts.SWITCH_CONFIRMS
+            response = VoiceResponse()
+            tts_say(response, switch_confirms.get(language, switch_confirms["en"]), language, speaker=voice)
+            _append_listen_gather(response, language, voice, current_agent, session=session)
+            return twiml_response(response)
 
     # Auto-detect language from the actual transcript — but only if no explicit switch was made
     if speech_text and not _explicit_lang_switch:
-        detected = detect_language_from_speech(speech_text)
+        detected = detect_language_from_speech(speech_text, default=language)
         if detected and detected != language:
             logger.info(f"Language auto-corrected: {language} → {detected} in handle_gather")
             language = detected
 
     # Mid-call voice switch: user says "change voice" / "आवाज़ बदलो" etc.
-    change_triggers = ["change voice", "change my voice", "different voice",
-                       "आवाज़ बदलो", "आवाज बदलो", "दूसरी आवाज़",
-                       "आवाज बदल", "voice change", "குரல் மாற்று", "आवाज बदलवा"]
-    if speech_text and any(t in speech_text.lower() for t in change_triggers):
-        return _play_voice_select_menu(call_sid, language)
+    if "voice_change" in hits:
+        return _play_voice_select_menu(call_sid, language, session)
 
     if not speech_text:
-        return ask_again(language)
+        return ask_again(language, session=session)
 
     # ── Detect or maintain current agent ───────────────────────────
     if not current_agent:
-        current_agent = detect_agent_from_intent(speech_text, language)
+        current_agent = detect_agent_from_intent(speech_text, language, hits=hits)
     else:
         # Check for mid-call agent switch request
-        requested_agent = detect_agent_from_intent(speech_text, language)
+        requested_agent = detect_agent_from_intent(speech_text, language, hits=hits)
         if requested_agent != current_agent:
             # Switch if user explicitly named an agent OR used a connecting phrase
-            name_triggers = {
-                "arya":   ["arya", "aria", "aarya", "ariya", "आर्या"],
-                "hitesh": ["hitesh", "hitesha", "हितेश"],
-                "vidya":  ["vidya", "vidhya", "विद्या"],
-            }
-            switch_phrases = ["se baat", "ko bulao", "se milana", "se milao",
-                              "baat karao", "baat karo", "bulao", "la do",
-                              "de do", "connect", "transfer"]
-            text_lower = speech_text.lower()
-            agent_named = any(t in text_lower for t in name_triggers.get(requested_agent, []))
-            has_switch_phrase = any(p in text_lower for p in switch_phrases)
+            agent_named = f"agent:{requested_agent}" in hits
+            has_switch_phrase = "switch" in hits
             explicitly_named = agent_named and (has_switch_phrase or True)  # name alone is enough
             if explicitly_named:
                 # Play transfer announcement in CURRENT agent's voice
                 old_agent_cfg = AGENT_REGISTRY.get(current_agent, AGENT_REGISTRY[DEFAULT_AGENT])
                 old_voice = old_agent_cfg["sarvam_speaker"]
                 old_gender = old_agent_cfg.get("gender", "female")
-                if old_gender == "male":
-                    transfer_msgs = {
-                        "hi": f"ठीक है, मैं आपको {AGENT_REGISTRY[requested_agent]['name_hi']} से जोड़ रहा हूँ। एक सेकंड।",
-                        "mr": f"ठीक आहे, मी तुम्हाला {AGENT_REGISTRY[requested_agent]['name']} शी जोडतो. एक क्षण.",
-                        "ta": f"சரி, உங்களை {AGENT_REGISTRY[requested_agent]['name']} கிட்ட இணைக்கிறேன். ஒரு நிமிஷம்.",
-                        "en": f"Sure, let me connect you to {AGENT_REGISTRY[requested_agent]['name']}. One moment.",
-                    }
-                else:
-                    transfer_msgs = {
-                        "hi": f"ठीक है, मैं आपको {AGENT_REGISTRY[requested_agent]['name_hi']} से जोड़ रही हूँ। एक सेकंड।",
-                        "mr": f"ठीक आहे, मी तुम्हाला {AGENT_REGISTRY[requested_agent]['name']} शी जोडते. एक क्षण.",
-                        "ta": f"சரி, உங்களை {AGENT_REGISTRY[requested_agent]['name']} கிட்ட இணைக்கிறேன். ஒரு நிமிஷம்.",
-                        "en": f"Sure, let me connect you to {AGENT_REGISTRY[requested_agent]['name']}. One moment.",
-                    }
+                _target_cfg = AGENT_REGISTRY[requested_agent]
+                _templates = static_prompts.TRANSFER_MSGS["male" if old_gender == "male" else "female"]
+                transfer_msg = _templates.get(language, _templates["hi"]).format(
+                    name=_target_cfg["name"], name_hi=_target_cfg["name_hi"])
                 current_agent = requested_agent
                 agent_cfg = AGENT_REGISTRY[current_agent]
                 greeting_key = f"greeting_{language}"
                 switch_msg = agent_cfg.get(greeting_key, agent_cfg["greeting_hi"])
                 agent_voice = agent_cfg["sarvam_speaker"]
-                cfg = LANG_CONFIG.get(language, LANG_CONFIG["en"])
                 response = VoiceResponse()
-                # Transfer announcement in old agent's voice
-                tts_say(response, transfer_msgs.get(language, transfer_msgs["hi"]), language, speaker=old_voice)
-                response.pause(length=1)
-                # New agent greeting in new agent's voice
-                tts_say(response, switch_msg, language, speaker=agent_voice)
-                _append_listen_gather(response, language, agent_voice, current_agent)
+                # Transfer announcement in old agent's voice, then greeting in new agent's voice
+                tts_say_many(response, [(transfer_msg, language, old_voice),
+                                        (switch_msg, language, agent_voice)], pause=1)
+                _append_listen_gather(response, language, agent_voice, current_agent, session=session)
                 return twiml_response(response)
 
     # Use agent's voice for TTS; always update voice when agent changes
@@ -2135,18 +2184,35 @@ def handle_gather(params):
 
     # ── Synchronous LLM + TTS (fast path) ────────────────────────
     # Running everything inline eliminates the poll round-trip overhead (~2s saved)
-    cfg     = LANG_CONFIG.get(language, LANG_CONFIG["en"])
-    goodbyes = {
-        "hi": "अच्छा चलिए, ख्याल रखिए!",
-        "mr": "बरं चला, काळजी घ्या!",
-        "ta": "சரி, கவனமா இருங்க!",
-        "en": "Take care!",
-    }
-
-    # Fetch history (single DynamoDB get, fast)
-    history = get_conversation_history(call_sid) if call_sid else []
-
-    call_system_prompt = build_system_prompt(current_agent, language)
+    goodbyes = static_prompts.GOODBYES_SHORT
+
+    # History comes from the session loaded at the top of the turn: the rolling
+    # summary of older turns plus the raw turns it doesn't cover yet
+    history = call_memory.prompt_turns(session.history, session.summary_upto) if call_sid else []
+    memory  = session.summary if call_sid else ""
+    # Queued — written with the turn in one update before the response returns
+    session.set(language=language, voice_speaker=voice, agent=current_agent)
+
+    # ── Semantic answer cache: a repeat question skips the LLM and TTS ──
+    # The lookup runs alongside the LLM stream; its hit is only used if it lands
+    # before the first sentence has gone to TTS
+    cache_lookup = (_ANSWER_CACHE_EXECUTOR.submit(_lookup_cached_answer, speech_text, language, current_agent)
+                    if _answer_cacheable(speech_text, memory, history) else None)
+    cache_embedding, cached = None, None
+
+    def _take_cache_hit() -> bool:
+        """Collect a finished lookup (never waits); True if its hit can still replace the LLM answer."""
+        nonlocal cache_lookup, cache_embedding, cached
+        if cache_lookup is None or not cache_lookup.done():
+            return False
+        cache_embedding, cached = cache_lookup.result()
+        cache_lookup = None
+        if cached and streamer and streamer.started:
+            cached = None   # too late — the caller is already getting the fresh answer
+        return bool(cached)
+
+    call_prompt_static, call_prompt_dynamic = build_system_prompt_parts(current_agent, language)
+    call_system_prompt = call_prompt_static + call_prompt_dynamic
     _lang_hint = {
         "hi": "Respond in Hindi (Devanagari script).",
         "mr": "Respond in Marathi.",
@@ -2158,7 +2224,7 @@ def handle_gather(params):
     _now_str = datetime.now(_IST).strftime("%d %B %Y, %I:%M %p IST")
     _umsg = f"[Date/Time: {_now_str}]\n[{_lang_hint.get(language, _lang_hint['en'])}]\n{speech_text}"
     _msgs = []
-    for _t in (history or [])[-10:]:
+    for _t in history:
         if _t.get("query"):
             _msgs.append({"role": "user", "content": [{"text": _t["query"]}]})
         if _t.get("answer"):
@@ -2166,29 +2232,63 @@ def handle_gather(params):
     _msgs.append({"role": "user", "content": [{"text": _umsg}]})
 
     quick_answer = ""
+    # Streaming mode: each finished sentence goes to TTS while the model is still generating
+    streamer = _StreamingTTS(language, voice) if LLM_TTS_STREAMING else None
+    llm_started = time.time()
+    first_token_ms = None
+    use_cached = False
     try:
         _stream = bedrock.converse_stream(
             modelId=BEDROCK_MODEL_ID,
-            system=[{"text": call_system_prompt}],
+            system=prompt_cache.system_blocks(call_prompt_static,
+                                              call_prompt_dynamic + call_memory.system_suffix(memory),
+                                              BEDROCK_MODEL_ID),
             messages=_msgs,
             inferenceConfig={"maxTokens": 300, "temperature": 0.7, "stopSequences": ["User:", "Human:", "Assistant:"]}
         )
         for _ev in _stream.get("stream", []):
+            if "metadata" in _ev:
+                prompt_cache.record_usage(_ev["metadata"].get("usage", {}), "call_stream",
+                                          BEDROCK_MODEL_ID, first_token_ms)
             if "contentBlockDelta" in _ev:
-                quick_answer += _ev["contentBlockDelta"].get("delta", {}).get("text", "")
+                _delta = _ev["contentBlockDelta"].get("delta", {}).get("text", "")
+                if first_token_ms is None and _delta:
+                    first_token_ms = int((time.time() - llm_started) * 1000)
+                quick_answer += _delta
+                if _take_cache_hit():
+                    use_cached = True
+                    break
+                if streamer:
+                    streamer.feed(_delta)
+                    # [SWITCH:x] / [HANGUP] settle the turn — no need to wait for the rest
+                    if streamer.switch_requested() or streamer.hangup_requested():
+                        break
+        use_cached = use_cached or _take_cache_hit()
+        if use_cached:
+            if streamer:
+                streamer.cancel()
+        elif streamer:
+            streamer.finish()
         logger.info(f"LLM done call={call_sid}, len={len(quick_answer)}")
     except Exception as _e:
         logger.warning(f"LLM failed: {_e}")
-        quick_answer = {"hi": "माफ करें, कुछ समस्या आई। फिर से पूछिए।",
-                        "mr": "क्षमस्व, पुन्हा विचारा.", "ta": "மன்னிக்கவும், மீண்டும் கேளுங்கள்.",
-                        "en": "Sorry, something went wrong. Please ask again."}.get(language, "Please try again.")
+        if streamer:
+            streamer.cancel()
+            streamer = None
+        quick_answer = static_prompts.LLM_ERROR_MSGS.get(language, static_prompts.LLM_ERROR_DEFAULT)
+
+    if use_cached:
+        return _serve_cached_answer(cached, call_sid, speech_text, language, voice,
+                                    current_agent, session, llm_started)
 
     # ── LLM-driven hangup via [HANGUP] tag ───────────────────────
     import re as _re
     if _re.search(r'\[HANGUP\]', quick_answer, _re.IGNORECASE):
         clean_bye = _re.sub(r'\[HANGUP\]', '', quick_answer).strip()
         response = VoiceResponse()
-        if clean_bye:
+        if streamer:
+            streamer.play_into(response)
+        elif clean_bye:
             tts_say(response, clean_bye, language, speaker=voice)
         response.hangup()
         return twiml_response(response)
@@ -2198,6 +2298,8 @@ def handle_gather(params):
     if _switch_m:
         target_agent = _switch_m.group(1).lower()
         if target_agent != current_agent and target_agent in AGENT_REGISTRY:
+            if streamer:
+                streamer.cancel()
             _old_cfg    = AGENT_REGISTRY.get(current_agent, AGENT_REGISTRY[DEFAULT_AGENT])
             _old_voice  = _old_cfg["sarvam_speaker"]
             _old_gender = _old_cfg.get("gender", "female")
@@ -2205,17 +2307,11 @@ def handle_gather(params):
             _new_voice  = _new_cfg["sarvam_speaker"]
             _greeting_k = f"greeting_{language}"
             _switch_greeting = _new_cfg.get(_greeting_k, _new_cfg["greeting_hi"])
-            _xfer_msgs = {
-                "hi": f"ठीक है, अभी जोड़ता हूँ।" if _old_gender == "male" else f"ठीक है, अभी जोड़ती हूँ।",
-                "mr": "ठीक आहे, एक क्षण.",
-                "ta": "சரி, ஒரு நிமிஷம்.",
-                "en": "Sure, one moment.",
-            }
+            _xfer_msgs = static_prompts.QUICK_TRANSFER_MSGS["male" if _old_gender == "male" else "female"]
             _resp = VoiceResponse()
-            tts_say(_resp, _xfer_msgs.get(language, _xfer_msgs["hi"]), language, speaker=_old_voice)
-            _resp.pause(length=1)
-            tts_say(_resp, _switch_greeting, language, speaker=_new_voice)
-            _append_listen_gather(_resp, language, _new_voice, target_agent)
+            tts_say_many(_resp, [(_xfer_msgs.get(language, _xfer_msgs["hi"]), language, _old_voice),
+                                 (_switch_greeting, language, _new_voice)], pause=1)
+            _append_listen_gather(_resp, language, _new_voice, target_agent, session=session)
             return twiml_response(_resp)
 
     needs_data = ("[FETCH_DATA]" in quick_answer) or ("[WEB_SEARCH]" in quick_answer)
@@ -2226,26 +2322,44 @@ def handle_gather(params):
 
     if not needs_data:
         # ── Fast path: TTS + return TwiML directly (no poll needed) ───
-        audio_urls = _tts_chunks_parallel(clean_answer, language, speaker=voice)
-        threading.Thread(target=lambda: log_query(call_sid, speech_text, clean_answer, language),
-                         daemon=True).start()
+        log_query(session, speech_text, clean_answer, language)
         response = VoiceResponse()
-        for url in audio_urls:
-            response.play(url)
-        if not audio_urls:
-            response.say(clean_answer, voice=cfg["polly_voice"])
-        _append_listen_gather(response, language, voice, current_agent)
-        tts_say(response, goodbyes.get(language, goodbyes["en"]), language, speaker=voice)
+        # Goodbye (after the listen gather) is synthesised alongside the answer
+        bye_clips   = [(goodbyes.get(language, goodbyes["en"]), language, voice)]
+        bye_futures = _tts_submit(bye_clips)
+        if streamer:
+            streamer.play_into(response)
+        else:
+            answer_clips = [(c, language, voice) for c in _split_for_tts(clean_answer)]
+            _play_clips(response, answer_clips, _tts_submit(answer_clips, cache_lookup=False))
+        # Answers to a caller's first question carry no earlier context — share them
+        if cache_lookup is not None:
+            cache_embedding, cached = cache_lookup.result()   # the stream outlasts the lookup
+        if cache_embedding is not None and not cached and streamer and not history:
+            audio_keys = streamer.audio_keys()
+            if audio_keys:
+                gen_ms = int((time.time() - llm_started) * 1000)
+                # One put — done before returning, since the container freezes afterwards
+                answer_cache.store(language, current_agent, speech_text, cache_embedding,
+                                   clean_answer, audio_keys, gen_ms)
+        _append_listen_gather(response, language, voice, current_agent, session=session)
+        _play_clips(response, bye_clips, bye_futures)
         return twiml_response(response)
 
     # ── Data path: serve ack, fetch data async, poll for final answer ──
     job_key   = f"job#{call_sid}"
-    ack_audio = sarvam_tts(clean_answer, language, speaker=voice) or ""
+    job_id    = uuid.uuid4().hex[:12]   # distinguishes this question from earlier ones on the call
+    if streamer:
+        # Ack sentence(s) were already synthesised while the stream was running
+        ack_urls = [url for _, url in streamer.results() if url]
+    else:
+        ack_urls = [sarvam_tts(clean_answer, language, speaker=voice, cache_lookup=False) or ""]
+    ack_audio = ack_urls[0] if ack_urls else ""
     try:
-        calls_table.put_item(Item={
-            "call_id": job_key, "timestamp": 0, "status": "partial",
-            "answer": clean_answer, "audio_url": ack_audio, "lang": language,
-            "voice": voice, "ttl": int(time.time()) + 300,
+        _publish_job({
+            "call_id": job_key, "timestamp": 0, "job_id": job_id, "status": "partial",
+            "answer": clean_answer, "audio_url": ack_audio, "audio_urls": ack_urls,
+            "lang": language, "voice": voice, "ttl": int(time.time()) + 300,
         })
     except Exception as e:
         logger.warning(f"Job partial write failed: {e}")
@@ -2254,21 +2368,30 @@ def handle_gather(params):
 
     def _fetch_data_async():
         try:
+            fetch_started = time.time()
+            web_timings = {}
             def _fetch_rag():
                 if not should_use_rag(speech_text): return ""
-                return retrieve_context(get_embedding(speech_text), language)
+                embedding = cache_embedding if cache_embedding is not None else get_embedding(speech_text)
+                return retrieve_context(embedding, language)
             def _fetch_live():
-                return _fetch_data_gov(speech_text) if DATA_GOV_API_KEY else ""
+                return _fetch_data_gov(speech_text)
             def _fetch_web():
-                return _fetch_web_search(speech_text) if _needs_web_captured else ""
-            # Submit all three in parallel — don't call .result() inline
-            with ThreadPoolExecutor(max_workers=3) as ex:
-                f_rag  = ex.submit(_fetch_rag)
-                f_live = ex.submit(_fetch_live)
-                f_web  = ex.submit(_fetch_web)
-                rag_ctx  = f_rag.result()
-                live_ctx = f_live.result()
-                web_ctx  = f_web.result()
+                # The provider hedge gets whatever is left of the overall budget
+                remaining = FETCH_DATA_BUDGET_SECONDS - (time.time() - fetch_started)
+                return _fetch_web_search(speech_text, budget=max(remaining, 0.5), timings=web_timings)
+            # All sources run concurrently under one deadline — late sources are dropped
+            sources = {"rag": _fetch_rag}
+            if DATA_GOV_API_KEY:
+                sources["live"] = _fetch_live
+            if _needs_web_captured:
+                sources["web"] = _fetch_web
+            fetched, timings = fanout.gather(sources, FETCH_DATA_BUDGET_SECONDS)
+            timings.update(dict(web_timings))
+            logger.info(f"FETCH_DATA call={call_sid} took {int((time.time() - fetch_started) * 1000)} ms: {timings}")
+            rag_ctx  = fetched.get("rag", "")
+            live_ctx = fetched.get("live", "")
+            web_ctx  = fetched.get("web", "")
             context = rag_ctx
             if live_ctx:
                 context = f"{context}\n\n--- Live Mandi Data ---\n{live_ctx}"
@@ -2288,156 +2411,249 @@ def handle_gather(params):
                 phase2 += ("\n\nNOTE: No specific data found in our database. "
                            "Answer from your general training knowledge. Be helpful and specific. "
                            "Do not say 'I don't have data' — just answer what you know.")
-            data_answer = ask_llm(speech_text, context, language, history, system_prompt=phase2)
+            data_answer = ask_llm(speech_text, context, language, history, system_prompt=phase2, memory=memory)
             # Strip any tags the LLM may still have emitted
             import re as _re2
             data_answer = _re2.sub(r'\[FETCH_DATA\]|\[WEB_SEARCH\]|\[SWITCH:\w+\]', '', data_answer).strip()
             # Safety: if LLM returned empty, give a graceful fallback
             if not data_answer:
-                _fb = {"hi": "माफ करें, अभी जानकारी नहीं मिली। कृपया फिर से पूछें।",
-                       "mr": "क्षमस्व, माहिती मिळाली नाही. पुन्हा विचारा.",
-                       "ta": "மன்னிக்கவும், தகவல் கிடைக்கவில்லை. மீண்டும் கேளுங்கள்.",
-                       "en": "Sorry, I couldn't find that information. Please ask again."}
+                _fb = static_prompts.NO_DATA_MSGS
                 data_answer = _fb.get(language, _fb["en"])
+            # Runs after the gather request has returned — write the turn while the
+            # poll request (blocked on this job) keeps the container running
+            log_query(session, speech_text, data_answer, language)
+            _flush_session(session)
             # Save TEXT only — TTS is generated synchronously in the poll handler (more reliable in Lambda)
-            calls_table.put_item(Item={
-                "call_id": job_key, "timestamp": 0, "status": "done",
+            _publish_job({
+                "call_id": job_key, "timestamp": 0, "job_id": job_id, "status": "done",
                 "answer": data_answer,
                 "audio_urls": [],
                 "audio_url": "",
                 "lang": language,
                 "voice": voice,
+                "timings": timings,
                 "ttl": int(time.time()) + 300,
             })
-            log_query(call_sid, speech_text, data_answer, language)
         except Exception as e:
             logger.error(f"Data fetch failed call={call_sid}: {e}")
             try:
-                calls_table.put_item(Item={"call_id": job_key, "timestamp": 0,
-                                          "status": "error", "ttl": int(time.time()) + 300})
+                _publish_job({"call_id": job_key, "timestamp": 0, "job_id": job_id,
+                              "status": "error", "ttl": int(time.time()) + 300})
             except Exception:
                 pass
 
     threading.Thread(target=_fetch_data_async, daemon=True).start()
-    poll_url = (f"{BASE_URL}/voice/poll?lang={language}&voice={voice}&agent={current_agent}"
-                if BASE_URL else f"/voice/poll?lang={language}&voice={voice}&agent={current_agent}")
+    poll_url = (f"{BASE_URL}/voice/poll?lang={language}&voice={voice}&agent={current_agent}&job={job_id}{_ts_qs(session)}"
+                if BASE_URL else f"/voice/poll?lang={language}&voice={voice}&agent={current_agent}&job={job_id}{_ts_qs(session)}")
     response = VoiceResponse()
     response.redirect(poll_url, method="POST")
     return twiml_response(response)
 
 
+def _answer_cacheable(speech_text: str, memory: str, history: list) -> bool:
+    """Only a caller's first question, with no earlier turns or memory in the prompt, uses the answer
+    cache — a follow-up ("iske liye form kahan milega") depends on context a stored answer lacks.
+    should_use_rag() also rules out live data (mandi prices, weather), which must not be replayed."""
+    return answer_cache is not None and not memory and not history and should_use_rag(speech_text)
+
+
+# Embedding + lookup run here while the LLM stream starts (one per in-flight turn)
+_ANSWER_CACHE_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+
+def _lookup_cached_answer(speech_text: str, language: str, agent: str) -> tuple:
+    """(query embedding or None, cached entry or None) — runs alongside the LLM stream."""
+    started = time.time()
+    embedding, cached = None, None
+    try:
+        embedding = get_embedding(_answer_cache_mod.normalise_query(speech_text))
+        cached = answer_cache.lookup(language, agent, embedding)
+    except Exception as e:
+        logger.warning(f"Answer cache lookup failed: {e}")
+    metrics.emit({"AnswerCacheHit": 1 if cached else 0,
+                  "AnswerCacheLookupMs": int((time.time() - started) * 1000)},
+                 {"Language": language})
+    return embedding, cached
+
+
+def _serve_cached_answer(cached: dict, call_sid: str, speech_text: str, language: str, voice: str,
+                         agent: str, session, started: float):
+    """TwiML for a semantic-cache hit: the stored answer audio, then listen again."""
+    answer = cached["answer"]
+    logger.info(f"Answer cache HIT call={call_sid} score={cached['score']:.3f} query='{cached.get('query', '')[:60]}'")
+    log_query(session, speech_text, answer, language)
+
+    goodbyes  = static_prompts.GOODBYES_SHORT
+    bye_clips = [(goodbyes.get(language, goodbyes["en"]), language, voice)]
+    bye_futures = _tts_submit(bye_clips)
+    response = VoiceResponse()
+    urls = []
+    for key in cached.get("audio_keys", []):
+        url = _tts_cached_url(key)
+        if not url:
+            urls = []
+            break
+        urls.append(url)
+    if urls:
+        for url in urls:
+            response.play(url)
+    else:
+        # Audio object gone (expired/pruned) — re-synthesise; the TTS cache still dedupes
+        answer_clips = [(c, language, voice) for c in _split_for_tts(answer)]
+        _play_clips(response, answer_clips, _tts_submit(answer_clips))
+    _append_listen_gather(response, language, voice, agent, session=session)
+    _play_clips(response, bye_clips, bye_futures)
+
+    serve_ms = int((time.time() - started) * 1000)
+    metrics.emit({"AnswerCacheSavedMs": max(int(cached.get("gen_ms", 0)) - serve_ms, 0),
+                  "AnswerCacheServeMs": serve_ms},
+                 {"Language": language})
+    return twiml_response(response)
+
+
 # ── Step 3b: Poll for async result ──────────────────────────
-def handle_poll(params):
+# The data worker publishes every job state to an in-container board as well as
+# DynamoDB. A poll that lands on the same warm container blocks on the board and
+# wakes as soon as the state changes; one that lands elsewhere falls back to
+# strongly-consistent reads of the job record with exponential backoff.
+_job_board = job_board.JobBoard()
+
+POLL_WAIT_SECONDS    = float(os.environ.get("POLL_WAIT_SECONDS", "10"))
+POLL_BACKOFF_INITIAL = 0.1
+POLL_BACKOFF_MAX     = 1.0
+
+
+def _board_key(job_key: str, job_id: str) -> str:
+    return f"{job_key}:{job_id}"
+
+
+def _publish_job(item: dict):
+    """Persist a job state, then signal any poll waiting in this container."""
+    try:
+        calls_table.put_item(Item=item)
+    finally:
+        _job_board.publish(_board_key(item["call_id"], item.get("job_id", "")), item)
+
+
+def _clear_job(job_key: str, job_id: str):
+    _job_board.discard(_board_key(job_key, job_id))
+    threading.Thread(
+        target=lambda: calls_table.delete_item(Key={"call_id": job_key, "timestamp": 0}),
+        daemon=True,
+    ).start()
+
+
+def _poll_job_record(job_key: str, job_id: str, acceptable: tuple, deadline: float):
+    """Cross-container fallback: ConsistentRead the job record with exponential backoff."""
+    delay, reads = POLL_BACKOFF_INITIAL, 0
+    while True:
+        try:
+            reads += 1
+            item = calls_table.get_item(Key={"call_id": job_key, "timestamp": 0},
+                                        ConsistentRead=True).get("Item")
+            if (item and item.get("status") in acceptable
+                    and (not job_id or item.get("job_id", job_id) == job_id)):
+                return item, reads
+        except Exception as e:
+            logger.warning(f"Poll DynamoDB error: {e}")
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return None, reads
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, POLL_BACKOFF_MAX)
+
+
+def _wait_for_job(job_key: str, job_id: str, acceptable: tuple, timeout: float):
+    """Block until the job reaches an acceptable status, or return None at timeout."""
+    started   = time.time()
+    board_key = _board_key(job_key, job_id)
+    if job_id and _job_board.knows(board_key):
+        result, mode, reads = _job_board.wait_for(board_key, acceptable, timeout), "local", 0
+    else:
+        result, reads = _poll_job_record(job_key, job_id, acceptable, started + timeout)
+        mode = "dynamodb"
+    status = result.get("status") if result else "timeout"
+    logger.info(f"Poll {job_key} mode={mode} status={status} reads={reads} "
+                f"waited_ms={int((time.time() - started) * 1000)}")
+    return result
+
+
+def handle_poll(params, session):
     """
     Called by Twilio after the "thinking" message plays.
-    Polls DynamoDB until the background RAG job completes, then returns
-    the TTS audio.  Allows up to two poll hops (~20 s total) before
+    Waits for the background RAG job to complete (see _wait_for_job), then
+    returns the TTS audio.  Allows up to two poll hops (~20 s total) before
     giving up gracefully.
     """
     call_sid = params.get("CallSid", "")
     language = params.get("lang", "hi")
     attempt  = int(params.get("attempt", "0"))
-    voice    = params.get("voice", "") or _get_call_voice(call_sid)
+    voice    = params.get("voice", "") or session.voice or "arya"
     current_agent = params.get("agent", DEFAULT_AGENT)
     partial_played = params.get("pp", "0") == "1"  # was partial ack already played?
+    job_id         = params.get("job", "")
 
     job_key = f"job#{call_sid}"
     cfg     = LANG_CONFIG.get(language, LANG_CONFIG["en"])
 
-    follow_ups = {
-        "hi": "और बताइए, कुछ और जानना है?",
-        "mr": "आणखी काही विचारायचं आहे का?",
-        "ta": "வேறு ஏதாவது கேட்க வேண்டுமா?",
-        "en": "Anything else you'd like to know?",
-    }
-    goodbyes = {
-        "hi": "अच्छा चलिए, ख्याल रखिए! वाणीसेवा को कॉल करने के लिए शुक्रिया।",
-        "mr": "बरं चला, काळजी घ्या! वाणीसेवाला कॉल केल्याबद्दल धन्यवाद.",
-        "ta": "சரி, கவனமா இருங்க! வாணீசேவாவை அழைத்ததற்கு நன்றி.",
-        "en": "Alright, take care! Thanks for calling VaaniSeva.",
-    }
-    error_msgs = {
-        "hi": "माफ करें, अभी कुछ समस्या आ रही है। कृपया फिर से बोलें।",
-        "mr": "क्षमस्व, आत्ता काही अडचण आहे. कृपया पुन्हा सांगा.",
-        "ta": "மன்னிக்கவும், சிக்கல் ஏற்பட்டது. மீண்டும் பேசுங்கள்.",
-        "en": "I'm sorry, I had trouble with that. Please ask your question again.",
-    }
+    follow_ups = static_prompts.FOLLOW_UPS
+    goodbyes   = static_prompts.GOODBYES_POLL
+    error_msgs = static_prompts.POLL_ERROR_MSGS
 
     gather_url = f"{BASE_URL}/voice/gather?lang={language}&voice={voice}&agent={current_agent}" if BASE_URL else f"/voice/gather?lang={language}&voice={voice}&agent={current_agent}"
     response   = VoiceResponse()
 
-    # Poll DynamoDB every ~0.4s for up to 10s (fast polling = lower latency)
     # If partial was already played, only wait for done/error
     acceptable = ("done", "error") if partial_played else ("done", "error", "partial")
-    result   = None
-    deadline = time.time() + 10.0
-    while time.time() < deadline:
-        try:
-            item = calls_table.get_item(Key={"call_id": job_key, "timestamp": 0}).get("Item")
-            if item and item.get("status") in acceptable:
-                result = item
-                break
-        except Exception as e:
-            logger.warning(f"Poll DynamoDB error: {e}")
-        time.sleep(0.4)
+    result = _wait_for_job(job_key, job_id, acceptable, POLL_WAIT_SECONDS)
 
     # ── Still processing after 10 s? ───────────────────────────────
     if result is None:
         if attempt < 1:
             # One more hop — play brief hold message, try again
-            still_msgs = {
-                "hi": "बस थोड़ी देर और, लगभग हो गया।",
-                "mr": "आणखी थोडा वेळ, जवळजवळ झाले.",
-                "ta": "இன்னும் கொஞ்சம் நேரம், கிட்டத்தட்ட முடிந்தது.",
-                "en": "Almost there, just a few more seconds.",
-            }
+            still_msgs = static_prompts.STILL_PROCESSING_MSGS
             pp_flag = "1" if partial_played else "0"
             response.pause(length=1)
             next_poll = (
-                f"{BASE_URL}/voice/poll?lang={language}&attempt=1&voice={voice}&agent={current_agent}&pp={pp_flag}"
-                if BASE_URL else f"/voice/poll?lang={language}&attempt=1&voice={voice}&agent={current_agent}&pp={pp_flag}"
+                f"{BASE_URL}/voice/poll?lang={language}&attempt=1&voice={voice}&agent={current_agent}&pp={pp_flag}&job={job_id}{_ts_qs(session)}"
+                if BASE_URL else f"/voice/poll?lang={language}&attempt=1&voice={voice}&agent={current_agent}&pp={pp_flag}&job={job_id}{_ts_qs(session)}"
             )
             response.redirect(next_poll, method="POST")
         else:
             # Give up after ~20 s total — let user ask again
             tts_say(response, error_msgs.get(language, error_msgs["en"]), language, speaker=voice)
-            _append_listen_gather(response, language, voice, current_agent)
+            _append_listen_gather(response, language, voice, current_agent, session=session)
         return twiml_response(response)
 
     # ── Error result ────────────────────────────────────────────────
     if result.get("status") == "error":
         # Clean up job record
-        threading.Thread(
-            target=lambda: calls_table.delete_item(Key={"call_id": job_key, "timestamp": 0}),
-            daemon=True,
-        ).start()
+        _clear_job(job_key, job_id)
         tts_say(response, error_msgs.get(language, error_msgs["en"]), language, speaker=voice)
-        _append_listen_gather(response, language, voice, current_agent)
+        _append_listen_gather(response, language, voice, current_agent, session=session)
         return twiml_response(response)
 
     # ── Partial result (Phase 1 ack — play ONCE, then poll for done) ──
     if result.get("status") == "partial":
-        ack_audio = result.get("audio_url", "")
-        if ack_audio:
-            response.play(ack_audio)
+        ack_urls = [u for u in (result.get("audio_urls") or [result.get("audio_url", "")]) if u]
+        if ack_urls:
+            for url in ack_urls:
+                response.play(url)
         else:
             ack_text = result.get("answer", "")
             if ack_text:
                 tts_say(response, ack_text, language, speaker=voice)
         # Redirect to poll again but with pp=1 so we only wait for done/error
         next_poll = (
-            f"{BASE_URL}/voice/poll?lang={language}&attempt=0&voice={voice}&agent={current_agent}&pp=1"
-            if BASE_URL else f"/voice/poll?lang={language}&attempt=0&voice={voice}&agent={current_agent}&pp=1"
+            f"{BASE_URL}/voice/poll?lang={language}&attempt=0&voice={voice}&agent={current_agent}&pp=1&job={job_id}{_ts_qs(session)}"
+            if BASE_URL else f"/voice/poll?lang={language}&attempt=0&voice={voice}&agent={current_agent}&pp=1&job={job_id}{_ts_qs(session)}"
         )
         response.redirect(next_poll, method="POST")
         return twiml_response(response)
 
     # ── Success — play answer + prompt for next question ───────────
     # Clean up job record (fire-and-forget)
-    threading.Thread(
-        target=lambda: calls_table.delete_item(Key={"call_id": job_key, "timestamp": 0}),
-        daemon=True,
-    ).start()
+    _clear_job(job_key, job_id)
 
     answer    = result.get("answer", "")
     # Truncate long responses — phone calls need brevity
@@ -2448,16 +2664,16 @@ def handle_poll(params):
     follow_up = follow_ups.get(language, follow_ups["en"])
     goodbye   = goodbyes.get(language, goodbyes["en"])
 
-    # Always generate TTS synchronously here — more reliable than relying on background-thread URLs
+    # Always generate TTS synchronously here — more reliable than relying on background-thread URLs.
+    # Answer chunks and the goodbye are synthesised concurrently.
+    bye_clips   = [(goodbye, language, stored_voice)]
+    bye_futures = _tts_submit(bye_clips)
     if answer:
-        audio_urls = _tts_chunks_parallel(answer, language, stored_voice)
-        for url in audio_urls:
-            response.play(url)
-        if not audio_urls:
-            tts_say(response, answer, language, speaker=stored_voice)
-    _append_listen_gather(response, language, stored_voice, current_agent)
+        answer_clips = [(c, language, stored_voice) for c in _split_for_tts(answer)]
+        _play_clips(response, answer_clips, _tts_submit(answer_clips, cache_lookup=False))
+    _append_listen_gather(response, language, stored_voice, current_agent, session=session)
     # Goodbye: also use TTS for naturalness
-    tts_say(response, goodbye, language, speaker=stored_voice)
+    _play_clips(response, bye_clips, bye_futures)
     return twiml_response(response)
 
 
@@ -2485,17 +2701,11 @@ def _build_profile_context(user: dict) -> str:
 
 
 def _lookup_user_by_phone(phone: str) -> dict | None:
-    """Look up a user by phone number."""
+    """Look up a user by phone number (phone-index query, cached per container)."""
     if not phone:
         return None
     try:
-        result = users_table.scan(
-            FilterExpression="phone = :ph",
-            ExpressionAttributeValues={":ph": phone},
-            Limit=1,
-        )
-        items = result.get("Items", [])
-        return items[0] if items else None
+        return users.by_phone(phone)
     except Exception as e:
         logger.warning(f"Phone lookup failed: {e}")
         return None
@@ -2503,82 +2713,85 @@ def _lookup_user_by_phone(phone: str) -> dict | None:
 
 SERPER_API_KEY = os.environ.get("SERPER_API_KEY", "")
 TAVILY_API_KEY = os.environ.get("TAVILY_API_KEY", "")
+# Total budget for the [FETCH_DATA] context fan-out — keeps poll well inside its 20 s give-up
+FETCH_DATA_BUDGET_SECONDS = float(os.environ.get("FETCH_DATA_BUDGET_SECONDS", "6"))
 
 
-def _fetch_web_search(query: str) -> str:
-    """Search the internet. Tries Tavily → Serper → DuckDuckGo HTML → DDG Instant API."""
-    import requests as _req
+WEB_SEARCH_BUDGET_SECONDS = float(os.environ.get("WEB_SEARCH_BUDGET_SECONDS", "5"))
+# Start the next search provider after this long without a result (or at once on failure)
+WEB_SEARCH_HEDGE_SECONDS  = float(os.environ.get("WEB_SEARCH_HEDGE_SECONDS", "1.2"))
 
-    # 1. Tavily (best — sign up free at tavily.com, set TAVILY_API_KEY env var)
-    if TAVILY_API_KEY:
-        try:
-            r = _req.post(
-                "https://api.tavily.com/search",
-                json={"api_key": TAVILY_API_KEY, "query": query, "max_results": 3, "search_depth": "basic"},
-                timeout=5,
-            )
-            results = r.json().get("results", [])
-            if results:
-                return "\n".join(f"{x['title']}: {x.get('content','')[:300]}" for x in results[:3])
-        except Exception as e:
-            logger.warning(f"Tavily search failed: {e}")
 
-    # 2. Serper (Google Search — sign up free at serper.dev, 2500 req/month, set SERPER_API_KEY)
-    if SERPER_API_KEY:
-        try:
-            r = _req.post(
-                "https://google.serper.dev/search",
-                headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
-                json={"q": query, "num": 4, "gl": "in", "hl": "en"},
-                timeout=5,
-            )
-            data = r.json()
-            parts = []
-            if data.get("answerBox", {}).get("answer"):
-                parts.append(data["answerBox"]["answer"])
-            for x in data.get("organic", [])[:3]:
-                parts.append(f"{x['title']}: {x.get('snippet','')}")
-            if parts:
-                return "\n".join(parts)
-        except Exception as e:
-            logger.warning(f"Serper search failed: {e}")
+def _search_tavily(query: str) -> str:
+    """Tavily (best — sign up free at tavily.com, set TAVILY_API_KEY env var)."""
+    r = http_client.post(
+        "tavily", "https://api.tavily.com/search",
+        json={"api_key": TAVILY_API_KEY, "query": query, "max_results": 3, "search_depth": "basic"},
+    )
+    results = r.json().get("results", [])
+    return "\n".join(f"{x['title']}: {x.get('content','')[:300]}" for x in results[:3])
 
-    # 3. DuckDuckGo HTML scraper (no key needed — uses stdlib html.parser)
-    try:
-        result = _ddg_html_search(query)
-        if result:
-            return result
-    except Exception as e:
-        logger.warning(f"DDG HTML search failed: {e}")
 
-    # 4. DuckDuckGo Instant Answer + RelatedTopics (factual fallback)
-    try:
-        r = _req.get(
-            "https://api.duckduckgo.com/",
-            params={"q": query, "format": "json", "no_html": 1, "skip_disambig": 1},
-            timeout=3,
-        )
-        data = r.json()
-        parts = []
-        if data.get("Answer"):
-            parts.append(data["Answer"])
-        if data.get("AbstractText"):
-            parts.append(data["AbstractText"])
-        for t in (data.get("RelatedTopics") or [])[:3]:
-            if isinstance(t, dict) and t.get("Text"):
-                parts.append(t["Text"])
-        result = "\n".join(parts).strip()
-        return result[:600] if result else ""
-    except Exception as e:
-        logger.warning(f"DDG API search failed: {e}")
+def _search_serper(query: str) -> str:
+    """Serper (Google Search — sign up free at serper.dev, 2500 req/month, set SERPER_API_KEY)."""
+    r = http_client.post(
+        "serper", "https://google.serper.dev/search",
+        headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
+        json={"q": query, "num": 4, "gl": "in", "hl": "en"},
+    )
+    data = r.json()
+    parts = []
+    if data.get("answerBox", {}).get("answer"):
+        parts.append(data["answerBox"]["answer"])
+    for x in data.get("organic", [])[:3]:
+        parts.append(f"{x['title']}: {x.get('snippet','')}")
+    return "\n".join(parts)
+
+
+def _search_ddg_instant(query: str) -> str:
+    """DuckDuckGo Instant Answer + RelatedTopics (factual fallback, no key)."""
+    r = http_client.get(
+        "ddg_api", "https://api.duckduckgo.com/",
+        params={"q": query, "format": "json", "no_html": 1, "skip_disambig": 1},
+    )
+    data = r.json()
+    parts = []
+    if data.get("Answer"):
+        parts.append(data["Answer"])
+    if data.get("AbstractText"):
+        parts.append(data["AbstractText"])
+    for t in (data.get("RelatedTopics") or [])[:3]:
+        if isinstance(t, dict) and t.get("Text"):
+            parts.append(t["Text"])
+    result = "\n".join(parts).strip()
+    return result[:600] if result else ""
+
+
+def _fetch_web_search(query: str, budget: float = None, timings: dict = None) -> str:
+    """Search the internet. Hedges Tavily → Serper → DuckDuckGo HTML → DDG Instant:
+    each provider starts only if the ones before it failed or are still running
+    after WEB_SEARCH_HEDGE_SECONDS; the first non-empty result wins.
+    timings (optional dict) receives per-provider {"ms", "status"} entries.
+    """
+    providers = []
+    if TAVILY_API_KEY:
+        providers.append(("tavily", lambda: _search_tavily(query)))
+    if SERPER_API_KEY:
+        providers.append(("serper", lambda: _search_serper(query)))
+    providers.append(("ddg_html", lambda: _ddg_html_search(query)))
+    providers.append(("ddg_instant", lambda: _search_ddg_instant(query)))
 
-    return ""
+    winner, result, hedge_timings = fanout.hedge(providers, budget or WEB_SEARCH_BUDGET_SECONDS,
+                                                WEB_SEARCH_HEDGE_SECONDS)
+    if timings is not None:
+        timings.update({f"web_{k}": v for k, v in hedge_timings.items()})
+    logger.info(f"Web search winner={winner} timings={hedge_timings}")
+    return result or ""
 
 
 def _ddg_html_search(query: str, max_results: int = 4) -> str:
     """Scrape DuckDuckGo HTML results using Python stdlib — no API key needed."""
     from html.parser import HTMLParser
-    import requests as _req
 
     class _P(HTMLParser):
         def __init__(self):
@@ -2610,11 +2823,10 @@ def _ddg_html_search(query: str, max_results: int = 4) -> str:
         "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36",
         "Accept-Language": "en-US,en;q=0.9",
     }
-    r = _req.get(
-        "https://html.duckduckgo.com/html/",
+    r = http_client.get(
+        "ddg", "https://html.duckduckgo.com/html/",
         params={"q": f"{query} India", "kl": "in-en"},
         headers=hdrs,
-        timeout=5,
     )
     p = _P()
     p.feed(r.text)
@@ -2630,76 +2842,31 @@ def _fetch_data_gov(query: str) -> str:
     results = []
 
     # ── 1. Mandi / market price queries → Agmarknet daily prices API ──
-    mandi_keywords = ["mandi", "मंडी", "bhav", "भाव", "price", "rate", "daam", "दाम",
-                      "sabzi", "सब्जी", "vegetable", "tomato", "tamatar", "टमाटर",
-                      "onion", "pyaaz", "प्याज", "potato", "aloo", "aalo", "alu", "आलू", "आलु", "wheat",
-                      "gehu", "गेहूं", "rice", "chawal", "चावल", "market"]
-    query_lower = query.lower()
-    if any(kw in query_lower for kw in mandi_keywords):
+    hits = intent_phrases.match(query)
+    if "mandi" in hits:
         try:
             mandi_params = {
                 "api-key": DATA_GOV_API_KEY,
                 "format": "json",
                 "limit": 5,
             }
-            # Extract commodity from query
-            commodity_map = {
-                "tomato": "Tomato", "tamatar": "Tomato", "टमाटर": "Tomato",
-                "onion": "Onion", "pyaaz": "Onion", "प्याज": "Onion",
-                "potato": "Potato", "aloo": "Potato", "aalo": "Potato", "alu": "Potato", "आलू": "Potato", "आलु": "Potato",
-                "wheat": "Wheat", "gehu": "Wheat", "गेहूं": "Wheat",
-                "rice": "Rice", "chawal": "Rice", "चावल": "Rice",
-                "apple": "Apple", "seb": "Apple", "सेब": "Apple",
-                "banana": "Banana", "kela": "Banana", "केला": "Banana",
-                "dal": "Masur Dal", "दाल": "Masur Dal",
-                "sugar": "Sugar", "cheeni": "Sugar", "चीनी": "Sugar",
-                "soyabean": "Soyabean", "soybean": "Soyabean", "सोयाबीन": "Soyabean",
-            }
-            for keyword, commodity in commodity_map.items():
-                if keyword in query_lower:
-                    mandi_params["filters[commodity]"] = commodity
-                    break
-
-            # Extract state from query
-            state_map = {
-                "madhyapradesh": "Madhya Pradesh", "mp": "Madhya Pradesh", "madhya pradesh": "Madhya Pradesh", "मध्य प्रदेश": "Madhya Pradesh",
-                "uttarpradesh": "Uttar Pradesh", "up": "Uttar Pradesh", "uttar pradesh": "Uttar Pradesh", "उत्तर प्रदेश": "Uttar Pradesh",
-                "rajasthan": "Rajasthan", "राजस्थान": "Rajasthan",
-                "bihar": "Bihar", "बिहार": "Bihar",
-                "maharashtra": "Maharashtra", "महाराष्ट्र": "Maharashtra",
-                "punjab": "Punjab", "पंजाब": "Punjab",
-                "haryana": "Haryana", "हरियाणा": "Haryana",
-                "gujarat": "Gujarat", "गुजरात": "Gujarat",
-                "karnataka": "Karnataka", "कर्नाटक": "Karnataka",
-                "tamil nadu": "Tamil Nadu", "तमिलनाडु": "Tamil Nadu",
-                "andhra pradesh": "Andhra Pradesh", "आंध्र प्रदेश": "Andhra Pradesh",
-                "telangana": "Telangana", "तेलंगाना": "Telangana",
-                "west bengal": "West Bengal", "पश्चिम बंगाल": "West Bengal",
-                "odisha": "Odisha", "ओडिशा": "Odisha",
-                "chhattisgarh": "Chhattisgarh", "छत्तीसगढ़": "Chhattisgarh",
-                "jharkhand": "Jharkhand", "झारखंड": "Jharkhand",
-                "assam": "Assam", "असम": "Assam",
-                "kerala": "Kerala", "केरल": "Kerala",
-                "goa": "Goa", "गोवा": "Goa",
-            }
-            for keyword, state_name in state_map.items():
-                if keyword in query_lower:
-                    mandi_params["filters[state]"] = state_name
-                    break
-
-            resp = None
-            for _attempt in range(2):
-                try:
-                    resp = requests.get(
-                        "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070",
-                        params=mandi_params,
-                        timeout=5,
-                    )
-                    if resp.status_code == 200:
-                        break
-                except requests.exceptions.Timeout:
-                    logger.warning(f"Mandi API timeout (attempt {_attempt + 1}/2)")
-                    resp = None
+            # Commodity and state named in the query (first mentioned wins)
+            commodity = hits.first("commodity")
+            if commodity:
+                mandi_params["filters[commodity]"] = commodity
+            state = hits.first("state")
+            if state:
+                mandi_params["filters[state]"] = state
+
+            # Connection errors and 429/5xx are retried by the pooled session (http_client)
+            try:
+                resp = http_client.get(
+                    "data_gov", "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070",
+                    params=mandi_params,
+                )
+            except requests.exceptions.Timeout:
+                logger.warning("Mandi API timeout")
+                resp = None
             if resp and resp.status_code == 200:
                 data = resp.json()
                 records = data.get("records", [])
@@ -2722,7 +2889,7 @@ def _fetch_data_gov(query: str) -> str:
             elif resp:
                 logger.warning(f"Mandi API returned status {resp.status_code}")
             else:
-                logger.warning("Mandi API: all attempts failed")
+                logger.warning("Mandi API: request failed")
         except Exception as e:
             logger.warning(f"Mandi price fetch failed: {e}")
 
@@ -2731,23 +2898,14 @@ def _fetch_data_gov(query: str) -> str:
 
 def should_use_rag(speech_text: str) -> bool:
     """Decide whether RAG retrieval is needed for this utterance."""
-    text_lower = speech_text.lower().strip()
+    hits = intent_phrases.match(speech_text)
 
     # Skip RAG: conversational/follow-up utterances
-    skip_keywords = [
-        "theek", "ठीक", "samajh", "समझ", "aur batao", "और बताओ",
-        "haan", "हाँ", "ok", "accha", "अच्छा", "shukriya", "शुक्रिया",
-        "bye", "band karo", "thanks", "nahi", "नहीं"
-    ]
-    if any(kw in text_lower for kw in skip_keywords):
+    if "rag_skip" in hits:
         return False
 
     # Skip RAG: live data queries (handled by API tools)
-    live_keywords = [
-        "mandi", "मंडी", "bhav", "भाव", "price", "rate", "bhaav",
-        "mausam", "मौसम", "barish", "बारिश", "weather", "temperature"
-    ]
-    if any(kw in text_lower for kw in live_keywords):
+    if "live_data" in hits:
         return False
 
     # Skip RAG: very short utterances (under 4 words = conversational)
@@ -2757,7 +2915,8 @@ def should_use_rag(speech_text: str) -> bool:
     return True  # default: use RAG
 
 
-def rag_pipeline(query: str, language: str, call_sid: str = "", profile_context: str = "", system_prompt: str = "") -> str:
+def rag_pipeline(query: str, language: str, call_sid: str = "", profile_context: str = "", system_prompt: str = "",
+                 session=None) -> str:
     use_rag = should_use_rag(query)
     context = ""
     if use_rag:
@@ -2769,25 +2928,19 @@ def rag_pipeline(query: str, language: str, call_sid: str = "", profile_context:
     if live_data:
         context = f"{context}\n\n--- Live Government Data (data.gov.in) ---\n{live_data}"
 
-    history   = get_conversation_history(call_sid) if call_sid else []
-    return ask_llm(query, context, language, history, profile_context=profile_context, system_prompt=system_prompt)
+    if session is None and call_sid:
+        session = call_session.load(calls_table, call_sid, turns=call_turns)
+    history   = call_memory.prompt_turns(session.history, session.summary_upto) if session else []
+    memory    = session.summary if session else ""
+    return ask_llm(query, context, language, history, profile_context=profile_context,
+                   system_prompt=system_prompt, memory=memory)
 
 
-def get_conversation_history(call_sid: str) -> list:
-    """Fetch conversation history from DynamoDB for this call."""
-    if not call_sid:
-        return []
-    try:
-        ts = get_call_timestamp(call_sid)
-        result = calls_table.get_item(Key={"call_id": call_sid, "timestamp": ts})
-        item = result.get("Item", {})
-        return item.get("conversation_history", [])
-    except Exception as e:
-        logger.warning(f"Failed to fetch conversation history: {e}")
-        return []
-
-
-def get_embedding(text: str) -> list:
+def get_embedding(text: str):
+    """Titan embedding for text — float32 via the cached embedding service when available."""
+    if embedding_service is not None:
+        # In-process LRU only — the S3 embedding cache is for bulk and seed jobs
+        return embedding_service.embed(text, use_store=False)
     response = bedrock.invoke_model(
         modelId=os.environ["BEDROCK_EMBEDDING_MODEL_ID"],
         body=json.dumps({"inputText": text}),
@@ -2798,50 +2951,67 @@ def get_embedding(text: str) -> list:
     return result["embedding"]
 
 
+def _embedding_floats(value) -> list:
+    """Stored embedding as floats: float32 Binary (current rows) or a list of Decimals (older rows)."""
+    raw = getattr(value, "value", value)
+    if isinstance(raw, (bytes, bytearray)):
+        return array.array("f", raw).tolist()
+    return [float(x) for x in value]
+
+
 def cosine_similarity(a: list, b: list) -> float:
-    # Convert Decimal to float (DynamoDB stores as Decimal)
-    a = [float(x) for x in a]
-    b = [float(x) for x in b]
+    a = _embedding_floats(a)
+    b = _embedding_floats(b)
     dot   = sum(x * y for x, y in zip(a, b))
     mag_a = math.sqrt(sum(x * x for x in a))
     mag_b = math.sqrt(sum(x * x for x in b))
     return dot / (mag_a * mag_b + 1e-9)
 
 
-def retrieve_context(query_embedding: list, language: str) -> str:
+RAG_MAX_PASSAGES = int(os.environ.get("RAG_MAX_PASSAGES", "6"))
+
+
+def retrieve_context(query_embedding: list, language: str, k: int = RAG_MAX_PASSAGES) -> str:
     """Cosine similarity search against vaaniseva-vectors table.
+    Takes up to k distinct entries / FAQ passages — the language copies of one
+    scheme_id#section_id count once, scored by their best copy — and packs them,
+    best first, into the language's token budget (passages.build_context).
+    Uses the warm-container NumPy index when available, otherwise scans the table.
     Uses language-aware field priority so Marathi / Tamil users get native text.
     """
-    items = vectors_table.scan().get("Items", [])
-    if not items:
-        return "No scheme information loaded yet."
-
-    scored = [
-        (cosine_similarity(query_embedding, item.get("embedding", [])), item)
-        for item in items if item.get("embedding")
-    ]
-    top = sorted(scored, key=lambda x: x[0], reverse=True)[:3]
-
-    # Field priority: native language first, then Hindi fallback, then English
-    field_priority = {
-        "hi": ["text_hi", "text_en", "text"],
-        "mr": ["text_mr", "text_hi", "text_en", "text"],
-        "ta": ["text_ta", "text_hi", "text_en", "text"],
-        "en": ["text_en", "text_hi", "text"],
-    }
-    fields = field_priority.get(language, ["text_en", "text"])
+    if vector_index is not None:
+        top = vector_index.search_grouped(query_embedding, k=k, language=language)
+        if not top:
+            return "No scheme information loaded yet."
+    else:
+        items = vectors_table.scan().get("Items", [])
+        if not items:
+            return "No scheme information loaded yet."
 
-    def best_text(item):
-        for f in fields:
-            val = item.get(f, "")
-            if val:
-                return val
-        return ""
+        scored = sorted(
+            ((cosine_similarity(query_embedding, item.get("embedding", [])), item)
+             for item in items if item.get("embedding")),
+            key=lambda x: x[0], reverse=True,
+        )
+        # One entry per scheme/section (per passage for chunked FAQs), with the
+        # text fields of all its language copies
+        entries = {}
+        for score, item in scored:
+            if item.get("scheme_id") and not item.get("chunk_count"):
+                key = (item["scheme_id"], item.get("section_id"))
+            else:
+                key = item.get("embedding_id")
+            entry = entries.setdefault(key, (score, {}))[1]
+            for f, val in item.items():
+                if f.startswith("text") and val and not entry.get(f):
+                    entry[f] = val
+        top = list(entries.values())[:k]
 
-    return "\n\n".join(best_text(item) for _, item in top)
+    return passages.build_context(top, language)
 
 
-def ask_llm(query: str, context: str, language: str, history: list = None, profile_context: str = "", system_prompt: str = "") -> str:
+def ask_llm(query: str, context: str, language: str, history: list = None, profile_context: str = "",
+            system_prompt: str = "", memory: str = "") -> str:
     lang_instructions = {
         "hi": "LANGUAGE: Hindi ONLY. हिंदी देवनागरी लिपि में जवाब दो। कोई अंग्रेजी/रोमन अक्षर नहीं। सिर्फ proper nouns (PM-Kisan, Ayushman Bharat) अंग्रेजी में रख सकती हो।",
         "mr": "LANGUAGE: Marathi ONLY. उत्तर फक्त मराठी लिपीत द्या. हिंदी मिसळू नका. फक्त proper nouns (PM-Kisan, Ayushman Bharat) इंग्रजीत ठेवा.",
@@ -2862,16 +3032,18 @@ Relevant context from our knowledge base (use if helpful, ignore if not relevant
 
     # Resolve system prompt — fall back to default agent if not provided
     resolved_prompt = system_prompt or build_system_prompt(DEFAULT_AGENT, language)
+    # Rolling summary of earlier turns goes after the static prompt (and its cache point)
+    memory_suffix = call_memory.system_suffix(memory)
 
     # Try OpenAI first if configured
     if LLM_PROVIDER == "openai" and openai_client:
         try:
-            return _ask_openai(user_msg, history or [], system_prompt=resolved_prompt)
+            return _ask_openai(user_msg, history or [], system_prompt=resolved_prompt + memory_suffix)
         except Exception as e:
             logger.warning(f"OpenAI failed, falling back to Bedrock: {e}")
 
     # Bedrock (primary)
-    return _ask_bedrock(user_msg, history or [], system_prompt=resolved_prompt)
+    return _ask_bedrock(user_msg, history or [], system_prompt=resolved_prompt, system_suffix=memory_suffix)
 
 
 def _ask_openai(user_msg: str, history: list, system_prompt: str = "") -> str:
@@ -2897,8 +3069,10 @@ def _ask_openai(user_msg: str, history: list, system_prompt: str = "") -> str:
     return response.choices[0].message.content.strip()
 
 
-def _ask_bedrock(user_msg: str, history: list = None, system_prompt: str = "") -> str:
-    """Call Bedrock via Converse API with system prompt and conversation history."""
+def _ask_bedrock(user_msg: str, history: list = None, system_prompt: str = "", system_suffix: str = "") -> str:
+    """Call Bedrock via Converse API with system prompt and conversation history.
+    system_suffix (per-call text) goes after the cache point that ends system_prompt.
+    """
     messages = []
 
     # Add conversation history (last 10 turns)
@@ -2913,13 +3087,15 @@ def _ask_bedrock(user_msg: str, history: list = None, system_prompt: str = "") -
 
     response = bedrock.converse(
         modelId=BEDROCK_MODEL_ID,
-        system=[{"text": system_prompt or build_system_prompt(DEFAULT_AGENT, "hi")}],
+        system=prompt_cache.system_blocks(system_prompt or build_system_prompt(DEFAULT_AGENT, "hi"),
+                                          system_suffix, BEDROCK_MODEL_ID),
         messages=messages,
         inferenceConfig={
             "maxTokens": 300,
             "temperature": 0.7,
         }
     )
+    prompt_cache.record_usage(response.get("usage", {}), "call_answer", BEDROCK_MODEL_ID)
     return response["output"]["message"]["content"][0]["text"].strip()
 
 
@@ -3006,31 +3182,120 @@ def _split_for_tts(text: str, max_len: int = 220) -> list:
     return chunks if chunks else [text]
 
 
-def _tts_chunks_parallel(text: str, language: str, speaker: str) -> list:
-    """Generate TTS for text, chunking long responses at sentence boundaries.
-    Chunks are synthesised in parallel → no extra latency vs a single call.
-    Returns list of presigned audio URLs (empty list on total failure).
+# ── Streaming LLM → TTS ───────────────────────────────────────────────────────
+LLM_TTS_STREAMING = os.environ.get("LLM_TTS_STREAMING", "1") == "1"
+_SENTENCE_END     = re.compile(r'[।?!.](?=\s)')
+_TAG_RE           = re.compile(r'\[[A-Z_]+(?::\w+)?\]', re.IGNORECASE)
+_MIN_SENTENCE_LEN = 12    # don't send a lone "हाँ।" to TTS as its own clip
+_MAX_SPOKEN_LEN   = 500   # same cap as the non-streaming path
+
+
+class _StreamingTTS:
+    """Cuts LLM deltas at ।?!. boundaries and starts TTS for each sentence as soon as it is complete.
+
+    Text inside an unfinished [TAG is held back until the tag closes, and tags
+    are stripped before synthesis, so [HANGUP] / [SWITCH:x] / [FETCH_DATA] can
+    still be checked on the full text once the stream ends (or earlier).
     """
-    chunks = _split_for_tts(text)
-    if len(chunks) == 1:
-        url = sarvam_tts(text, language, speaker=speaker)
-        return [url] if url else []
-    with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as ex:
-        urls = list(ex.map(lambda c: sarvam_tts(c, language, speaker=speaker), chunks))
-    return [u for u in urls if u]
+
+    def __init__(self, language: str, speaker: str):
+        self.language = language
+        self.speaker  = speaker
+        self.text     = ""     # raw text so far, tags included
+        self._pending = ""     # not yet handed to TTS
+        self._spoken  = 0
+        self._jobs    = []     # (sentence, future)
+
+    @property
+    def started(self) -> bool:
+        """True once the first sentence has been handed to TTS."""
+        return bool(self._jobs)
+
+    def feed(self, delta: str):
+        self.text += delta
+        self._pending += delta
+        while True:
+            cut = self._next_cut()
+            if cut is None:
+                return
+            sentence, self._pending = self._pending[:cut], self._pending[cut:]
+            self._submit(sentence)
+
+    def _next_cut(self):
+        buf = self._pending
+        open_tag = buf.rfind("[")
+        if open_tag != -1 and "]" not in buf[open_tag:]:
+            buf = buf[:open_tag]   # wait for the tag to close
+        for m in _SENTENCE_END.finditer(buf):
+            if len(_TAG_RE.sub("", buf[:m.end()]).strip()) >= _MIN_SENTENCE_LEN:
+                return m.end()
+        return None
+
+    def _submit(self, sentence: str):
+        spoken = _TAG_RE.sub("", sentence).strip()
+        if not spoken or self._spoken >= _MAX_SPOKEN_LEN:
+            return
+        self._spoken += len(spoken)
+        future = _TTS_EXECUTOR.submit(tts_render, spoken, self.language, speaker=self.speaker, cache_lookup=False)
+        self._jobs.append((spoken, future))
+
+    def finish(self):
+        """Flush whatever is left after the last boundary."""
+        rest, self._pending = self._pending, ""
+        self._submit(rest)
+
+    def switch_requested(self) -> bool:
+        return bool(re.search(r'\[SWITCH:(arya|hitesh|vidya)\]', self.text, re.IGNORECASE))
+
+    def hangup_requested(self) -> bool:
+        return bool(re.search(r'\[HANGUP\]', self.text, re.IGNORECASE))
+
+    def cancel(self):
+        for _, future in self._jobs:
+            future.cancel()
+        self._jobs = []
+
+    def _rendered(self) -> list:
+        """[(sentence, (cache_key, url) or None)] — blocks until every clip is ready."""
+        out = []
+        for sentence, future in self._jobs:
+            try:
+                out.append((sentence, future.result()))
+            except Exception as e:
+                logger.warning(f"Streaming TTS clip failed: {e}")
+                out.append((sentence, None))
+        return out
+
+    def results(self) -> list:
+        """[(sentence, url_or_None)] in speaking order — blocks until every clip is ready."""
+        return [(sentence, rendered[1] if rendered else None) for sentence, rendered in self._rendered()]
+
+    def audio_keys(self) -> list | None:
+        """TTS cache keys of every clip in order, or None if any clip failed."""
+        keys = [rendered[0] if rendered else None for _, rendered in self._rendered()]
+        return keys if keys and all(keys) else None
+
+    def play_into(self, target):
+        """Append every clip to TwiML in order; Polly <Say> for any sentence whose TTS failed."""
+        cfg = LANG_CONFIG.get(self.language, LANG_CONFIG["en"])
+        for sentence, url in self.results():
+            if url:
+                target.play(url)
+            else:
+                target.say(sentence, voice=cfg["polly_voice"])
 
 
 # ── Helpers ──────────────────────────────────────────────────
-def _append_listen_gather(response, language: str, voice: str = "", agent: str = ""):
+def _append_listen_gather(response, language: str, voice: str = "", agent: str = "", session=None):
     """Append a <Gather input=speech> to listen for speech. Replaces <Record> — saves ~3s per turn
     by sending the transcript inline instead of recording→download→STT."""
     cfg = LANG_CONFIG.get(language, LANG_CONFIG["en"])
     _voice = voice or cfg["sarvam_speaker"]
     _agent = agent or DEFAULT_AGENT
     gather_url = (
-        f"{BASE_URL}/voice/gather?lang={language}&voice={_voice}&agent={_agent}"
+        f"{BASE_URL}/voice/gather?lang={language}&voice={_voice}&agent={_agent}{_ts_qs(session)}"
         if BASE_URL else
-        f"/voice/gather?lang={language}&voice={_voice}&agent={_agent}"
+        f"/voice/gather?lang={language}&voice={_voice}&agent={_agent}{_ts_qs(session)}"
     )
     # Always use hi-IN for Twilio STT — it handles Hindi + Hinglish + language-switch commands.
     # Using ta-IN would prevent the user from switching back to Hindi (Twilio can't understand Hindi in ta-IN mode).
@@ -3048,33 +3313,18 @@ def _append_listen_gather(response, language: str, voice: str = "", agent: str =
     response.append(g)
 
 
-def ask_again(language: str, voice: str = "", agent: str = ""):
-    msgs = {
-        "hi": "अरे, सुनाई नहीं दिया। एक बार फिर से बोलिए?",
-        "mr": "ऐकू आलं नाही. पुन्हा सांगा ना?",
-        "ta": "கேட்கவில்லை. மறுபடியும் சொல்லுங்க?",
-        "en": "Sorry, I didn't catch that. Could you say it again?",
-    }
+def ask_again(language: str, voice: str = "", agent: str = "", session=None):
+    msgs = static_prompts.ASK_AGAIN_MSGS
     response = VoiceResponse()
     tts_say(response, msgs.get(language, msgs["en"]), language)
-    _append_listen_gather(response, language, voice, agent)
+    _append_listen_gather(response, language, voice, agent, session=session)
     return twiml_response(response)
 
 
-def log_query(call_sid: str, query: str, answer: str, language: str):
-    try:
-        timestamp = get_call_timestamp(call_sid)
-        calls_table.update_item(
-            Key={"call_id": call_sid, "timestamp": timestamp},
-            UpdateExpression="SET queries_count = queries_count + :one, conversation_history = list_append(conversation_history, :entry)",
-            ExpressionAttributeValues={
-                ":one": 1,
-                ":entry": [{"query": query, "answer": answer, "language": language,
-                            "ts": int(datetime.now().timestamp())}]
-            }
-        )
-    except Exception as e:
-        logger.warning(f"Failed to log query: {e}")
+def log_query(session, query: str, answer: str, language: str):
+    """Queue a turn on the call session — written by the session's next flush()
+    (_flush_session, before the response returns)."""
+    session.append_turn(query, answer, language)
 
 
 def get_call_timestamp(call_sid: str) -> int:
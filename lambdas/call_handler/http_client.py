@@ -0,0 +1,105 @@
+# VaaniSeva – Shared outbound HTTP client
+# One pooled requests.Session per host, created lazily and kept for the life of the
+# warm container, so repeat calls to Sarvam / Cartesia / search / data.gov.in reuse
+# an open TLS connection instead of paying a handshake per request.
+#
+# Also bundled into the web agent zip (scripts/deploy.py) and used by the websocket
+# handler — both fall back to plain `requests` if this module is missing.
+#
+# Timeouts are per provider, as (connect, read) seconds, overridable with
+#   HTTP_TIMEOUT_<PROVIDER>="connect,read"   e.g. HTTP_TIMEOUT_SARVAM="2,8"
+# Retries only cover connection failures and 429/5xx responses, with a short
+# backoff — a read timeout is never retried (it would double a caller's wait).
+
+import os
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger()
+
+POOL_SIZE     = int(os.environ.get("HTTP_POOL_SIZE", "16"))
+RETRIES       = int(os.environ.get("HTTP_RETRIES", "2"))
+RETRY_BACKOFF = float(os.environ.get("HTTP_RETRY_BACKOFF", "0.2"))
+
+_DEFAULT_TIMEOUTS = {
+    "sarvam":     (2.0, 8.0),
+    "sarvam_stt": (2.0, 15.0),
+    "cartesia":   (2.0, 12.0),
+    "tavily":     (2.0, 5.0),
+    "serper":     (2.0, 5.0),
+    "ddg":        (2.0, 5.0),
+    "ddg_api":    (2.0, 3.0),
+    "data_gov":   (2.0, 5.0),
+    "twilio":     (2.0, 10.0),
+    "transcribe": (2.0, 5.0),
+    "default":    (3.0, 10.0),
+}
+
+_sessions = {}
+_lock     = threading.Lock()
+
+
+def timeout_for(provider: str) -> tuple:
+    """(connect, read) timeout for provider, honouring HTTP_TIMEOUT_<PROVIDER>."""
+    raw = os.environ.get(f"HTTP_TIMEOUT_{provider.upper()}", "")
+    if raw:
+        try:
+            connect, read = (float(x) for x in raw.split(","))
+            return connect, read
+        except ValueError:
+            logger.warning(f"Bad HTTP_TIMEOUT_{provider.upper()}={raw!r}, using default")
+    return _DEFAULT_TIMEOUTS.get(provider, _DEFAULT_TIMEOUTS["default"])
+
+
+def _new_session() -> requests.Session:
+    retry = Retry(
+        total=RETRIES,
+        connect=RETRIES,
+        read=0,
+        status=1,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST", "DELETE"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def session_for(url: str) -> requests.Session:
+    """Pooled session for the URL's host (created on first use)."""
+    host = urlsplit(url).netloc
+    sess = _sessions.get(host)
+    if sess is None:
+        with _lock:
+            sess = _sessions.get(host)
+            if sess is None:
+                sess = _sessions[host] = _new_session()
+    return sess
+
+
+def request(method: str, provider: str, url: str, **kwargs) -> requests.Response:
+    """requests.request through the pooled session, with the provider's timeout unless one is given."""
+    kwargs.setdefault("timeout", timeout_for(provider))
+    return session_for(url).request(method, url, **kwargs)
+
+
+def get(provider: str, url: str, **kwargs) -> requests.Response:
+    return request("GET", provider, url, **kwargs)
+
+
+def post(provider: str, url: str, **kwargs) -> requests.Response:
+    return request("POST", provider, url, **kwargs)
+
+
+def delete(provider: str, url: str, **kwargs) -> requests.Response:
+    return request("DELETE", provider, url, **kwargs)
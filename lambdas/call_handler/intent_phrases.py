@@ -0,0 +1,153 @@
+# VaaniSeva – Intent phrase tables for the call hot path
+# Every keyword list the call handler checks per utterance, compiled once at
+# import into a single PhraseMatcher (phrase_matcher.py). One MATCHER.match(text)
+# call returns every category present; handlers test membership on the result.
+#
+# Phrases are whole-word unless marked "stem*"; Tamil phrases are always stems.
+# Category names with a ":" carry a value, read with hits.first(prefix):
+#   lang:hi, agent:vidya, commodity:Tomato, state:Bihar
+
+from phrase_matcher import PhraseMatcher
+
+# ── Call control ─────────────────────────────────────────────
+# End the call — unambiguous even inside longer sentences
+BYE_PHRASES = [
+    "band karo", "बंद करो", "rakh do", "रख दो",
+    "phone rakh*", "फोन रख*", "phone band",
+    "cut the call", "call end", "hang up",
+    "kaat do", "काट दो", "phone kaat", "फोन काट",
+    "call kaat", "call band", "call rok*",
+    "shukriya bye", "शुक्रिया बाय", "thank you bye",
+    "alvida", "अलविदा", "விடை", "போதும்",
+    "dhanyavaad", "धन्यवाद", "shukriya", "शुक्रिया",
+]
+# Single-word goodbyes: only end the call when the utterance is short
+BYE_WORDS = ["bye", "goodbye", "tata", "ciao", "thanks", "thankyou"]
+
+# Must appear together with a language name to switch the conversation language
+LANG_SWITCH_TRIGGERS = [
+    "talk in", "speak in", "switch to", "change to",
+    "mein baat", "mein bol*",
+    "baat karo", "baat karna", "baat karein",
+    "bhasha*", "language change", "language switch",
+    "में बोलो", "में बात", "भाषा*",
+]
+LANGUAGE_NAMES = {
+    "hi": ["hindi", "हिंदी*", "हिन्दी*"],
+    "en": ["english", "अंग्रेजी*", "इंग्लिश"],
+    "mr": ["marathi", "मराठी*"],
+    "ta": ["tamil", "तमिल", "தமிழ்"],
+}
+
+VOICE_CHANGE = [
+    "change voice", "change my voice", "different voice",
+    "आवाज बदल*", "दूसरी आवाज", "voice change", "குரல் மாற்று",
+]
+
+# ── Agent routing ────────────────────────────────────────────
+# Includes common STT mis-transcriptions of the names. Devanagari names stay
+# whole-word: विद्या* would fire on विद्यार्थी (student).
+AGENT_NAMES = {
+    "arya":   ["arya", "aria", "aarya", "ariya", "आर्या", "ஆர்யா"],
+    "hitesh": ["hitesh", "hitesha", "हितेश", "ஹிதேஷ்"],
+    "vidya":  ["vidya", "vidhya", "विद्या", "வித்யா"],
+}
+SWITCH_PHRASES = [
+    "se baat", "ko bulao", "se milana", "se milao", "ko do", "ko bolo",
+    "connect karo", "connect", "baat karao", "baat karo",
+    "bulao", "la do", "de do", "transfer",
+]
+AGRICULTURE = [
+    "fasal*", "फसल*", "khet*", "खेत*", "mandi", "मंडी", "beej", "बीज",
+    "kisan*", "किसान*", "crop*", "wheat", "gehu*", "गेहूं", "onion*", "pyaaz",
+    "baarish", "बारिश", "irrigation", "sinchai", "सिंचाई", "fertilizer*",
+]
+HEALTH = [
+    "bimar*", "बीमार*", "hospital*", "doctor*", "dawai*", "दवाई*", "health",
+    "swasthya", "स्वास्थ्य", "ayushman", "आयुष्मान", "mental", "sad",
+    "dukhi", "दुखी", "anxiety", "depression", "asha", "nurse", "fever",
+    "bukhar", "बुखार", "pregnancy", "garbh*",
+]
+
+# ── Retrieval routing ────────────────────────────────────────
+# Conversational / follow-up utterances — no knowledge-base lookup
+RAG_SKIP = [
+    "theek", "ठीक", "samajh*", "समझ*", "aur batao", "और बताओ",
+    "haan", "हाँ", "ok", "okay", "accha", "अच्छा", "shukriya", "शुक्रिया",
+    "bye", "band karo", "thanks", "nahi", "नहीं",
+]
+# Live data queries — answered by the API tools, not the knowledge base
+LIVE_DATA = [
+    "mandi", "मंडी", "bhav", "भाव", "price*", "rate*", "bhaav",
+    "mausam", "मौसम", "barish", "बारिश", "weather", "temperature",
+]
+
+# ── data.gov.in mandi prices ─────────────────────────────────
+MANDI = [
+    "mandi", "मंडी", "bhav", "भाव", "price*", "rate*", "daam", "दाम",
+    "sabzi*", "सब्जी*", "vegetable*", "tomato*", "tamatar", "टमाटर",
+    "onion*", "pyaaz", "प्याज", "potato*", "aloo", "aalo", "alu", "आलू", "आलु", "wheat",
+    "gehu*", "गेहूं", "rice", "chawal", "चावल", "market*",
+]
+COMMODITIES = {
+    "Tomato":    ["tomato*", "tamatar", "टमाटर"],
+    "Onion":     ["onion*", "pyaaz", "प्याज"],
+    "Potato":    ["potato*", "aloo", "aalo", "alu", "आलू", "आलु"],
+    "Wheat":     ["wheat", "gehu*", "गेहूं"],
+    "Rice":      ["rice", "chawal", "चावल"],
+    "Apple":     ["apple*", "seb", "सेब"],
+    "Banana":    ["banana*", "kela", "केला"],
+    "Masur Dal": ["dal", "दाल"],
+    "Sugar":     ["sugar", "cheeni", "चीनी"],
+    "Soyabean":  ["soyabean", "soybean", "सोयाबीन"],
+}
+STATES = {
+    "Madhya Pradesh": ["madhyapradesh", "mp", "madhya pradesh", "मध्य प्रदेश"],
+    "Uttar Pradesh":  ["uttarpradesh", "up", "uttar pradesh", "उत्तर प्रदेश"],
+    "Rajasthan":      ["rajasthan", "राजस्थान"],
+    "Bihar":          ["bihar", "बिहार"],
+    "Maharashtra":    ["maharashtra", "महाराष्ट्र"],
+    "Punjab":         ["punjab", "पंजाब"],
+    "Haryana":        ["haryana", "हरियाणा"],
+    "Gujarat":        ["gujarat", "गुजरात"],
+    "Karnataka":      ["karnataka", "कर्नाटक"],
+    "Tamil Nadu":     ["tamil nadu", "तमिलनाडु"],
+    "Andhra Pradesh": ["andhra pradesh", "आंध्र प्रदेश"],
+    "Telangana":      ["telangana", "तेलंगाना"],
+    "West Bengal":    ["west bengal", "पश्चिम बंगाल"],
+    "Odisha":         ["odisha", "ओडिशा"],
+    "Chhattisgarh":   ["chhattisgarh", "छत्तीसगढ़"],
+    "Jharkhand":      ["jharkhand", "झारखंड"],
+    "Assam":          ["assam", "असम"],
+    "Kerala":         ["kerala", "केरल"],
+    "Goa":            ["goa", "गोवा"],
+}
+
+
+def _categories() -> dict:
+    cats = {
+        "bye": BYE_PHRASES,
+        "bye_word": BYE_WORDS,
+        "lang_switch": LANG_SWITCH_TRIGGERS,
+        "voice_change": VOICE_CHANGE,
+        "switch": SWITCH_PHRASES,
+        "agriculture": AGRICULTURE,
+        "health": HEALTH,
+        "rag_skip": RAG_SKIP,
+        "live_data": LIVE_DATA,
+        "mandi": MANDI,
+    }
+    for prefix, table in (("lang", LANGUAGE_NAMES), ("agent", AGENT_NAMES),
+                          ("commodity", COMMODITIES), ("state", STATES)):
+        for value, phrases in table.items():
+            cats[f"{prefix}:{value}"] = phrases
+    return cats
+
+
+CATEGORIES = _categories()
+MATCHER    = PhraseMatcher(CATEGORIES)
+
+
+def match(text: str):
+    """All intent categories present in text (phrase_matcher.Hits)."""
+    return MATCHER.match(text)
@@ -0,0 +1,49 @@
+# VaaniSeva – In-container job completion signal for the [FETCH_DATA] path
+# handle_gather starts the data fetch on a background thread and redirects Twilio
+# to /voice/poll. When that poll lands on the same warm container (the usual case),
+# it blocks on a Condition here and wakes the instant the worker publishes — no
+# DynamoDB reads, no polling interval.
+#
+# If the poll lands on a different container the job is unknown locally, and the
+# caller falls back to reading the job record (see handler._poll_job_record).
+
+import time
+import threading
+
+_JOB_TTL_SECONDS = 300
+
+
+class JobBoard:
+    """Latest job record per job key, with blocking waits on status changes."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._jobs = {}   # job_key → (item, published_at)
+
+    def publish(self, job_key: str, item: dict) -> None:
+        """Record the latest state of a job and wake every waiter."""
+        now = time.time()
+        with self._cond:
+            self._jobs[job_key] = (item, now)
+            for key in [k for k, (_, ts) in self._jobs.items() if now - ts > _JOB_TTL_SECONDS]:
+                del self._jobs[key]
+            self._cond.notify_all()
+
+    def knows(self, job_key: str) -> bool:
+        with self._cond:
+            return job_key in self._jobs
+
+    def discard(self, job_key: str) -> None:
+        with self._cond:
+            self._jobs.pop(job_key, None)
+
+    def wait_for(self, job_key: str, statuses: tuple, timeout: float) -> dict | None:
+        """Block until the job reaches one of statuses; None on timeout."""
+        def _ready():
+            entry = self._jobs.get(job_key)
+            return entry is not None and entry[0].get("status") in statuses
+
+        with self._cond:
+            if self._cond.wait_for(_ready, timeout=timeout):
+                return self._jobs[job_key][0]
+        return None
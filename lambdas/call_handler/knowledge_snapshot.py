@@ -0,0 +1,166 @@
+# VaaniSeva – Binary knowledge snapshot in S3
+# Cold containers load the knowledge vectors from one .npy matrix instead of
+# paginating vaaniseva-vectors and converting thousands of Decimals.
+#
+# Layout under KNOWLEDGE_SNAPSHOT_PREFIX (default knowledge/snapshot):
+#   meta.json             — sidecar: version, matrix key, dim, count, row ids + texts
+#   v{version}-{id}.npy   — float32 (count, dim) matrix, rows already unit length
+#   v{version}-{id}.ivf.npz — optional IVF ANN index over the matrix (ann_index.py)
+#   v{version}-{id}.q.npz   — optional int8 / sign codes of the matrix (quantize.py)
+#
+# meta.json is written last, so a reader never sees a sidecar pointing at a
+# matrix that is not uploaded yet. The matrix is downloaded once to /tmp and
+# opened with np.load(mmap_mode="r") so only touched pages are read into memory.
+# Once a new version has loaded, files of superseded versions are deleted from
+# /tmp (512 MB per container); a still-mapped old matrix stays readable until unmapped.
+
+import io
+import os
+import json
+import time
+import uuid
+import logging
+
+import numpy as np
+
+import ann_index
+import quantize
+
+logger = logging.getLogger()
+
+SNAPSHOT_PREFIX = os.environ.get("KNOWLEDGE_SNAPSHOT_PREFIX", "knowledge/snapshot")
+CACHE_DIR       = os.environ.get("KNOWLEDGE_SNAPSHOT_CACHE_DIR", "/tmp")
+
+
+def _meta_key(prefix: str) -> str:
+    return f"{prefix}/meta.json"
+
+
+def _download(s3_client, bucket: str, key: str) -> str:
+    """Local /tmp copy of an immutable snapshot object (fetched once per container)."""
+    local_path = os.path.join(CACHE_DIR, "knowledge-" + os.path.basename(key))
+    if not os.path.exists(local_path):
+        tmp_path = f"{local_path}.{uuid.uuid4().hex[:6]}.part"
+        s3_client.download_file(bucket, key, tmp_path)
+        os.replace(tmp_path, local_path)
+    return local_path
+
+
+def _prune(keep: set) -> None:
+    """Delete cached snapshot files other than `keep` (in-flight .part downloads are left alone)."""
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(CACHE_DIR, name)
+        if not name.startswith("knowledge-") or name.endswith(".part") or path in keep:
+            continue
+        try:
+            os.remove(path)
+            logger.info(f"Removed superseded snapshot file {path}")
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {e}")
+
+
+def write(s3_client, bucket: str, matrix: np.ndarray, items: list, version: int,
+          prefix: str = SNAPSHOT_PREFIX, ann=None, quant=None) -> str:
+    """Upload matrix (+ ANN index, quantised codes) + sidecar. Returns the S3 key of the matrix."""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    snapshot_id = uuid.uuid4().hex[:8]
+    matrix_key = f"{prefix}/v{version}-{snapshot_id}.npy"
+
+    buf = io.BytesIO()
+    np.save(buf, matrix, allow_pickle=False)
+    s3_client.put_object(Bucket=bucket, Key=matrix_key, Body=buf.getvalue(),
+                         ContentType="application/octet-stream")
+
+    sidecar = {
+        "version": int(version),
+        "matrix_key": matrix_key,
+        "count": int(matrix.shape[0]),
+        "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        "built_at": int(time.time()),
+        "items": items,
+    }
+    if ann is not None:
+        ann_key = f"{prefix}/v{version}-{snapshot_id}.ivf.npz"
+        s3_client.put_object(Bucket=bucket, Key=ann_key, Body=ann.to_bytes(),
+                             ContentType="application/octet-stream")
+        sidecar.update({"ann_key": ann_key, "ann_lists": int(ann.n_lists)})
+    if quant is not None:
+        quant_key = f"{prefix}/v{version}-{snapshot_id}.q.npz"
+        s3_client.put_object(Bucket=bucket, Key=quant_key, Body=quant.to_bytes(),
+                             ContentType="application/octet-stream")
+        sidecar["quant_key"] = quant_key
+    s3_client.put_object(Bucket=bucket, Key=_meta_key(prefix),
+                         Body=json.dumps(sidecar, ensure_ascii=False, default=str).encode("utf-8"),
+                         ContentType="application/json")
+    logger.info(f"Knowledge snapshot written: {matrix_key} ({sidecar['count']} rows, version={version})")
+    return matrix_key
+
+
+def read(s3_client, bucket: str, expected_version: int = None,
+         prefix: str = SNAPSHOT_PREFIX) -> tuple | None:
+    """Load the latest snapshot as (memmapped matrix, items, version, extras).
+
+    extras holds the optional "ann" (ann_index.IVFIndex) and "quant"
+    (quantize.QuantizedVectors) stored with it; a part that fails to load or
+    does not match the matrix is left out. Returns None if there is no snapshot
+    or it is older than expected_version.
+    """
+    try:
+        obj = s3_client.get_object(Bucket=bucket, Key=_meta_key(prefix))
+        sidecar = json.loads(obj["Body"].read())
+    except Exception as e:
+        logger.info(f"No knowledge snapshot available: {e}")
+        return None
+
+    version = int(sidecar.get("version", 0))
+    if expected_version is not None and version != expected_version:
+        logger.info(f"Knowledge snapshot stale (snapshot={version}, table={expected_version})")
+        return None
+
+    matrix_path = _download(s3_client, bucket, sidecar["matrix_key"])
+    matrix = np.load(matrix_path, mmap_mode="r")
+    items = sidecar.get("items", [])
+    if matrix.shape[0] != len(items):
+        logger.warning(f"Knowledge snapshot row mismatch: {matrix.shape[0]} vs {len(items)} items")
+        return None
+
+    extras, loaded = {}, {matrix_path}
+    for name, key, loader in (("ann", "ann_key", ann_index.IVFIndex.from_file),
+                              ("quant", "quant_key", quantize.QuantizedVectors.from_file)):
+        if not sidecar.get(key):
+            continue
+        try:
+            path = _download(s3_client, bucket, sidecar[key])
+            loaded.add(path)
+            part = loader(path)
+        except Exception as e:
+            logger.warning(f"Knowledge snapshot {name} load failed, skipping it: {e}")
+            continue
+        rows = part.n_rows if name == "ann" else len(part)
+        if rows != matrix.shape[0]:
+            logger.warning(f"Knowledge snapshot {name} row mismatch: {rows} vs {matrix.shape[0]} — skipping it")
+            continue
+        extras[name] = part
+    _prune(loaded)
+    return matrix, items, version, extras
+
+
+def read_centroids(s3_client, bucket: str, prefix: str = SNAPSHOT_PREFIX) -> np.ndarray | None:
+    """IVF centroids of the published snapshot, or None if it has no ANN index.
+
+    Lets the snapshot job re-use the trained partition in a container that has
+    not loaded the index itself.
+    """
+    try:
+        obj = s3_client.get_object(Bucket=bucket, Key=_meta_key(prefix))
+        ann_key = json.loads(obj["Body"].read()).get("ann_key")
+        if not ann_key:
+            return None
+        return ann_index.IVFIndex.from_file(_download(s3_client, bucket, ann_key)).centroids
+    except Exception as e:
+        logger.warning(f"Knowledge snapshot centroids unavailable: {e}")
+        return None
@@ -0,0 +1,236 @@
+# VaaniSeva – Script-based language identification
+# Shared by the call handler, the websocket handler and the web agent (bundled
+# into its zip by scripts/deploy.py). Pure Python, no NumPy, so the web agent
+# package stays small.
+#
+# One str.translate pass maps every letter to a one-character script tag (all
+# nine Indic blocks + Latin) and drops everything else; a Counter over the result
+# gives the per-script histogram in C. Scripts that host one language map
+# straight to it. The two shared ones are split with small log-odds models:
+#   Devanagari → Hindi vs Marathi   (function words, -चा/-ची/-चे/-च्या, ळ)
+#   Latin      → English vs Hinglish (romanised Hindi vs English function words)
+#
+# Each split starts from a prior centred on the caller's current language, so
+# text without word-level evidence ("PM Kisan yojana", "पीएम किसान योजना") keeps
+# it. If the current language is outside the pair, Devanagari leans Hindi (the
+# script alone rules English out) and Latin stays even: scheme names and
+# acronyms are typed in Latin letters in every language, so detect() falls back
+# to the default below its confidence floor.
+#
+# scores() returns a confidence per language that sums to 1; detect() picks the
+# best among the languages a caller supports.
+
+import re
+import math
+from collections import Counter
+
+# ── Scripts ──────────────────────────────────────────────────
+# tag: (first code point, last code point, language, script name)
+_BLOCKS = {
+    "D": (0x0900, 0x097F, None, "devanagari"),   # Hindi / Marathi — split below
+    "B": (0x0980, 0x09FF, "bn", "bengali"),
+    "P": (0x0A00, 0x0A7F, "pa", "gurmukhi"),
+    "G": (0x0A80, 0x0AFF, "gu", "gujarati"),
+    "O": (0x0B00, 0x0B7F, "or", "odia"),
+    "T": (0x0B80, 0x0BFF, "ta", "tamil"),
+    "E": (0x0C00, 0x0C7F, "te", "telugu"),
+    "K": (0x0C80, 0x0CFF, "kn", "kannada"),
+    "M": (0x0D00, 0x0D7F, "ml", "malayalam"),
+}
+_LATIN = "L"
+_MR_LETTER = "\u0933"   # ळ — everyday in Marathi, practically absent from Hindi
+_MR_TAG = "R"            # counted separately, then folded back into Devanagari
+
+# Devanagari punctuation (danda, double danda) and digits carry no language
+_SKIP = set(range(0x0964, 0x0970))
+
+
+class _ScriptTable(dict):
+    """translate() table: letters → script tag, everything else → deleted.
+
+    Code points below U+3000 are filled in up front; anything rarer (emoji, CJK)
+    is resolved to None on first sight and remembered.
+    """
+
+    def __missing__(self, cp):
+        self[cp] = None
+        return None
+
+
+def _build_table() -> _ScriptTable:
+    table = _ScriptTable.fromkeys(range(0x3000))
+    for tag, (lo, hi, _, _) in _BLOCKS.items():
+        for cp in range(lo, hi + 1):
+            if cp not in _SKIP:
+                table[cp] = tag
+    for cp in range(ord("a"), ord("z") + 1):
+        table[cp] = _LATIN
+        table[cp - 32] = _LATIN
+    table[ord(_MR_LETTER)] = _MR_TAG
+    return table
+
+
+_TABLE = _build_table()
+
+
+def script_counts(text: str) -> Counter:
+    """Letters per script tag, from a single translate + count pass."""
+    return Counter((text or "").translate(_TABLE))
+
+
+# ── Hindi vs Marathi ─────────────────────────────────────────
+# Function words that occur in one language and not (commonly) in the other;
+# words both use (किसान, का, की, होते, करते, जाते) carry no evidence and are left out
+_MARATHI_WORDS = frozenset([
+    "आहे", "आहात", "आहेत", "नाही", "नाहीत", "आणि", "पण", "मला", "तुला",
+    "आम्ही", "तुम्ही", "तुम्हाला", "आम्हाला", "आपण", "त्याला", "तिला", "त्यांना",
+    "काय", "कसे", "कसा", "कशी", "कुठे", "केव्हा", "किती", "होय",
+    "करा", "करतो", "करायचे", "सांगा", "बोला", "द्या", "घ्या", "आलो",
+    "केला", "केली", "झाला", "झाली", "मध्ये", "साठी", "आता", "इथे", "तिथे", "माझे",
+    "माझा", "माझी", "तुमचा", "तुमची", "तुमचे", "शेतकरी", "योजनेचा", "मिळेल",
+])
+_HINDI_WORDS = frozenset([
+    "है", "हैं", "था", "थी", "थे", "नहीं", "और", "लेकिन", "मुझे", "तुम्हें", "आपको",
+    "हम", "मैं", "मेरा", "मेरी", "मेरे", "क्या", "कैसे", "कहाँ", "कहां", "कब",
+    "कितना", "कितने", "क्यों", "हाँ", "हां", "करो", "करें", "करना", "बताओ", "बताइए",
+    "बोलो", "दो", "दीजिए", "में", "के", "को", "से", "लिए", "अभी", "यहाँ",
+    "वहाँ", "मिलेगा", "चाहिए", "रहा", "रही", "गया", "गई",
+])
+# Marathi genitive endings (-चा/-ची/-चे/-च्या); Hindi uses का/की/के as separate words
+_MARATHI_SUFFIX = re.compile(r"[\u0900-\u097F]{2,}(?:चा|ची|चे|च्या)(?![\u0900-\u097F])")
+_DEVANAGARI_WORD = re.compile(r"[\u0900-\u0963\u0970-\u097F]+")
+
+_PRIOR     = 1.0     # log-odds toward the caller's current language
+_MR_WORD   = 2.0
+_HI_WORD   = 2.0
+_MR_SUFFIX = 1.5
+_MR_LLA    = 1.5
+
+# ── English vs Hinglish ──────────────────────────────────────
+# Words typed the same in both ("main", "me", "do", "is") are left out
+_ROMAN_HINDI = frozenset([
+    "hai", "hain", "kya", "nahi", "nahin", "aur", "mera", "meri", "mere", "mujhe",
+    "karo", "karna", "kar", "bolo", "batao", "bataiye", "haan", "han", "acha", "accha",
+    "theek", "thik", "matlab", "yaar", "bhai", "kaise", "kyun", "kyu", "kaun", "kab",
+    "abhi", "kahan", "kitna", "kitne", "ka", "ki", "ke", "ko", "se", "mein", "liye",
+    "hum", "aap", "aapka", "tum", "chahiye", "milega", "wala", "wali", "bhi",
+    "toh", "ji", "namaste", "dhanyavaad", "shukriya", "sakta", "sakte", "raha", "rahi",
+])
+_ENGLISH_WORDS = frozenset([
+    "the", "are", "was", "what", "how", "when", "where", "who", "which", "why",
+    "i", "you", "my", "your", "we", "can", "could", "does", "for", "of", "to",
+    "in", "on", "and", "or", "about", "please", "tell", "this", "that", "with",
+    "want", "need", "apply", "get", "am", "have", "has", "there", "it", "a", "an",
+])
+_LATIN_WORD = re.compile(r"[a-z]+")
+
+_HINGLISH_WORD  = 2.0
+_ENGLISH_WORD   = 1.5
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, x))))
+
+
+def marathi_probability(text: str, lla: int = 0, default: str | None = None) -> float:
+    """P(Marathi | Devanagari text) from function words, genitive suffixes and ळ.
+
+    The prior leans Marathi only when that is the caller's current language.
+    """
+    words = _DEVANAGARI_WORD.findall(text)
+    mr = sum(1 for w in words if w in _MARATHI_WORDS)
+    hi = sum(1 for w in words if w in _HINDI_WORDS)
+    suffix = len(_MARATHI_SUFFIX.findall(text))
+    prior = _PRIOR if default == "mr" else -_PRIOR
+    logit = (prior + _MR_WORD * mr - _HI_WORD * hi
+             + _MR_SUFFIX * suffix + _MR_LLA * min(lla, 2))
+    return _sigmoid(logit)
+
+
+def hinglish_probability(text: str, default: str | None = None) -> float:
+    """P(romanised Hindi | Latin text) from romanised-Hindi vs English function words.
+
+    The prior leans toward the caller's current language, and is even for any other.
+    """
+    words = _LATIN_WORD.findall(text.lower())
+    hi = sum(1 for w in words if w in _ROMAN_HINDI)
+    en = sum(1 for w in words if w in _ENGLISH_WORDS)
+    prior = {"hi": _PRIOR, "en": -_PRIOR}.get(default, 0.0)
+    return _sigmoid(prior + _HINGLISH_WORD * hi - _ENGLISH_WORD * en)
+
+
+# ── Public API ───────────────────────────────────────────────
+def scores(text: str, default: str | None = None) -> dict:
+    """{language: confidence} over every language with evidence, summing to 1.
+
+    default: the caller's current language, which the shared-script priors lean
+    toward. Empty for text without letters.
+    """
+    counts = script_counts(text)
+    lla = counts.pop(_MR_TAG, 0)
+    if lla:
+        counts["D"] += lla
+    total = sum(counts.values())
+    if not total:
+        return {}
+
+    out = {}
+    for tag, n in counts.items():
+        share = n / total
+        if tag == "D":
+            p_mr = marathi_probability(text, lla, default)
+            out["mr"] = out.get("mr", 0.0) + share * p_mr
+            out["hi"] = out.get("hi", 0.0) + share * (1.0 - p_mr)
+        elif tag == _LATIN:
+            p_hi = hinglish_probability(text, default)
+            out["hi"] = out.get("hi", 0.0) + share * p_hi
+            out["en"] = out.get("en", 0.0) + share * (1.0 - p_hi)
+        else:
+            lang = _BLOCKS[tag][2]
+            out[lang] = out.get(lang, 0.0) + share
+    return out
+
+
+def dominant_script(text: str) -> str | None:
+    """Name of the script with the most letters ("devanagari", "latin", ...)."""
+    counts = script_counts(text)
+    counts["D"] += counts.pop(_MR_TAG, 0)
+    counts = +counts
+    if not counts:
+        return None
+    tag = counts.most_common(1)[0][0]
+    return "latin" if tag == _LATIN else _BLOCKS[tag][3]
+
+
+def is_hinglish(text: str) -> bool:
+    """Hindi written in Latin letters, or Devanagari and Latin mixed in one utterance."""
+    counts = script_counts(text)
+    latin = counts.get(_LATIN, 0)
+    deva = counts.get("D", 0) + counts.get(_MR_TAG, 0)
+    total = sum(counts.values())
+    if not latin or not total:
+        return False
+    if deva and min(latin, deva) / total >= 0.2:
+        return True
+    # English prior: all-Latin text needs romanised-Hindi words to count
+    return latin / total >= 0.8 and hinglish_probability(text, "en") >= 0.5
+
+
+def detect(text: str, supported=None, default: str = "hi", min_confidence: float = 0.0) -> tuple:
+    """(language, confidence) for text.
+
+    supported: languages the caller can handle (any container of codes); others are
+    ignored. default is also the prior for the shared scripts (see scores()), so
+    text without evidence keeps it. Returns (default, confidence) when nothing
+    supported clears min_confidence.
+    """
+    ranked = scores(text, default)
+    if supported is not None:
+        ranked = {lang: p for lang, p in ranked.items() if lang in supported}
+    if not ranked:
+        return default, 0.0
+    lang = max(ranked, key=ranked.get)
+    confidence = ranked[lang]
+    if confidence < min_confidence:
+        return default, confidence
+    return lang, confidence
@@ -0,0 +1,49 @@
+# VaaniSeva – CloudWatch metrics via Embedded Metric Format
+# A metric is one JSON line on stdout with an "_aws" block describing it; Lambda
+# ships stdout to CloudWatch Logs, which extracts the metrics asynchronously —
+# no PutMetricData call, nothing on the response path but a print.
+#
+# print() rather than the logger: the Lambda log formatter prefixes level and
+# request id, and EMF needs the JSON to be the whole line.
+
+import os
+import json
+import time
+import logging
+
+logger = logging.getLogger()
+
+NAMESPACE = os.environ.get("METRICS_NAMESPACE", "VaaniSeva")
+ENABLED   = os.environ.get("METRICS_ENABLED", "1") == "1"
+
+
+def emit(values: dict, dimensions: dict | None = None, units: dict | None = None) -> None:
+    """Publish {metric: value} under one dimension set.
+
+    units: {metric: CloudWatch unit}; metrics not listed are "Count", or
+    "Milliseconds" when the name ends in "Ms".
+    """
+    if not ENABLED or not values:
+        return
+    dimensions = {k: str(v) for k, v in (dimensions or {}).items()}
+    units = units or {}
+    definitions = [
+        {"Name": name, "Unit": units.get(name, "Milliseconds" if name.endswith("Ms") else "Count")}
+        for name in values
+    ]
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": NAMESPACE,
+                "Dimensions": [list(dimensions)],
+                "Metrics": definitions,
+            }],
+        },
+        **dimensions,
+        **values,
+    }
+    try:
+        print(json.dumps(record, default=float), flush=True)
+    except Exception as e:
+        logger.warning(f"Metric emit failed: {e}")
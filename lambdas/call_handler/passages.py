@@ -0,0 +1,149 @@
+# VaaniSeva – Passage chunking and token-budgeted RAG context
+# Long FAQ entries (EXTRA_SECTIONS in scripts/seed_knowledge.py) are several
+# kilobytes of "Q:/A:" pairs. Embedding them whole blurs the vector and pasting
+# three of them into the prompt costs thousands of input tokens per data turn.
+#
+# Ingestion (scripts/seed_engine.py): split_passages() cuts an entry at question
+# markers (Q: / प्रश्न: / கே:), then at blank-line paragraphs, then at sentence
+# ends until every passage fits CHUNK_MAX_CHARS. Each passage becomes its own
+# vector row carrying parent_id / chunk_no / chunk_count.
+#
+# Retrieval (handler.retrieve_context): build_context() renders the best
+# passages in the caller's language and packs them, best first, into a token
+# budget estimated per script — Indic scripts cost far more tokens per character
+# than English.
+
+import os
+import re
+
+CHUNK_MAX_CHARS = int(os.environ.get("RAG_CHUNK_MAX_CHARS", "600"))
+CHUNK_MIN_CHARS = 80      # shorter pieces (headings, one-liners) join their neighbour
+
+CONTEXT_TOKENS  = int(os.environ.get("RAG_CONTEXT_TOKENS", "600"))
+# Per-language override: RAG_CONTEXT_TOKENS_HI=800 etc.
+CONTEXT_TOKENS_BY_LANG = {
+    lang: int(os.environ.get(f"RAG_CONTEXT_TOKENS_{lang.upper()}", CONTEXT_TOKENS))
+    for lang in ("hi", "mr", "ta", "en")
+}
+
+# Rough characters per model token by script (Latin text packs ~4 chars per token;
+# Devanagari and Tamil split into far smaller pieces)
+_CHARS_PER_TOKEN = {"latin": 4.0, "devanagari": 2.0, "tamil": 1.6, "other": 2.5}
+
+# Field priority: native language first, then Hindi fallback, then English
+FIELD_PRIORITY = {
+    "hi": ["text_hi", "text_en", "text"],
+    "mr": ["text_mr", "text_hi", "text_en", "text"],
+    "ta": ["text_ta", "text_hi", "text_en", "text"],
+    "en": ["text_en", "text_hi", "text"],
+}
+
+_QUESTION   = re.compile(r"(?m)^[ \t]*(?=(?:Q|प्रश्न|கே)[ \t]*[:：])")
+_PARAGRAPH  = re.compile(r"\n[ \t]*\n")
+_SENTENCE   = re.compile(r"(?<=[.!?।॥])\s+")
+_DEVANAGARI = re.compile(r"[\u0900-\u097F]")
+_TAMIL      = re.compile(r"[\u0B80-\u0BFF]")
+_LATIN      = re.compile(r"[A-Za-z]")
+
+
+# ── Chunking ─────────────────────────────────────────────────
+def _merge_small(pieces: list, max_chars: int) -> list:
+    """Join pieces shorter than CHUNK_MIN_CHARS onto the following (or previous) one."""
+    out, carry = [], ""
+    for piece in pieces:
+        piece = f"{carry}\n{piece}".strip() if carry else piece
+        carry = ""
+        if len(piece) < CHUNK_MIN_CHARS:
+            carry = piece
+            continue
+        out.append(piece)
+    if carry:
+        if out and len(out[-1]) + len(carry) + 1 <= max_chars:
+            out[-1] = f"{out[-1]}\n{carry}"
+        else:
+            out.append(carry)
+    return out
+
+
+def _pack(units: list, max_chars: int, joiner: str) -> list:
+    """Greedily join consecutive units into pieces of at most max_chars."""
+    out, cur = [], ""
+    for unit in units:
+        if cur and len(cur) + len(joiner) + len(unit) > max_chars:
+            out.append(cur)
+            cur = unit
+        else:
+            cur = f"{cur}{joiner}{unit}" if cur else unit
+    if cur:
+        out.append(cur)
+    return out
+
+
+def _split_block(block: str, max_chars: int) -> list:
+    if len(block) <= max_chars:
+        return [block]
+    paragraphs = [p.strip() for p in _PARAGRAPH.split(block) if p.strip()]
+    if len(paragraphs) > 1:
+        return [piece for p in _pack(paragraphs, max_chars, "\n\n") for piece in _split_block(p, max_chars)]
+    sentences = [s for s in _SENTENCE.split(block) if s]
+    return _pack(sentences, max_chars, " ")   # a single over-long sentence stays whole
+
+
+def split_passages(text: str, max_chars: int = CHUNK_MAX_CHARS) -> list:
+    """Passages of text, cut at question markers, then paragraphs, then sentences."""
+    text = (text or "").strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+    blocks = [b.strip() for b in _QUESTION.split(text) if b.strip()]
+    pieces = [piece for block in blocks for piece in _split_block(block, max_chars)]
+    return _merge_small(pieces, max_chars)
+
+
+# ── Token budget ─────────────────────────────────────────────
+def estimate_tokens(text: str) -> int:
+    """Approximate model tokens for text, by its dominant script."""
+    if not text:
+        return 0
+    deva, tamil, latin = (len(r.findall(text)) for r in (_DEVANAGARI, _TAMIL, _LATIN))
+    script = max((deva, "devanagari"), (tamil, "tamil"), (latin, "latin"))[1] if (deva or tamil or latin) else "other"
+    return int(len(text) / _CHARS_PER_TOKEN[script]) + 1
+
+
+def render(item: dict, language: str) -> str:
+    """The item's text in the caller's language, falling back per FIELD_PRIORITY."""
+    for field in FIELD_PRIORITY.get(language, ["text_en", "text"]):
+        value = item.get(field, "")
+        if value:
+            return value
+    return ""
+
+
+def build_context(ranked: list, language: str, budget: int | None = None) -> str:
+    """Pack rendered passages, best first, into the language's token budget.
+
+    ranked: (score, item) pairs, best first. A passage that does not fit is
+    skipped in favour of shorter ones further down; the best passage is always
+    included (cut at a sentence boundary if it alone exceeds the budget).
+    """
+    budget = budget or CONTEXT_TOKENS_BY_LANG.get(language, CONTEXT_TOKENS)
+    texts, used = [], 0
+    for _, item in ranked:
+        text = render(item, language)
+        if not text or text in texts:
+            continue
+        cost = estimate_tokens(text)
+        if used + cost <= budget:
+            texts.append(text)
+            used += cost
+        elif not texts:
+            kept = ""
+            for sentence in _SENTENCE.split(text):
+                candidate = f"{kept} {sentence}".strip()
+                if estimate_tokens(candidate) > budget:
+                    break
+                kept = candidate
+            texts.append(kept or text[: int(budget * _CHARS_PER_TOKEN["devanagari"])])
+            used = budget
+    return "\n\n".join(texts)
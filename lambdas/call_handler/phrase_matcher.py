@@ -0,0 +1,129 @@
+# VaaniSeva – Compiled multilingual phrase matcher
+# Keyword checks on the call hot path used to be `any(kw in text for kw in list)`
+# — one linear substring scan per list, and substring semantics: "ok" fired inside
+# "lok sabha", "asha" inside "bhasha", "aria" inside "malaria".
+#
+# A PhraseMatcher compiles every phrase of every category into ONE regex at import,
+# factored as a character trie so shared prefixes are tried once, and finds every
+# phrase occurrence in a single pass. Matching is word-boundary aware for all
+# scripts: Indic letters *and* their combining marks (matras, virama, anusvara)
+# count as word characters — the regex \b treats matras as non-word and would
+# split a Devanagari word in the middle.
+#
+# Phrase syntax:
+#   "phone band"   whole words; any run of whitespace matches the space
+#   "bimar*"       stem — no right boundary ("bimari", "bimaar" does not match)
+# Tamil-script phrases are stems automatically (suffixes agglutinate: தமிழ் → தமிழில்).
+# A stem's trailing virama is dropped, since a suffix replaces it with a vowel sign.
+#
+# Text and phrases are normalised the same way: NFC, casefold, nukta and ZWJ/ZWNJ
+# dropped, chandrabindu folded to anusvara — so आवाज़/आवाज and हाँ/हां are equal.
+
+import re
+import unicodedata
+
+# Word characters: \w plus every Indic block (Devanagari … Sinhala), which covers
+# the combining marks \w leaves out
+_WORD_CLASS = r"\w\u0900-\u0DFF"
+_LEFT  = rf"(?<![{_WORD_CLASS}])"
+_RIGHT = rf"(?![{_WORD_CLASS}])"
+_IS_WORD = re.compile(rf"[{_WORD_CLASS}]")
+_TAMIL   = re.compile(r"[\u0B80-\u0BFF]")
+
+_DROP = dict.fromkeys([0x093C, 0x09BC, 0x0A3C, 0x0ABC, 0x0B3C, 0x0CBC, 0x200C, 0x200D], None)  # nuktas, ZWNJ, ZWJ
+_FOLD = {0x0901: 0x0902}  # chandrabindu → anusvara
+_SPACES = re.compile(r"\s+")
+_VIRAMAS = "\u094D\u09CD\u0A4D\u0ACD\u0B4D\u0BCD\u0C4D\u0CCD\u0D4D"
+
+
+def normalize(text: str) -> str:
+    """Canonical form used for both phrases and utterances."""
+    text = unicodedata.normalize("NFC", text or "").casefold()
+    text = text.translate(_DROP).translate(_FOLD)
+    return _SPACES.sub(" ", text).strip()
+
+
+def _parse(phrase: str) -> tuple:
+    """(normalised text, is_stem) for one phrase entry."""
+    text = normalize(phrase.rstrip("*"))
+    stem = phrase.endswith("*") or bool(_TAMIL.search(text))
+    if stem:
+        text = text.rstrip(_VIRAMAS)
+    return text, stem
+
+
+def _trie_regex(phrases: dict) -> str:
+    """Regex alternation for {text: is_stem}, factored by common prefixes, longest first."""
+    trie = {}
+    for text, stem in phrases.items():
+        node = trie
+        for ch in text:
+            node = node.setdefault(ch, {})
+        node[""] = stem
+
+    def emit(node) -> str:
+        alts = []
+        for ch in sorted(k for k in node if k):
+            piece = r"\s+" if ch == " " else re.escape(ch)
+            alts.append(piece + emit(node[ch]))
+        if "" in node:
+            alts.append("" if node[""] else _RIGHT)   # terminal last → longest match wins
+        if len(alts) == 1:
+            return alts[0]
+        return "(?:" + "|".join(alts) + ")"
+
+    return emit(trie)
+
+
+class Hits(dict):
+    """{category: [matched phrases]} in order of first appearance in the utterance."""
+
+    def first(self, prefix: str) -> str | None:
+        """Suffix of the earliest category named "<prefix>:<suffix>", e.g. first("agent") → "vidya"."""
+        for category in self:
+            if category.startswith(prefix + ":"):
+                return category[len(prefix) + 1:]
+        return None
+
+
+class PhraseMatcher:
+    """Every phrase of every category compiled into a single regex."""
+
+    def __init__(self, categories: dict):
+        phrases = {}     # text → is_stem
+        owners  = {}     # text → categories listing it
+        for category, entries in categories.items():
+            for entry in entries:
+                text, stem = _parse(entry)
+                if not text:
+                    continue
+                if phrases.get(text, stem) != stem:
+                    raise ValueError(f"Phrase {text!r} is a stem in one category and whole-word in another")
+                phrases[text] = stem
+                owners.setdefault(text, []).append(category)
+
+        # The regex reports the longest phrase at each start position. Shorter phrases
+        # that also match there (a prefix ending on a word boundary, or a stem) are
+        # folded into the longer phrase's categories up front.
+        self._categories = {}
+        for text in phrases:
+            cats = []
+            for shorter, stem in phrases.items():
+                if (shorter == text or (text.startswith(shorter) and
+                        (stem or not _IS_WORD.match(text[len(shorter)])))):
+                    cats.extend(c for c in owners[shorter] if c not in cats)
+            self._categories[text] = cats
+
+        # Zero-width lookahead so overlapping phrases at different positions are all found
+        self._regex = re.compile(f"(?={_LEFT}({_trie_regex(phrases)}))") if phrases else None
+
+    def match(self, text: str) -> Hits:
+        """All categories present in text, one pass."""
+        hits = Hits()
+        if not self._regex or not text:
+            return hits
+        for m in self._regex.finditer(normalize(text)):
+            phrase = _SPACES.sub(" ", m.group(1))
+            for category in self._categories[phrase]:
+                hits.setdefault(category, []).append(phrase)
+        return hits
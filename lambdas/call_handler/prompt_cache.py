@@ -0,0 +1,74 @@
+# VaaniSeva – Bedrock prompt prefix caching
+# The agent system prompts are several kilobytes and identical turn after turn.
+# Bedrock Converse can cache a prompt prefix: everything before a
+# {"cachePoint": {"type": "default"}} block is processed once and re-read from
+# the cache on later calls (lower input cost, shorter time-to-first-token).
+#
+# system_blocks() lays a system prompt out as [static, cachePoint, dynamic] so
+# per-caller text (name, previous-call context, rolling memory) never breaks the
+# cached prefix. record_usage() publishes the usage block of a Converse response
+# — cache reads vs writes vs uncached input tokens — as CloudWatch metrics.
+#
+# Shared by the call handler and the web agent (bundled into its zip by
+# scripts/deploy.py).
+#
+# BEDROCK_PROMPT_CACHE: auto (cache point only for models known to support it),
+# on, off.
+
+import os
+import logging
+
+import metrics
+
+logger = logging.getLogger()
+
+CACHE_MODE = os.environ.get("BEDROCK_PROMPT_CACHE", "auto").lower()
+
+# Model id fragments with Converse prompt caching on Bedrock
+_CACHING_MODELS = (
+    "anthropic.claude-3-5-haiku", "anthropic.claude-3-7-sonnet", "anthropic.claude-sonnet-4",
+    "anthropic.claude-opus-4", "anthropic.claude-haiku-4", "amazon.nova-micro", "amazon.nova-lite",
+    "amazon.nova-pro", "amazon.nova-premier",
+)
+
+_CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+
+def supports_caching(model_id: str) -> bool:
+    if CACHE_MODE == "on":
+        return True
+    if CACHE_MODE != "auto":
+        return False
+    return any(fragment in (model_id or "") for fragment in _CACHING_MODELS)
+
+
+def system_blocks(static: str, dynamic: str = "", model_id: str = "") -> list:
+    """Converse `system` blocks: the static prefix, a cache point where supported, then the rest."""
+    blocks = [{"text": static}]
+    if supports_caching(model_id):
+        blocks.append(_CACHE_POINT)
+    if dynamic and dynamic.strip():
+        blocks.append({"text": dynamic})
+    return blocks
+
+
+def record_usage(usage: dict, source: str, model_id: str = "", first_token_ms: int | None = None) -> None:
+    """Publish token usage from a Converse response (or converse_stream metadata event)."""
+    if not usage:
+        return
+    cache_read  = int(usage.get("cacheReadInputTokens", 0) or 0)
+    cache_write = int(usage.get("cacheWriteInputTokens", 0) or 0)
+    uncached    = int(usage.get("inputTokens", 0) or 0)
+    values = {
+        "LlmInputTokens":      uncached,
+        "LlmCacheReadTokens":  cache_read,
+        "LlmCacheWriteTokens": cache_write,
+        "LlmOutputTokens":     int(usage.get("outputTokens", 0) or 0),
+    }
+    if first_token_ms is not None:
+        values["LlmFirstTokenMs"] = int(first_token_ms)
+    metrics.emit(values, {"Source": source})
+    total = uncached + cache_read + cache_write
+    if total:
+        logger.info(f"LLM usage [{source}] input={total} cached={cache_read} written={cache_write} "
+                    f"({cache_read * 100 // total}% from cache) model={model_id}")
@@ -0,0 +1,128 @@
+# VaaniSeva – Quantised knowledge vectors
+# A 1024-dim Titan vector is 4 KB as float32. The retrieval index keeps compact
+# codes in memory and scans those instead:
+#
+#   int8   — per-row symmetric scale (max |x| / 127): 1 KB per row, 4× smaller
+#   binary — sign bits packed 8 per byte: 128 B per row, 32× smaller
+#
+# A search narrows in stages: optional Hamming prefilter on the sign codes →
+# approximate int8 scores → exact float32 rescoring of the best RESCORE_CANDIDATES
+# rows. The float32 matrix stays memory-mapped from the snapshot file in /tmp, so
+# only the pages of rescored rows are ever read into memory.
+#
+# Codes are written next to the snapshot matrix as v{version}-{id}.q.npz
+# (knowledge_snapshot.py) and recomputed at load time for older snapshots.
+# Below VECTOR_QUANTIZATION_MIN_ROWS an exact float32 scan is faster than the
+# staged search (scripts/bench_quantization.py), so smaller indexes skip the codes.
+
+import io
+import os
+
+import numpy as np
+
+MODE                = os.environ.get("VECTOR_QUANTIZATION", "binary")   # none | int8 | binary
+RESCORE_CANDIDATES  = int(os.environ.get("VECTOR_RESCORE_CANDIDATES", "200"))
+BINARY_PREFILTER    = int(os.environ.get("VECTOR_BINARY_PREFILTER", "2000"))
+MIN_ROWS            = int(os.environ.get("VECTOR_QUANTIZATION_MIN_ROWS", "20000"))   # below this float32 wins
+_BLOCK              = 4096      # rows per int8 → float32 block (bounds the temporary)
+
+if hasattr(np, "bitwise_count"):          # NumPy ≥ 2.0
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(x):
+        return _POPCOUNT[x]
+
+
+def enabled(n_rows: int) -> bool:
+    """Whether an index of n_rows should carry and search quantised codes."""
+    return MODE != "none" and n_rows >= max(MIN_ROWS, 1)
+
+
+def quantize_int8(matrix: np.ndarray) -> tuple:
+    """(int8 codes, float32 per-row scales) with row ≈ codes * scale."""
+    codes = np.empty(matrix.shape, dtype=np.int8)
+    scales = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], _BLOCK):
+        block = np.asarray(matrix[start:start + _BLOCK], dtype=np.float32)
+        scale = np.abs(block).max(axis=1) / 127.0
+        scale[scale == 0] = 1.0
+        codes[start:start + _BLOCK] = np.clip(np.rint(block / scale[:, None]), -127, 127)
+        scales[start:start + _BLOCK] = scale
+    return codes, scales
+
+
+def pack_signs(matrix: np.ndarray) -> np.ndarray:
+    """uint8 sign codes, one bit per dimension."""
+    return np.packbits(np.asarray(matrix) > 0, axis=1)
+
+
+class QuantizedVectors:
+    """int8 (+ optional sign) codes for the rows of a unit-row float32 matrix."""
+
+    def __init__(self, codes: np.ndarray, scales: np.ndarray, signs: np.ndarray | None = None):
+        self.codes  = codes
+        self.scales = scales
+        self.signs  = signs
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, with_signs: bool = True) -> "QuantizedVectors":
+        codes, scales = quantize_int8(matrix)
+        return cls(codes, scales, pack_signs(matrix) if with_signs else None)
+
+    def __len__(self):
+        return len(self.scales)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scales.nbytes + (self.signs.nbytes if self.signs is not None else 0)
+
+    # ── Scoring stages ────────────────────────────────────────
+    def hamming(self, query: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """Hamming distance between the query's sign code and each row's."""
+        signs = self.signs if rows is None else self.signs[rows]
+        q = np.packbits(np.asarray(query) > 0)
+        return _popcount(np.bitwise_xor(signs, q)).sum(axis=1, dtype=np.int32)
+
+    def int8_scores(self, query: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """Approximate inner products from the int8 codes, block by block."""
+        n = len(self) if rows is None else len(rows)
+        out = np.empty(n, dtype=np.float32)
+        for start in range(0, n, _BLOCK):
+            idx = slice(start, start + _BLOCK) if rows is None else rows[start:start + _BLOCK]
+            out[start:start + _BLOCK] = (self.codes[idx].astype(np.float32) @ query) * self.scales[idx]
+        return out
+
+    def search(self, matrix: np.ndarray, query: np.ndarray, rows: np.ndarray | None = None,
+               mode: str = MODE, rescore: int = RESCORE_CANDIDATES,
+               prefilter: int = BINARY_PREFILTER) -> tuple:
+        """(row ids, exact float32 scores) of the best `rescore` rows among `rows` (all if None).
+
+        mode "binary" first keeps the `prefilter` rows nearest in Hamming distance.
+        """
+        n = len(self) if rows is None else len(rows)
+        if mode == "binary" and self.signs is not None and n > prefilter:
+            keep = np.argpartition(self.hamming(query, rows), prefilter - 1)[:prefilter]
+            rows, n = (keep if rows is None else rows[keep]), prefilter
+        if n > rescore:
+            keep = np.argpartition(-self.int8_scores(query, rows), rescore - 1)[:rescore]
+            rows = keep if rows is None else rows[keep]
+        if rows is None:
+            rows = np.arange(n)
+        rows = np.sort(rows)                        # sequential reads from the memmap
+        return rows, np.asarray(matrix[rows] @ query, dtype=np.float32)
+
+    # ── Serialisation ─────────────────────────────────────────
+    def to_bytes(self) -> bytes:
+        buf = io.BytesIO()
+        arrays = {"codes": self.codes, "scales": self.scales}
+        if self.signs is not None:
+            arrays["signs"] = self.signs
+        np.savez(buf, **arrays)
+        return buf.getvalue()
+
+    @classmethod
+    def from_file(cls, path_or_buffer) -> "QuantizedVectors":
+        with np.load(path_or_buffer, allow_pickle=False) as data:
+            return cls(data["codes"], data["scales"], data["signs"] if "signs" in data.files else None)
@@ -0,0 +1,175 @@
+# VaaniSeva – Static phrases spoken by the call handler
+# Every fixed sentence the IVR can say lives here so scripts/generate_welcome_audio.py
+# can enumerate and pre-render all of them (every language × every voice that speaks
+# it) at deploy time. The handler picks phrases from these tables exactly as before.
+
+LANGUAGES = ("hi", "mr", "ta", "en")
+VOICES    = ("arya", "vidya", "hitesh")
+
+# ── First-time phone caller (handle_incoming) ────────────────
+# (text, language, speaker) — played in order inside the language <Gather>
+WELCOME_MENU = [
+    ("नमस्ते! वाणीसेवा में आपका स्वागत है। हिंदी के लिए 1 दबाएं।", "hi", "arya"),
+    ("नमस्कार! मराठीसाठी 2 दाबा।", "mr", "arya"),
+    ("வணக்கம்! தமிழுக்கு 3 அழுத்தவும்।", "ta", "arya"),
+    ("Welcome! Press 4 for English.", "en", "vidya"),
+]
+WELCOME_NO_INPUT = ("कोई इनपुट नहीं मिला। कृपया दोबारा कॉल करें और 1, 2, 3 या 4 दबाएं।", "hi", "arya")
+
+# ── Browser call with a pre-selected voice ───────────────────
+BROWSER_GREETINGS = {
+    "hi": "नमस्ते! मैं वाणीसेवा हूँ, आपकी अपनी दीदी। बताइए, आज मैं आपकी किस बात में मदद करूँ?",
+    "mr": "नमस्कार! मी वाणीसेवा, तुमची ताई. बोला, आज मी तुम्हाला कशात मदत करू?",
+    "ta": "வணக்கம்! நான் வாணீசேவா, உங்கள் அக்கா. சொல்லுங்க, இன்று நான் எப்படி உதவ வேண்டும்?",
+    "en": "Hello! I'm VaaniSeva, your friendly helper. Tell me, how can I help you today?",
+}
+
+# ── Voice selected (language → voice → text) ─────────────────
+VOICE_CONFIRMATIONS = {
+    "hi":   {"arya": "ठीक है! आर्या की आवाज़ में बात करेंगे। बताइए आपका सवाल!",
+             "vidya": "ठीक है! विद्या की आवाज़ में बात करेंगे। बताइए आपका सवाल!",
+             "hitesh": "ठीक है! हितेश की आवाज़ में बात करेंगे। बताइए आपका सवाल!"},
+    "mr":   {"arya": "ठीक आहे! आर्याच्या आवाजात बोलू. बोला तुमचा प्रश्न!",
+             "vidya": "ठीक आहे! विद्याच्या आवाजात बोलू. बोला तुमचा प्रश्न!",
+             "hitesh": "ठीक आहे! हितेशच्या आवाजात बोलू. बोला तुमचा प्रश्न!"},
+    "ta":   {"arya": "சரி! ஆர்யா குரலில் பேசுவோம். கேளுங்கள்!",
+             "vidya": "சரி! வித்யா குரலில் பேசுவோம். கேளுங்கள்!",
+             "hitesh": "சரி! ஹிதேஷ் குரலில் பேசுவோம். கேளுங்கள்!"},
+    "en":   {"arya": "Got it! You'll hear Arya's voice. Go ahead, ask your question!",
+             "vidya": "Got it! You'll hear Vidya's voice. Go ahead, ask your question!",
+             "hitesh": "Got it! You'll hear Hitesh's voice. Go ahead, ask your question!"},
+}
+VOICE_CONFIRMATION_DEFAULT = "Let's go! Ask your question."
+
+# ── Goodbyes ─────────────────────────────────────────────────
+# Caller said bye (handle_gather goodbye detection)
+GOODBYES_CALLER = {
+    "hi": "अच्छा चलिए, ख्याल रखिए! फिर कभी कॉल कीजिए।",
+    "mr": "बरं चला, काळजी घ्या! पुन्हा कॉल करा.",
+    "ta": "சரி, கவனமா இருங்க! மீண்டும் அழையுங்க.",
+    "en": "Take care! Call again anytime.",
+}
+# After a fast-path answer, played if the listen <Gather> times out
+GOODBYES_SHORT = {
+    "hi": "अच्छा चलिए, ख्याल रखिए!",
+    "mr": "बरं चला, काळजी घ्या!",
+    "ta": "சரி, கவனமா இருங்க!",
+    "en": "Take care!",
+}
+# After a data-path answer (handle_poll)
+GOODBYES_POLL = {
+    "hi": "अच्छा चलिए, ख्याल रखिए! वाणीसेवा को कॉल करने के लिए शुक्रिया।",
+    "mr": "बरं चला, काळजी घ्या! वाणीसेवाला कॉल केल्याबद्दल धन्यवाद.",
+    "ta": "சரி, கவனமா இருங்க! வாணீசேவாவை அழைத்ததற்கு நன்றி.",
+    "en": "Alright, take care! Thanks for calling VaaniSeva.",
+}
+
+# ── Mid-call language switch ─────────────────────────────────
+SWITCH_CONFIRMS = {
+    "hi": "ठीक है, अब मैं हिंदी में बात करूँगी।",
+    "mr": "ठीक आहे, आता मी मराठीत बोलतो.",
+    "ta": "சரி, இனிமேல் தமிழில் பேசுகிறேன்.",
+    "en": "Sure, I'll speak in English now.",
+}
+
+# ── Agent transfer ───────────────────────────────────────────
+# Caller named another agent — gender of the CURRENT agent → language → template.
+# Templates are filled with the target agent's name / name_hi.
+TRANSFER_MSGS = {
+    "male": {
+        "hi": "ठीक है, मैं आपको {name_hi} से जोड़ रहा हूँ। एक सेकंड।",
+        "mr": "ठीक आहे, मी तुम्हाला {name} शी जोडतो. एक क्षण.",
+        "ta": "சரி, உங்களை {name} கிட்ட இணைக்கிறேன். ஒரு நிமிஷம்.",
+        "en": "Sure, let me connect you to {name}. One moment.",
+    },
+    "female": {
+        "hi": "ठीक है, मैं आपको {name_hi} से जोड़ रही हूँ। एक सेकंड।",
+        "mr": "ठीक आहे, मी तुम्हाला {name} शी जोडते. एक क्षण.",
+        "ta": "சரி, உங்களை {name} கிட்ட இணைக்கிறேன். ஒரு நிமிஷம்.",
+        "en": "Sure, let me connect you to {name}. One moment.",
+    },
+}
+# LLM emitted [SWITCH:name] — shorter hand-off, gender of the current agent → language → text
+QUICK_TRANSFER_MSGS = {
+    "male":   {"hi": "ठीक है, अभी जोड़ता हूँ।", "mr": "ठीक आहे, एक क्षण.",
+               "ta": "சரி, ஒரு நிமிஷம்.", "en": "Sure, one moment."},
+    "female": {"hi": "ठीक है, अभी जोड़ती हूँ।", "mr": "ठीक आहे, एक क्षण.",
+               "ta": "சரி, ஒரு நிமிஷம்.", "en": "Sure, one moment."},
+}
+
+# ── Errors / hold messages ───────────────────────────────────
+LLM_ERROR_MSGS = {
+    "hi": "माफ करें, कुछ समस्या आई। फिर से पूछिए।",
+    "mr": "क्षमस्व, पुन्हा विचारा.",
+    "ta": "மன்னிக்கவும், மீண்டும் கேளுங்கள்.",
+    "en": "Sorry, something went wrong. Please ask again.",
+}
+LLM_ERROR_DEFAULT = "Please try again."
+NO_DATA_MSGS = {
+    "hi": "माफ करें, अभी जानकारी नहीं मिली। कृपया फिर से पूछें।",
+    "mr": "क्षमस्व, माहिती मिळाली नाही. पुन्हा विचारा.",
+    "ta": "மன்னிக்கவும், தகவல் கிடைக்கவில்லை. மீண்டும் கேளுங்கள்.",
+    "en": "Sorry, I couldn't find that information. Please ask again.",
+}
+POLL_ERROR_MSGS = {
+    "hi": "माफ करें, अभी कुछ समस्या आ रही है। कृपया फिर से बोलें।",
+    "mr": "क्षमस्व, आत्ता काही अडचण आहे. कृपया पुन्हा सांगा.",
+    "ta": "மன்னிக்கவும், சிக்கல் ஏற்பட்டது. மீண்டும் பேசுங்கள்.",
+    "en": "I'm sorry, I had trouble with that. Please ask your question again.",
+}
+STILL_PROCESSING_MSGS = {
+    "hi": "बस थोड़ी देर और, लगभग हो गया।",
+    "mr": "आणखी थोडा वेळ, जवळजवळ झाले.",
+    "ta": "இன்னும் கொஞ்சம் நேரம், கிட்டத்தட்ட முடிந்தது.",
+    "en": "Almost there, just a few more seconds.",
+}
+FOLLOW_UPS = {
+    "hi": "और बताइए, कुछ और जानना है?",
+    "mr": "आणखी काही विचारायचं आहे का?",
+    "ta": "வேறு ஏதாவது கேட்க வேண்டுமா?",
+    "en": "Anything else you'd like to know?",
+}
+# ask_again() — spoken in the language's default speaker
+ASK_AGAIN_MSGS = {
+    "hi": "अरे, सुनाई नहीं दिया। एक बार फिर से बोलिए?",
+    "mr": "ऐकू आलं नाही. पुन्हा सांगा ना?",
+    "ta": "கேட்கவில்லை. மறுபடியும் சொல்லுங்க?",
+    "en": "Sorry, I didn't catch that. Could you say it again?",
+}
+
+
+def _all_prompts(agent_registry: dict):
+    yield from WELCOME_MENU
+    yield WELCOME_NO_INPUT
+    for language in LANGUAGES:
+        for agent in agent_registry.values():
+            yield agent.get(f"greeting_{language}", agent["greeting_hi"]), language, agent["sarvam_speaker"]
+        for voice in VOICES:
+            yield BROWSER_GREETINGS[language], language, voice
+            yield VOICE_CONFIRMATIONS[language][voice], language, voice
+            for table in (GOODBYES_CALLER, GOODBYES_SHORT, GOODBYES_POLL, SWITCH_CONFIRMS,
+                          LLM_ERROR_MSGS, NO_DATA_MSGS, POLL_ERROR_MSGS,
+                          STILL_PROCESSING_MSGS, FOLLOW_UPS):
+                yield table[language], language, voice
+        yield ASK_AGAIN_MSGS[language], language, ""
+
+        # Transfers: spoken in the current agent's voice, naming the target agent
+        for old in agent_registry.values():
+            gender = old.get("gender", "female")
+            yield QUICK_TRANSFER_MSGS[gender][language], language, old["sarvam_speaker"]
+            for target in agent_registry.values():
+                if target is not old:
+                    text = TRANSFER_MSGS[gender][language].format(name=target["name"], name_hi=target["name_hi"])
+                    yield text, language, old["sarvam_speaker"]
+
+
+def iter_static_prompts(agent_registry: dict):
+    """Yield every (text, language, speaker) the handler can speak without the LLM, without duplicates.
+
+    speaker "" means the language's default Sarvam speaker (what ask_again passes).
+    """
+    seen = set()
+    for entry in _all_prompts(agent_registry):
+        if entry[0] and entry not in seen:
+            seen.add(entry)
+            yield entry
@@ -0,0 +1,221 @@
+# VaaniSeva – Content-addressed TTS audio cache
+# Every synthesis is stored under a deterministic S3 key derived from
+# hash(provider, model, speaker, language, pace, text), so a phrase that any
+# container has already rendered costs one HEAD + a local presign instead of a
+# provider call plus an upload.
+#
+# Two layers:
+#   1. In-process LRU of presigned URLs (bounded, survives warm invocations)
+#   2. S3 objects under TTS_CACHE_PREFIX — the object metadata is the index
+#      (provider / model / speaker / language / pace / text excerpt)
+#
+# Static prompts are pre-rendered at deploy time (scripts/generate_welcome_audio.py)
+# and listed in a bundled manifest; keys in the manifest are known to exist, so
+# they are presigned locally with no HEAD and no provider call. The manifest
+# records the bucket it was rendered into and is ignored for any other bucket
+# (the prompts then go through the normal HEAD / synthesise path).
+#
+# With TTS_DELIVERY=lambda the handler skips the synchronous upload: fresh audio is
+# kept in a byte-bounded in-process LRU, uploaded in the background (put_async), and
+# served by GET /voice/audio/{key} via get_audio(), which falls back to S3.
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger()
+
+TTS_CACHE_PREFIX      = os.environ.get("TTS_CACHE_PREFIX", "tts-cache")
+TTS_CACHE_MAX_ENTRIES = int(os.environ.get("TTS_CACHE_MAX_ENTRIES", "512"))
+PRESIGN_EXPIRES       = 3600
+_URL_SAFETY_MARGIN    = 300   # stop handing out a cached URL 5 min before it expires
+TTS_AUDIO_MEM_BYTES   = int(os.environ.get("TTS_AUDIO_MEM_MB", "64")) * 1024 * 1024
+
+# Background S3 writes for put_async (durability only — never on the request path)
+_UPLOADER = ThreadPoolExecutor(max_workers=4)
+
+
+def make_key(provider: str, model: str, speaker: str, language: str, pace, text: str) -> str:
+    """Stable content hash for one synthesis request."""
+    raw = "\x1f".join([provider, model, speaker, language, str(pace), text.strip()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """LRU of presigned URLs in front of a content-addressed S3 prefix."""
+
+    def __init__(self, s3_client, bucket: str, prefix: str = TTS_CACHE_PREFIX,
+                 max_entries: int = TTS_CACHE_MAX_ENTRIES):
+        self.s3_client   = s3_client
+        self.bucket      = bucket
+        self.prefix      = prefix
+        self.max_entries = max_entries
+        self._urls       = OrderedDict()   # key → (url, expires_at)
+        self._known      = set()           # keys listed in the static audio manifest
+        self._audio      = OrderedDict()   # key → wav bytes (TTS_DELIVERY=lambda)
+        self._audio_size = 0
+        self._lock       = threading.Lock()
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}.wav"
+
+    # ── In-process LRU ────────────────────────────────────────
+    def _remember(self, key: str, url: str):
+        with self._lock:
+            self._urls[key] = (url, time.time() + PRESIGN_EXPIRES - _URL_SAFETY_MARGIN)
+            self._urls.move_to_end(key)
+            while len(self._urls) > self.max_entries:
+                self._urls.popitem(last=False)
+
+    def _recall(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._urls.get(key)
+            if not entry:
+                return None
+            url, expires_at = entry
+            if expires_at < time.time():
+                del self._urls[key]
+                return None
+            self._urls.move_to_end(key)
+            return url
+
+    def presign(self, key: str) -> str:
+        """Presign locally (no network) and remember the URL."""
+        url = self.s3_client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": self.object_key(key)},
+            ExpiresIn=PRESIGN_EXPIRES,
+        )
+        self._remember(key, url)
+        return url
+
+    # ── Static audio manifest ─────────────────────────────────
+    def load_manifest(self, path: str) -> int:
+        """Mark every key in a manifest written by write_manifest() as present. Returns the count."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logger.warning(f"Static audio manifest unreadable: {e}")
+            return 0
+        if manifest.get("prefix") != self.prefix:
+            logger.warning(f"Static audio manifest prefix {manifest.get('prefix')!r} != {self.prefix!r}, ignored")
+            return 0
+        if manifest.get("bucket") != self.bucket:
+            logger.warning(f"Static audio manifest bucket {manifest.get('bucket')!r} != {self.bucket!r}, ignored "
+                           f"— re-run scripts/generate_welcome_audio.py against this bucket")
+            return 0
+        keys = [e["key"] for e in manifest.get("entries", [])]
+        self._known.update(keys)
+        logger.info(f"Static audio manifest loaded: {len(keys)} prompts")
+        return len(keys)
+
+    # ── Public API ────────────────────────────────────────────
+    def get_url(self, key: str, lookup_store: bool = True) -> str | None:
+        """Cached URL for key, or None. lookup_store=False skips the S3 HEAD (one-off LLM answers)."""
+        url = self._recall(key)
+        if url:
+            return url
+        if key in self._known:
+            return self.presign(key)
+        if not lookup_store:
+            return None
+        try:
+            self.s3_client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except Exception:
+            return None
+        logger.info(f"TTS cache hit (s3): {key[:12]}")
+        return self.presign(key)
+
+    def put(self, key: str, audio_bytes: bytes, meta: dict) -> str:
+        """Store audio under its content key and return a presigned URL."""
+        self._upload(key, audio_bytes, meta)
+        return self.presign(key)
+
+    def _upload(self, key: str, audio_bytes: bytes, meta: dict):
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self.object_key(key),
+            Body=audio_bytes,
+            ContentType="audio/wav",
+            # S3 user metadata must be ASCII — non-ASCII values (Devanagari text) are dropped
+            Metadata={k: str(v) for k, v in meta.items() if str(v).isascii()},
+        )
+
+    # ── Direct delivery (TTS_DELIVERY=lambda) ─────────────────
+    def _keep_audio(self, key: str, audio_bytes: bytes):
+        with self._lock:
+            old = self._audio.pop(key, None)
+            if old is not None:
+                self._audio_size -= len(old)
+            self._audio[key] = audio_bytes
+            self._audio_size += len(audio_bytes)
+            while self._audio_size > TTS_AUDIO_MEM_BYTES and len(self._audio) > 1:
+                _, dropped = self._audio.popitem(last=False)
+                self._audio_size -= len(dropped)
+
+    def put_async(self, key: str, audio_bytes: bytes, meta: dict) -> None:
+        """Keep audio in memory for /voice/audio and write it to S3 in the background."""
+        self._keep_audio(key, audio_bytes)
+
+        def _write():
+            t0 = time.time()
+            try:
+                self._upload(key, audio_bytes, meta)
+                logger.info(f"TTS async upload {key[:12]} took {int((time.time() - t0) * 1000)} ms")
+            except Exception as e:
+                logger.warning(f"TTS async upload failed for {key[:12]}: {e}")
+        _UPLOADER.submit(_write)
+
+    def has_audio(self, key: str) -> bool:
+        """True if /voice/audio can serve key: held in memory, already known, or present in S3."""
+        with self._lock:
+            if key in self._audio:
+                return True
+        if self._recall(key) or key in self._known:
+            return True
+        try:
+            self.s3_client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+            return True
+        except Exception:
+            return False
+
+    def get_audio(self, key: str, wait: float = 2.0) -> tuple:
+        """(wav bytes, source) for key — source is "memory" or "s3"; (None, "miss") if absent.
+
+        A miss in S3 is retried for up to `wait` seconds, since the request may land on a
+        container other than the one whose background upload is still in flight.
+        """
+        with self._lock:
+            audio = self._audio.get(key)
+            if audio is not None:
+                self._audio.move_to_end(key)
+                return audio, "memory"
+        deadline = time.time() + wait
+        while True:
+            try:
+                obj = self.s3_client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+                audio = obj["Body"].read()
+                self._keep_audio(key, audio)
+                return audio, "s3"
+            except self.s3_client.exceptions.NoSuchKey:
+                if time.time() >= deadline:
+                    return None, "miss"
+                time.sleep(0.2)
+            except Exception as e:
+                logger.warning(f"TTS audio read failed for {key[:12]}: {e}")
+                return None, "miss"
+
+
+def write_manifest(path: str, entries: list, bucket: str, prefix: str = TTS_CACHE_PREFIX, **extra) -> None:
+    """Write the static audio manifest. entries: [{"key", "text", "language", "speaker"}, ...]."""
+    manifest = {"bucket": bucket, "prefix": prefix, "generated_at": int(time.time()), **extra,
+                "entries": sorted(entries, key=lambda e: (e["language"], e["speaker"], e["text"]))}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
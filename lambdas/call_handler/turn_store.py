@@ -0,0 +1,121 @@
+# VaaniSeva – Per-turn conversation storage
+# Turns live in their own table keyed (call_id, turn_no) instead of a list attribute
+# on the call record, so an append is one small put and the prompt builder reads
+# only the last N turns — cost per turn stays flat however long the call runs,
+# and a long call can no longer push its record toward the 400 KB item limit.
+#
+# turn_no comes from the call record's queries_count, incremented atomically
+# (ADD) in the same update_item that writes the rest of the turn's changes.
+#
+# Compat: records written before this table existed still carry their turns in
+# conversation_history (turn_no 1..len). Readers merge that list with the table
+# until scripts/migrate_turns.py has moved it over.
+
+import os
+import time
+import logging
+
+from boto3.dynamodb.conditions import Key
+
+logger = logging.getLogger()
+
+TURNS_TABLE_NAME = os.environ.get("DYNAMODB_TURNS_TABLE", "vaaniseva-turns")
+HISTORY_TURNS    = int(os.environ.get("CALL_HISTORY_TURNS", "10"))
+
+_BATCH_GET_KEYS  = 100    # BatchGetItem limit per request
+
+# Per-turn fields (everything else on a row is key/housekeeping)
+_TURN_FIELDS = ("query", "answer", "language", "ts")
+
+
+def _entry(row: dict) -> dict:
+    return {k: row[k] for k in _TURN_FIELDS if k in row}
+
+
+def _merge(legacy: list | None, rows: list) -> list:
+    """Combine legacy list turns (numbered 1..len) with table rows, ordered by turn_no."""
+    turns = {i + 1: _entry(t) for i, t in enumerate(legacy or [])}
+    for row in rows:
+        turns[int(row["turn_no"])] = _entry(row)
+    return [{**turns[n], "turn_no": n} for n in sorted(turns)]
+
+
+class TurnStore:
+    """Append and read conversation turns for a call."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def put(self, call_id: str, first_turn_no: int, entries: list, ttl: int | None = None) -> None:
+        """Write entries as turns first_turn_no, first_turn_no + 1, ..."""
+        rows = []
+        for i, entry in enumerate(entries):
+            row = {"call_id": call_id, "turn_no": first_turn_no + i, **_entry(entry)}
+            if ttl:
+                row["ttl"] = ttl
+            rows.append(row)
+        if len(rows) == 1:
+            self.table.put_item(Item=rows[0])
+        else:
+            with self.table.batch_writer() as batch:
+                for row in rows:
+                    batch.put_item(Item=row)
+
+    def recent(self, call_id: str, limit: int = HISTORY_TURNS, legacy: list | None = None) -> list:
+        """The last `limit` turns, oldest first."""
+        if not call_id:
+            return []
+        try:
+            resp = self.table.query(
+                KeyConditionExpression=Key("call_id").eq(call_id),
+                ScanIndexForward=False,
+                Limit=limit,
+            )
+            rows = resp.get("Items", [])
+        except Exception as e:
+            logger.warning(f"Turn read failed call={call_id}: {e}")
+            rows = []
+        return _merge(legacy, rows)[-limit:]
+
+    def first(self, call_id: str, limit: int, legacy: list | None = None) -> list:
+        """The first `limit` turns of a call (call history views)."""
+        if not call_id:
+            return []
+        rows = []
+        if len(legacy or []) < limit:
+            try:
+                rows = self.table.query(
+                    KeyConditionExpression=Key("call_id").eq(call_id),
+                    Limit=limit,
+                ).get("Items", [])
+            except Exception as e:
+                logger.warning(f"Turn read failed call={call_id}: {e}")
+        return _merge(legacy, rows)[:limit]
+
+    def first_many(self, calls: list, limit: int) -> dict:
+        """{call_id: first `limit` turns} for [(call_id, legacy list or None), ...].
+
+        Turn numbers start at 1, so the keys are known up front: one BatchGetItem
+        per 100 keys (turns that do not exist simply come back missing) instead of
+        a query per call.
+        """
+        keys = [{"call_id": call_id, "turn_no": n}
+                for call_id, legacy in calls if call_id and len(legacy or []) < limit
+                for n in range(len(legacy or []) + 1, limit + 1)]
+        rows = {}
+        client = self.table.meta.client   # resource client — takes plain Python values
+        for start in range(0, len(keys), _BATCH_GET_KEYS):
+            request = {self.table.name: {"Keys": keys[start:start + _BATCH_GET_KEYS]}}
+            for attempt in range(4):
+                try:
+                    resp = client.batch_get_item(RequestItems=request)
+                except Exception as e:
+                    logger.warning(f"Turn batch read failed: {e}")
+                    break
+                for row in resp.get("Responses", {}).get(self.table.name, []):
+                    rows.setdefault(row["call_id"], []).append(row)
+                request = resp.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+                time.sleep(0.05 * 2 ** attempt)
+        return {call_id: _merge(legacy, rows.get(call_id, []))[:limit] for call_id, legacy in calls if call_id}
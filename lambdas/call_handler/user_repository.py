@@ -0,0 +1,265 @@
+# VaaniSeva – Indexed user lookups for the call and auth paths
+# vaaniseva-users is keyed by user_id; callers are identified by phone and logins by
+# email. Both go through global secondary indexes (scripts/add_user_indexes.py):
+#   email-index  — hash key "email"
+#   phone-index  — hash key "phone"   (E.164, see normalize_phone)
+# so a lookup is one Query instead of a table scan.
+#
+# Caller-ID phone lookups are cached per warm container for USER_CACHE_TTL_SECONDS
+# (misses for a shorter time — most callers are not registered). Writes through
+# this module refresh the cache; other containers pick changes up at expiry.
+# Email lookups serve login and registration, so they always read the index: a
+# stale cached item would reject a changed password, a stale miss would let an
+# email register twice.
+#
+# Email uniqueness is enforced by create(): the user row is written in one
+# transaction with a guard row, user_id "email#{email}", that must not exist yet.
+#
+# If an index does not exist yet the lookup falls back to a full paginated scan
+# (never scan+Limit, which reads one arbitrary page and usually misses).
+
+import os
+import re
+import time
+import logging
+import threading
+
+from boto3.dynamodb.conditions import Key, Attr
+
+logger = logging.getLogger()
+
+EMAIL_INDEX = os.environ.get("USERS_EMAIL_INDEX", "email-index")
+PHONE_INDEX = os.environ.get("USERS_PHONE_INDEX", "phone-index")
+
+CACHE_TTL_SECONDS      = float(os.environ.get("USER_CACHE_TTL_SECONDS", "300"))
+MISS_CACHE_TTL_SECONDS = float(os.environ.get("USER_MISS_CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES      = 2048
+
+# Index key attributes cannot hold empty strings — these are dropped, not stored as ""
+INDEXED_FIELDS = ("email", "phone")
+CACHED_FIELDS  = ("phone",)
+EMAIL_GUARD_PREFIX = "email#"
+
+
+class EmailTaken(Exception):
+    """create() found another account with the same email."""
+
+
+def email_guard_id(email: str) -> str:
+    return EMAIL_GUARD_PREFIX + normalize_email(email)
+
+
+def normalize_phone(phone: str) -> str:
+    """E.164-ish form so Twilio's From (+91XXXXXXXXXX) matches what users type."""
+    phone = (phone or "").strip()
+    if not phone:
+        return ""
+    digits = re.sub(r"\D", "", phone)
+    if not digits:
+        return ""
+    if phone.startswith("+"):
+        return "+" + digits
+    if len(digits) == 10:
+        return "+91" + digits
+    if len(digits) == 11 and digits.startswith("0"):
+        return "+91" + digits[1:]
+    if len(digits) == 12 and digits.startswith("91"):
+        return "+" + digits
+    return "+" + digits
+
+
+def normalize_email(email: str) -> str:
+    return (email or "").strip().lower()
+
+
+class UserRepository:
+    """User reads/writes with indexed phone/email lookups and a warm-container phone cache."""
+
+    def __init__(self, table, email_index: str = EMAIL_INDEX, phone_index: str = PHONE_INDEX):
+        self.table       = table
+        self.indexes     = {"email": email_index, "phone": phone_index}
+        self._missing    = set()   # index names found not to exist (use the scan fallback)
+        self._cache      = {}      # ("phone", value) → (item or None, expires_at)
+        self._lock       = threading.Lock()
+
+    # ── Cache ────────────────────────────────────────────────
+    def _cached(self, field: str, value: str):
+        with self._lock:
+            entry = self._cache.get((field, value))
+        if entry and entry[1] > time.time():
+            return True, entry[0]
+        return False, None
+
+    def _remember(self, field: str, value: str, item):
+        ttl = CACHE_TTL_SECONDS if item else MISS_CACHE_TTL_SECONDS
+        with self._lock:
+            if len(self._cache) >= CACHE_MAX_ENTRIES:
+                now = time.time()
+                for k in [k for k, (_, exp) in self._cache.items() if exp <= now]:
+                    del self._cache[k]
+                if len(self._cache) >= CACHE_MAX_ENTRIES:
+                    self._cache.clear()
+            self._cache[(field, value)] = (item, time.time() + ttl)
+
+    def _forget(self, item: dict | None):
+        if not item:
+            return
+        with self._lock:
+            for field in CACHED_FIELDS:
+                if item.get(field):
+                    self._cache.pop((field, item[field]), None)
+
+    def _refresh(self, old: dict | None, new: dict | None):
+        self._forget(old)
+        if new:
+            for field in CACHED_FIELDS:
+                if new.get(field):
+                    self._remember(field, new[field], new)
+
+    # ── Lookups ──────────────────────────────────────────────
+    def get(self, user_id: str) -> dict | None:
+        """Primary-key read (not cached — it is already a single key lookup)."""
+        if not user_id:
+            return None
+        return self.table.get_item(Key={"user_id": user_id}).get("Item")
+
+    def _find_by(self, field: str, value: str) -> dict | None:
+        index = self.indexes[field]
+        if index not in self._missing:
+            try:
+                resp = self.table.query(
+                    IndexName=index,
+                    KeyConditionExpression=Key(field).eq(value),
+                    Limit=1,
+                )
+                items = resp.get("Items", [])
+                return items[0] if items else None
+            except Exception as e:
+                # Only a missing index (a ValidationException) is remembered; throttling
+                # and other transient errors propagate and the index is tried again next time
+                code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
+                if code != "ValidationException" or "index" not in str(e).lower():
+                    raise
+                logger.warning(f"Users index {index} unavailable ({e}) — falling back to scan. "
+                               f"Run scripts/add_user_indexes.py")
+                self._missing.add(index)
+        # Fallback: full paginated scan — follows LastEvaluatedKey so a match is never missed
+        kwargs = {"FilterExpression": Attr(field).eq(value)}
+        while True:
+            resp = self.table.scan(**kwargs)
+            items = resp.get("Items", [])
+            if items:
+                return items[0]
+            if "LastEvaluatedKey" not in resp:
+                return None
+            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    def _lookup(self, field: str, value: str) -> dict | None:
+        if not value:
+            return None
+        hit, item = self._cached(field, value)
+        if hit:
+            return item
+        item = self._find_by(field, value)
+        self._remember(field, value, item)
+        return item
+
+    def by_phone(self, phone: str) -> dict | None:
+        return self._lookup("phone", normalize_phone(phone))
+
+    def by_email(self, email: str) -> dict | None:
+        """Uncached — login and registration must see the current row."""
+        email = normalize_email(email)
+        return self._find_by("email", email) if email else None
+
+    # ── Writes ───────────────────────────────────────────────
+    def create(self, item: dict) -> dict:
+        """Put a new user (normalised phone/email, empty index keys dropped).
+
+        With an email, the user row and its email guard row are written in one
+        transaction that fails if either exists — raises EmailTaken.
+        """
+        item = dict(item)
+        item["email"] = normalize_email(item.get("email", ""))
+        item["phone"] = normalize_phone(item.get("phone", ""))
+        for field in INDEXED_FIELDS:
+            if not item.get(field):
+                item.pop(field, None)
+        if not item.get("email"):
+            self.table.put_item(Item=item, ConditionExpression="attribute_not_exists(user_id)")
+            self._refresh(None, item)
+            return item
+
+        client = self.table.meta.client   # resource client — takes plain Python values
+        guard = {"user_id": email_guard_id(item["email"]), "owner_id": item["user_id"],
+                 "created_at": item.get("created_at", int(time.time()))}
+        try:
+            client.transact_write_items(TransactItems=[
+                {"Put": {"TableName": self.table.name, "Item": guard,
+                         "ConditionExpression": "attribute_not_exists(user_id)"}},
+                {"Put": {"TableName": self.table.name, "Item": item,
+                         "ConditionExpression": "attribute_not_exists(user_id)"}},
+            ])
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = [r.get("Code") for r in e.response.get("CancellationReasons", [])]
+            if "ConditionalCheckFailed" in reasons:
+                raise EmailTaken(item["email"]) from e
+            raise
+        self._refresh(None, item)
+        return item
+
+    def claim_email(self, user: dict) -> bool:
+        """Write the email guard row for an existing user (backfill). False if it is already held."""
+        email = normalize_email(user.get("email", ""))
+        if not email:
+            return False
+        try:
+            self.table.put_item(
+                Item={"user_id": email_guard_id(email), "owner_id": user["user_id"],
+                      "created_at": int(user.get("created_at", 0) or time.time())},
+                ConditionExpression="attribute_not_exists(user_id)",
+            )
+            return True
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+
+    def update(self, user: dict, updates: dict) -> dict:
+        """SET the given fields (empty phone/email are REMOVEd). Returns the updated item.
+
+        Email changes do not move the guard row — the profile API never changes email.
+        """
+        updates = dict(updates)
+        if "phone" in updates:
+            updates["phone"] = normalize_phone(updates["phone"])
+        if "email" in updates:
+            updates["email"] = normalize_email(updates["email"])
+        removes = [f for f in INDEXED_FIELDS if f in updates and not updates[f]]
+        for f in removes:
+            del updates[f]
+
+        names, values, sets = {}, {}, []
+        for i, (k, v) in enumerate(updates.items()):
+            names[f"#f{i}"] = k
+            values[f":v{i}"] = v
+            sets.append(f"#f{i} = :v{i}")
+        for j, k in enumerate(removes):
+            names[f"#r{j}"] = k
+        expr = ""
+        if sets:
+            expr += "SET " + ", ".join(sets)
+        if removes:
+            expr += (" " if expr else "") + "REMOVE " + ", ".join(f"#r{j}" for j in range(len(removes)))
+        if not expr:
+            return user
+
+        kwargs = {
+            "Key": {"user_id": user["user_id"]},
+            "UpdateExpression": expr,
+            "ExpressionAttributeNames": names,
+            "ReturnValues": "ALL_NEW",
+        }
+        if values:
+            kwargs["ExpressionAttributeValues"] = values
+        updated = self.table.update_item(**kwargs).get("Attributes") or user
+        self._refresh(user, updated)
+        return updated
@@ -0,0 +1,408 @@
+# VaaniSeva – In-memory vector index for RAG retrieval
+# Loaded once per warm container from vaaniseva-vectors, held as a NumPy float32
+# matrix with L2-normalised rows so a query is one mat-vec product + argpartition.
+#
+# Invalidation: admin RAG create/update/delete bump a version stamp stored as a
+# meta row in the vectors table. Warm containers re-check the stamp at most once
+# every VECTOR_INDEX_CHECK_SECONDS and reload when it has moved.
+#
+# Loading prefers the S3 snapshot (knowledge_snapshot.py) when its version matches
+# the stamp; the paginated table scan is only the fallback. After an admin edit
+# the snapshot is rebuilt by an async job (VectorIndex.publish, started by the
+# handler) — until it lands, containers that reload use the table scan.
+#
+# The seed scripts store one row per language copy of an entry, so raw top-k
+# often returns the same FAQ in three languages. search_grouped() keeps the best
+# score per (scheme_id, section_id), merges the language copies into one item and
+# picks k distinct entries with maximal marginal relevance (MMR).
+#
+# Long FAQ entries are stored as passages (passages.py). Passage n of one
+# language is not necessarily passage n of another, so passages are never merged
+# across languages; instead a search for a language only considers passages in
+# that language, unless the entry has none in it.
+#
+# Large indexes also get an IVF ANN index (ann_index.py), built when the snapshot
+# is published and loaded with it; searches then score only the rows in the
+# ANN_NPROBE nearest lists instead of the whole matrix.
+#
+# Indexes of VECTOR_QUANTIZATION_MIN_ROWS rows or more are also held as int8
+# codes (quantize.py, VECTOR_QUANTIZATION): candidate rows are ranked on the codes
+# and only the best RESCORE_CANDIDATES are scored exactly against the
+# memory-mapped float32 matrix. The table-scan fallback holds the float32 matrix
+# in RAM anyway, so it never builds codes.
+
+import os
+import time
+import logging
+import threading
+
+import numpy as np
+
+import ann_index
+import embeddings
+import knowledge_snapshot
+import quantize
+
+logger = logging.getLogger()
+
+VERSION_ROW_ID        = "_meta#index_version"
+CHECK_INTERVAL_SECONDS = float(os.environ.get("VECTOR_INDEX_CHECK_SECONDS", "30"))
+MMR_LAMBDA            = float(os.environ.get("RAG_MMR_LAMBDA", "0.7"))   # 1.0 = pure relevance
+MMR_CANDIDATES        = 12     # distinct entries considered for MMR re-ranking
+
+# Row attributes kept alongside the matrix (everything except the embedding itself)
+_TEXT_FIELDS = ("text", "text_hi", "text_mr", "text_ta", "text_en")
+_META_FIELDS = ("embedding_id", "scheme_id", "section_id", "language", "title", "category",
+                "parent_id", "chunk_no", "chunk_count")
+
+
+def normalise_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of matrix with every row scaled to unit length."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def bump_version(table) -> int:
+    """Atomically increment the version stamp. Returns the new version (0 on failure)."""
+    try:
+        resp = table.update_item(
+            Key={"embedding_id": VERSION_ROW_ID},
+            UpdateExpression="ADD version :one SET updated_at = :ts",
+            ExpressionAttributeValues={":one": 1, ":ts": int(time.time())},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(resp.get("Attributes", {}).get("version", 0))
+    except Exception as e:
+        logger.warning(f"Vector index version bump failed: {e}")
+        return 0
+
+
+def read_version(table) -> int:
+    """Current version stamp from the meta row (0 if never bumped)."""
+    item = table.get_item(Key={"embedding_id": VERSION_ROW_ID}).get("Item")
+    return int(item.get("version", 0)) if item else 0
+
+
+def build_rows(rows: list) -> tuple:
+    """Turn raw vectors-table rows into (unit-row float32 matrix, metadata list)."""
+    rows = [r for r in rows if r.get("embedding")]
+    if not rows:
+        return np.zeros((0, 0), dtype=np.float32), []
+    matrix = normalise_rows(np.vstack([embeddings.decode(r["embedding"]) for r in rows]))
+    items = [{k: r[k] for k in _META_FIELDS + _TEXT_FIELDS if k in r} for r in rows]
+    return matrix, items
+
+
+def group_rows(items: list) -> tuple:
+    """Group index rows by entry: (row → group int32 array, merged item per group).
+
+    A merged item carries the metadata of its first row, every text_* field any
+    language copy has, and the list of languages it was indexed in. Passage rows
+    (chunk_count set) group per language and passage.
+    """
+    group_of, groups, merged = {}, np.zeros(len(items), dtype=np.int32), []
+    for i, item in enumerate(items):
+        if not item.get("scheme_id"):
+            key = item.get("embedding_id")
+        elif item.get("chunk_count"):
+            key = (item["scheme_id"], item.get("section_id"), item.get("language"), int(item.get("chunk_no") or 0))
+        else:
+            key = (item["scheme_id"], item.get("section_id"))
+        g = group_of.get(key)
+        if g is None:
+            g = group_of[key] = len(merged)
+            entry = {k: v for k, v in item.items() if k not in ("embedding_id", "language")}
+            entry["languages"] = []
+            merged.append(entry)
+        groups[i] = g
+        entry = merged[g]
+        if item.get("language"):
+            entry["languages"].append(item["language"])
+        for field in _TEXT_FIELDS:
+            if item.get(field) and not entry.get(field):
+                entry[field] = item[field]
+    return groups, merged
+
+
+def mmr_select(candidates: np.ndarray, relevance: np.ndarray, matrix: np.ndarray, k: int,
+               lam: float = MMR_LAMBDA) -> list:
+    """Pick k of the candidate rows, trading relevance against similarity to rows already picked."""
+    if not len(candidates):
+        return []
+    vecs = matrix[candidates]
+    sim = vecs @ vecs.T
+    picked = [0]                                  # candidates arrive sorted by relevance
+    max_sim = sim[0].copy()
+    while len(picked) < min(k, len(candidates)):
+        mmr = lam * relevance - (1.0 - lam) * max_sim
+        mmr[picked] = -np.inf
+        nxt = int(np.argmax(mmr))
+        picked.append(nxt)
+        np.maximum(max_sim, sim[nxt], out=max_sim)
+    return picked
+
+
+def build_ann(matrix: np.ndarray, centroids=None, train: bool = True):
+    """IVF index for matrix, or None when it is small enough for brute force.
+
+    centroids: re-use trained centroids (cheap re-assignment); otherwise train
+    only when `train` is set — k-means belongs in the offline seed scripts.
+    """
+    if matrix.ndim != 2 or matrix.shape[0] < ann_index.BUILD_MIN_ROWS:
+        return None
+    if centroids is not None and centroids.shape[1] == matrix.shape[1]:
+        return ann_index.IVFIndex.build(matrix, centroids=centroids)
+    if train:
+        t0 = time.time()
+        ann = ann_index.IVFIndex.build(matrix)
+        logger.info(f"ANN index trained: {ann.n_lists} lists over {ann.n_rows} rows in {time.time() - t0:.1f}s")
+        return ann
+    return None
+
+
+def publish_snapshot(table, s3_client, bucket: str, centroids=None, train_ann: bool = True,
+                     version: int | None = None) -> int:
+    """Scan the vectors table, bump the version stamp and write a matching S3 snapshot.
+
+    Run by the seed scripts (which train the ANN index) and by the snapshot job
+    after admin RAG edits (which re-uses the published centroids).
+    version: the stamp the edit already bumped to — published as is, and dropped
+    if a newer edit moves the stamp on while the snapshot is built (its own job
+    publishes instead). Returns the published version, 0 if dropped.
+    """
+    matrix, items = build_rows(scan_all(table))
+    ann = build_ann(matrix, centroids=centroids, train=train_ann)
+    quant = quantize.QuantizedVectors.build(matrix) if quantize.enabled(len(items)) else None
+    if version is None:
+        version = bump_version(table)
+    elif read_version(table) != version:
+        logger.info(f"Knowledge snapshot v{version} superseded by a newer edit — not publishing it")
+        return 0
+    knowledge_snapshot.write(s3_client, bucket, matrix, items, version, ann=ann, quant=quant)
+    return version
+
+
+def scan_all(table, **kwargs) -> list:
+    """Paginated DynamoDB scan — follows LastEvaluatedKey past the 1 MB page limit."""
+    items = []
+    resp = table.scan(**kwargs)
+    items.extend(resp.get("Items", []))
+    while "LastEvaluatedKey" in resp:
+        resp = table.scan(ExclusiveStartKey=resp["LastEvaluatedKey"], **kwargs)
+        items.extend(resp.get("Items", []))
+    return items
+
+
+class VectorIndex:
+    """Brute-force cosine index over the knowledge vectors, shared by all requests in a container."""
+
+    def __init__(self, table, s3_client=None, bucket: str = ""):
+        self.table      = table
+        self.s3_client  = s3_client
+        self.bucket     = bucket
+        self.matrix     = None   # (n, dim) float32, unit rows
+        self.items      = []     # row metadata, aligned with matrix rows
+        self.groups     = None   # row → entry id (int32), see group_rows()
+        self.entries    = []     # merged language copies, one per (scheme_id, section_id)
+        self.ann        = None   # ann_index.IVFIndex from the snapshot, if it has one
+        self.quant      = None   # quantize.QuantizedVectors (int8 / sign codes)
+        self._masks     = {}     # language → rows eligible for that language
+        self.version    = None
+        self._checked_at = 0.0
+        self._stamp     = None    # (version, read at) — see stamp()
+        self._lock      = threading.Lock()
+
+    # ── Version stamp ─────────────────────────────────────────
+    def read_version(self) -> int:
+        """Current version stamp from the meta row (0 if never bumped)."""
+        try:
+            return read_version(self.table)
+        except Exception as e:
+            logger.warning(f"Vector index version read failed: {e}")
+            return self.version or 0
+
+    def stamp(self) -> int:
+        """Version stamp without loading the index, re-read at most every CHECK_INTERVAL_SECONDS."""
+        cached = self._stamp
+        if cached and time.time() - cached[1] < CHECK_INTERVAL_SECONDS:
+            return cached[0]
+        version = self.read_version()
+        self._stamp = (version, time.time())
+        return version
+
+    def publish(self) -> int:
+        """Rebuild the S3 snapshot from the table at the current stamp (the job after admin edits).
+
+        The edit itself only bumps the stamp. Returns the published version, 0 if
+        nothing was published.
+        """
+        if not (self.s3_client and self.bucket):
+            return 0
+        try:
+            version = read_version(self.table)
+            # Keep the trained partition: from the loaded index, else the published snapshot
+            centroids = self.ann.centroids if self.ann is not None else \
+                knowledge_snapshot.read_centroids(self.s3_client, self.bucket)
+            t0 = time.time()
+            version = publish_snapshot(self.table, self.s3_client, self.bucket, centroids=centroids,
+                                       train_ann=False, version=version)
+            logger.info(f"Knowledge snapshot job took {int((time.time() - t0) * 1000)} ms")
+            return version
+        except Exception as e:
+            logger.warning(f"Knowledge snapshot publish failed: {e}")
+            return 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.matrix = None
+            self.items = []
+            self.groups = None
+            self.entries = []
+            self.ann = None
+            self.quant = None
+            self._masks = {}
+            self.version = None
+            self._checked_at = 0.0
+            self._stamp = None
+
+    # ── Loading ───────────────────────────────────────────────
+    def _load_from_snapshot(self, version: int) -> bool:
+        if not (self.s3_client and self.bucket):
+            return False
+        try:
+            snap = knowledge_snapshot.read(self.s3_client, self.bucket, expected_version=version)
+        except Exception as e:
+            logger.warning(f"Knowledge snapshot load failed: {e}")
+            return False
+        if snap is None:
+            return False
+        self.matrix, self.items, self.version, extras = snap
+        self.ann, self.quant = extras.get("ann"), extras.get("quant")
+        ann_note = f", ANN {self.ann.n_lists} lists" if self.ann is not None else ""
+        logger.info(f"Vector index loaded from snapshot: {len(self.items)} rows (version={version}{ann_note})")
+        return True
+
+    def _load_from_table(self, version: int) -> None:
+        self.matrix, self.items = build_rows(scan_all(self.table))
+        self.ann = None
+        self.quant = None
+        self.version = version
+        logger.info(f"Vector index loaded from table: {len(self.items)} rows (version={version})")
+
+    def ensure_loaded(self) -> None:
+        """Load on first use; afterwards re-check the version stamp at most every CHECK_INTERVAL_SECONDS."""
+        now = time.time()
+        if self.matrix is not None and now - self._checked_at < CHECK_INTERVAL_SECONDS:
+            return
+        with self._lock:
+            if self.matrix is not None and time.time() - self._checked_at < CHECK_INTERVAL_SECONDS:
+                return
+            version = self.read_version()
+            if self.matrix is None or version != self.version:
+                t0 = time.time()
+                if self._load_from_snapshot(version):
+                    if not quantize.enabled(len(self.items)):
+                        self.quant = None   # small index: the exact float32 scan is faster
+                    elif self.quant is None:
+                        # Older snapshots carry no codes — compute them over the memory-mapped matrix
+                        self.quant = quantize.QuantizedVectors.build(self.matrix)
+                else:
+                    self._load_from_table(version)
+                self.groups, self.entries = group_rows(self.items)
+                self._masks = {}
+                logger.info(f"Vector index load took {int((time.time() - t0) * 1000)} ms")
+            self._checked_at = time.time()
+
+    # ── Search ────────────────────────────────────────────────
+    def _score(self, query_embedding, n_probe: int = ann_index.NPROBE, language: str | None = None):
+        """(row ids or None for all rows, cosine scores) for a query; None if it has no direction.
+
+        With an ANN index only the rows in the n_probe nearest lists are scored.
+        language: only rows _language_mask allows are candidates, so the quantised
+        shortlist below is never spent on rows that would be filtered out later.
+        With quantised codes, candidates are ranked on the codes and only the best
+        RESCORE_CANDIDATES come back, with exact float32 scores.
+        """
+        q = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm == 0:
+            return None
+        q = q / norm
+        ann, quant, matrix, items = self.ann, self.quant, self.matrix, self.items
+        rows = None
+        if ann is not None and ann.n_rows == matrix.shape[0]:
+            rows = ann.candidates(q, n_probe)
+        if language:
+            mask = self._language_mask(items, language)
+            rows = np.flatnonzero(mask) if rows is None else rows[mask[rows]]
+        if quant is not None and len(quant) == matrix.shape[0] and quantize.enabled(matrix.shape[0]):
+            n = matrix.shape[0] if rows is None else len(rows)
+            if n > quantize.RESCORE_CANDIDATES:
+                return quant.search(matrix, q, rows)
+        if rows is not None:
+            return rows, np.asarray(matrix[rows] @ q)
+        return None, np.asarray(matrix @ q)
+
+    def search(self, query_embedding, k: int = 3) -> list:
+        """Return up to k (score, item) pairs, best first."""
+        self.ensure_loaded()
+        matrix, items = self.matrix, self.items
+        if matrix is None or not len(items):
+            return []
+        scored = self._score(query_embedding)
+        if scored is None:
+            return []
+        rows, scores = scored
+        if not len(scores):
+            return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), items[i if rows is None else rows[i]]) for i in top]
+
+    def _language_mask(self, items: list, language: str) -> np.ndarray:
+        """Rows a search in `language` may return: whole entries, passages in that
+        language, and passages of entries that have none in it."""
+        mask = self._masks.get(language)
+        if mask is not None and len(mask) == len(items):
+            return mask
+        has_language = {r.get("parent_id") for r in items if r.get("chunk_count") and r.get("language") == language}
+        mask = np.array([not r.get("chunk_count") or r.get("language") == language
+                         or r.get("parent_id") not in has_language for r in items], dtype=bool)
+        self._masks[language] = mask
+        return mask
+
+    def search_grouped(self, query_embedding, k: int = 3, candidates: int = MMR_CANDIDATES,
+                       lam: float = MMR_LAMBDA, language: str | None = None) -> list:
+        """Up to k (score, entry) pairs for k distinct entries (or passages).
+
+        Each entry scores as its best language copy; the shortlist of `candidates`
+        best entries is re-ranked with MMR so near-duplicate entries don't crowd out
+        the rest. Entries are merged items (see group_rows), best first by selection.
+        language: restrict passages to the caller's language (see _language_mask).
+        """
+        self.ensure_loaded()
+        matrix, groups, entries = self.matrix, self.groups, self.entries
+        if matrix is None or groups is None or not len(groups):
+            return []
+        scored = self._score(query_embedding, language=language)
+        if scored is None:
+            return []
+        rows, scores = scored
+        if rows is None:
+            rows = np.arange(len(scores))
+        if not len(rows):
+            return []
+
+        # Best row per entry: first occurrence of each group in score order
+        order = np.argsort(-scores, kind="stable")
+        _, first = np.unique(groups[rows[order]], return_index=True)
+        best = order[np.sort(first)][:max(candidates, k)]
+        best_rows = rows[best]
+        picked = mmr_select(best_rows, scores[best], matrix, k, lam)
+        return [(float(scores[best[i]]), entries[groups[best_rows[i]]]) for i in picked]
+
+    def __len__(self):
+        return len(self.items)
@@ -25,6 +25,29 @@ import logging
 import requests
 import boto3
 
+# Optional pooled HTTP client (bundled from lambdas/call_handler by deploy.py) — plain requests otherwise
+try:
+    import http_client
+    _HTTP_POOL_AVAILABLE = True
+except ImportError:
+    _HTTP_POOL_AVAILABLE = False
+
+# Optional shared language ID (bundled from lambdas/call_handler by deploy.py) — the
+# widget's selected language is used as-is otherwise
+try:
+    import lang_id
+    _LANG_ID_AVAILABLE = True
+except ImportError:
+    _LANG_ID_AVAILABLE = False
+
+# Optional Bedrock prompt caching + token metrics (bundled from lambdas/call_handler
+# by deploy.py) — the system prompt is sent as a single uncached block otherwise
+try:
+    import prompt_cache
+    _PROMPT_CACHE_AVAILABLE = True
+except ImportError:
+    _PROMPT_CACHE_AVAILABLE = False
+
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
@@ -38,6 +61,7 @@ BEDROCK_MODEL_ID = os.environ.get(
     os.environ.get("BEDROCK_MODEL_ID", "us.amazon.nova-lite-v1:0"),
 )
 SARVAM_API_KEY = os.environ.get("SARVAM_API_KEY", "")
+LANG_ID_MIN_CONFIDENCE = float(os.environ.get("LANG_ID_MIN_CONFIDENCE", "0.6"))
 
 # ── CORS Headers ─────────────────────────────────────────────
 CORS_HEADERS = {
@@ -179,23 +203,42 @@ def call_bedrock(message: str, history: list, language: str) -> str:
         "content": [{"text": message}],
     })
 
+    # VAANI_SYSTEM_PROMPT is identical on every request — cache it as a prefix
+    if _PROMPT_CACHE_AVAILABLE:
+        system = prompt_cache.system_blocks(VAANI_SYSTEM_PROMPT, model_id=BEDROCK_MODEL_ID)
+    else:
+        system = [{"text": VAANI_SYSTEM_PROMPT}]
+
     try:
         response = bedrock.converse(
             modelId=BEDROCK_MODEL_ID,
             messages=bedrock_messages,
-            system=[{"text": VAANI_SYSTEM_PROMPT}],
+            system=system,
             inferenceConfig={
                 "maxTokens": 400,
                 "temperature": 0.85,
                 "topP": 0.9,
             },
         )
+        if _PROMPT_CACHE_AVAILABLE:
+            prompt_cache.record_usage(response.get("usage", {}), "web_chat", BEDROCK_MODEL_ID)
         return response["output"]["message"]["content"][0]["text"]
     except Exception as e:
         logger.error(f"Bedrock error: {e}")
         raise
 
 
+# ══════════════════════════════════════════════════════════════
+#  HTTP: pooled sessions for Sarvam
+# ══════════════════════════════════════════════════════════════
+
+def _http_post(provider: str, url: str, timeout: float, **kwargs):
+    """POST through the pooled keep-alive session when available."""
+    if _HTTP_POOL_AVAILABLE:
+        return http_client.post(provider, url, timeout=timeout, **kwargs)
+    return requests.post(url, timeout=timeout, **kwargs)
+
+
 # ══════════════════════════════════════════════════════════════
 #  TTS: Sarvam AI Bulbul v2 — returns base64 WAV directly
 # ══════════════════════════════════════════════════════════════
@@ -226,11 +269,10 @@ def call_sarvam_tts(text: str, language: str) -> str | None:
             "model": "bulbul:v2",
             "pace": 1.1,  # slightly relaxed vs phone (1.25), better for web UX
         }
-        resp = requests.post(
-            "https://api.sarvam.ai/text-to-speech",
+        resp = _http_post(
+            "sarvam", "https://api.sarvam.ai/text-to-speech", timeout=10,
             json=payload,
             headers={"api-subscription-key": SARVAM_API_KEY},
-            timeout=10,
         )
         resp.raise_for_status()
         # Sarvam already returns base64 — pass through directly
@@ -254,12 +296,11 @@ def call_sarvam_stt(audio_base64: str, language: str = "hi-IN") -> str:
         audio_bytes = base64.b64decode(audio_base64)
         files = {"file": ("audio.webm", audio_bytes, "audio/webm")}
         data = {"language_code": language, "model": "saarika:v2"}
-        resp = requests.post(
-            "https://api.sarvam.ai/speech-to-text",
+        resp = _http_post(
+            "sarvam_stt", "https://api.sarvam.ai/speech-to-text", timeout=15,
             files=files,
             data=data,
             headers={"api-subscription-key": SARVAM_API_KEY},
-            timeout=15,
         )
         resp.raise_for_status()
         transcript = resp.json().get("transcript", "")
@@ -321,6 +362,10 @@ def handle_chat(event: dict) -> dict:
 
     history = body.get("history", [])
     language = body.get("language", "hi")  # default Hindi
+    # Vaani answers in the language the visitor actually writes in — voice the answer in it too
+    if _LANG_ID_AVAILABLE:
+        language = lang_id.detect(message, supported=LANG_CONFIG, default=language,
+                                  min_confidence=LANG_ID_MIN_CONFIDENCE)[0]
 
     logger.info(f"Web chat: lang={language}, msg_len={len(message)}, history_len={len(history)}")
 
@@ -57,6 +57,26 @@ except ImportError:
         "en": {"sarvam_code": "en-IN", "sarvam_speaker": "vidya"},
     }
 
+# Shared script-based language ID — without it the connection's language is kept
+try:
+    import lang_id
+    _LANG_ID_AVAILABLE = True
+except ImportError:
+    _LANG_ID_AVAILABLE = False
+
+LANG_ID_MIN_CONFIDENCE = float(os.environ.get("LANG_ID_MIN_CONFIDENCE", "0.6"))
+
+
+def detect_reply_language(text, language):
+    """Language the user actually spoke/typed, if it is a supported one and clear enough."""
+    if not _LANG_ID_AVAILABLE:
+        return language
+    detected = lang_id.detect(text, supported=LANG_CONFIG, default=language,
+                              min_confidence=LANG_ID_MIN_CONFIDENCE)[0]
+    if detected != language:
+        logger.info(f"Language auto-corrected: {language} → {detected}")
+    return detected
+
 
 def lambda_handler(event, context):
     """Main entry point for WebSocket API Gateway."""
@@ -249,6 +269,7 @@ def handle_end_of_speech(connection_id, callback_url):
         return {"statusCode": 200}
 
     logger.info(f"Whisper transcript: '{transcript}' lang={language}")
+    language = detect_reply_language(transcript, language)
 
     # Generate response via RAG pipeline
     answer = generate_response(transcript, language, session_id)
@@ -292,6 +313,7 @@ def handle_text_message(connection_id, body, callback_url):
         session_id = ""
 
     # Generate response
+    language = detect_reply_language(text, language)
     answer = generate_response(text, language, session_id)
 
     # Generate TTS audio
@@ -403,7 +425,12 @@ def generate_tts(text, language):
 
 def _local_sarvam_tts(text, language):
     """Local Sarvam TTS implementation (if handler.py import fails)."""
-    import requests as req
+    try:
+        import http_client
+        _post = lambda url, **kw: http_client.post("sarvam", url, **kw)
+    except ImportError:
+        import requests as req
+        _post = lambda url, **kw: req.post(url, timeout=8, **kw)
 
     sarvam_key = os.environ.get("SARVAM_API_KEY", "")
     if not sarvam_key:
@@ -418,11 +445,10 @@ def _local_sarvam_tts(text, language):
             "model": "bulbul:v2",
             "pace": 1.1,
         }
-        resp = req.post(
+        resp = _post(
             "https://api.sarvam.ai/text-to-speech",
             json=payload,
             headers={"api-subscription-key": sarvam_key},
-            timeout=8,
         )
         resp.raise_for_status()
         audio_bytes = base64.b64decode(resp.json()["audios"][0])
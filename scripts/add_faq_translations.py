@@ -740,6 +740,7 @@ def inject_faq_translations():
 
     with open(FILEPATH, "w", encoding="utf-8") as f:
         f.write(content)
+    print("Re-embed only the changed rows with: python scripts/seed_knowledge.py --sync")
 
 
 if __name__ == "__main__":
@@ -337,6 +337,7 @@ def main():
         f.write(content)
 
     print("\nDone! All scheme translations injected.")
+    print("Re-embed only the changed rows with: python scripts/seed_knowledge.py --sync")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+"""
+Add the email/phone lookup indexes to vaaniseva-users and backfill existing rows.
+
+The call handler identifies callers by phone and logs users in by email through
+these GSIs (lambdas/call_handler/user_repository.py). Until they exist it falls
+back to full-table scans.
+
+Backfill normalises phone numbers to E.164, drops empty email/phone attributes
+(an index key attribute cannot hold an empty string) and writes the email guard
+row that registration uses to keep emails unique (user_repository.create).
+
+Run: python scripts/add_user_indexes.py [--dry-run]
+"""
+import os
+import sys
+import time
+import argparse
+import boto3
+from dotenv import load_dotenv
+
+load_dotenv()
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambdas", "call_handler"))
+import user_repository
+
+REGION      = os.environ.get("AWS_REGION", "us-east-1")
+USERS_TABLE = os.environ.get("DYNAMODB_USERS_TABLE", "vaaniseva-users")
+
+client   = boto3.client("dynamodb", region_name=REGION,
+                        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+                        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"))
+dynamodb = boto3.resource("dynamodb", region_name=REGION,
+                          aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+                          aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"))
+table    = dynamodb.Table(USERS_TABLE)
+
+INDEXES = {
+    user_repository.EMAIL_INDEX: "email",
+    user_repository.PHONE_INDEX: "phone",
+}
+
+
+def backfill(dry_run: bool) -> None:
+    """Normalise phone/email on every row, REMOVE empty index attributes and claim emails."""
+    repo = user_repository.UserRepository(table)
+    changed, scanned, claimed, duplicates = 0, 0, 0, 0
+    kwargs = {}
+    while True:
+        resp = table.scan(**kwargs)
+        for item in resp.get("Items", []):
+            if item["user_id"].startswith(user_repository.EMAIL_GUARD_PREFIX):
+                continue
+            scanned += 1
+            updates = {}
+            if "phone" in item:
+                updates["phone"] = user_repository.normalize_phone(item["phone"])
+            if "email" in item:
+                updates["email"] = user_repository.normalize_email(item["email"])
+            # An empty value is passed on as "" — repo.update() REMOVEs it
+            updates = {k: v for k, v in updates.items() if not v or v != item.get(k)}
+            if updates:
+                changed += 1
+                print(f"  {item['user_id']}: {updates}")
+                if not dry_run:
+                    item = repo.update(item, updates)
+            if item.get("email") and not dry_run:
+                if repo.claim_email(item):
+                    claimed += 1
+                elif table.get_item(Key={"user_id": user_repository.email_guard_id(item["email"])}) \
+                        .get("Item", {}).get("owner_id") != item["user_id"]:
+                    duplicates += 1
+                    print(f"  ⚠ {item['user_id']}: email {item['email']} already belongs to another account")
+        if "LastEvaluatedKey" not in resp:
+            break
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    print(f"Backfill: {scanned} users scanned, {changed} {'would change' if dry_run else 'updated'}, "
+          f"{claimed} email guards written, {duplicates} duplicate emails")
+
+
+def create_indexes(dry_run: bool) -> None:
+    desc = client.describe_table(TableName=USERS_TABLE)["Table"]
+    existing = {g["IndexName"] for g in desc.get("GlobalSecondaryIndexes", [])}
+    provisioned = desc.get("BillingModeSummary", {}).get("BillingMode") != "PAY_PER_REQUEST" \
+        and desc.get("ProvisionedThroughput", {}).get("ReadCapacityUnits", 0) > 0
+
+    # DynamoDB allows one GSI creation per UpdateTable call — wait for each in turn
+    for index, attr in INDEXES.items():
+        if index in existing:
+            print(f"  {index}: already exists")
+            continue
+        print(f"  {index}: creating on '{attr}'")
+        if dry_run:
+            continue
+        create = {
+            "IndexName": index,
+            "KeySchema": [{"AttributeName": attr, "KeyType": "HASH"}],
+            "Projection": {"ProjectionType": "ALL"},
+        }
+        if provisioned:
+            create["ProvisionedThroughput"] = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+        client.update_table(
+            TableName=USERS_TABLE,
+            AttributeDefinitions=[{"AttributeName": attr, "AttributeType": "S"}],
+            GlobalSecondaryIndexUpdates=[{"Create": create}],
+        )
+        _wait_active(index)
+
+
+def _wait_active(index: str) -> None:
+    while True:
+        desc = client.describe_table(TableName=USERS_TABLE)["Table"]
+        status = next((g["IndexStatus"] for g in desc.get("GlobalSecondaryIndexes", [])
+                       if g["IndexName"] == index), "MISSING")
+        if status == "ACTIVE":
+            print(f"  {index}: ACTIVE")
+            return
+        print(f"  {index}: {status} — waiting...")
+        time.sleep(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add email/phone GSIs to the users table")
+    parser.add_argument("--dry-run", action="store_true", help="show changes without applying them")
+    args = parser.parse_args()
+
+    print("=" * 55)
+    print(f"VaaniSeva — user lookup indexes on {USERS_TABLE}")
+    print("=" * 55)
+    # Backfill first so every row is indexed under its normalised phone/email
+    backfill(args.dry_run)
+    create_indexes(args.dry_run)
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
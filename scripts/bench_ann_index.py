@@ -0,0 +1,93 @@
+"""
+Benchmark the IVF ANN index (lambdas/call_handler/ann_index.py) against exact
+brute-force cosine search.
+
+Builds a synthetic knowledge matrix shaped like Titan v2 embeddings: unit rows
+drawn around a few thousand "topic" centres, so neighbours cluster the way
+scheme / district / mandi variants do. Queries are perturbed copies of random
+rows. For each n_probe it prints recall@k against exact search, the share of
+rows scored, and p50/p95 query latency.
+
+Run: python scripts/bench_ann_index.py [--rows N] [--dim D] [--queries Q] [--k K]
+                                       [--probes 1,4,8,16,32] [--lists L]
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambdas", "call_handler"))
+
+import ann_index  # noqa: E402
+
+
+def synthetic_matrix(rows: int, dim: int, topics: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(topics, dim)).astype(np.float32)
+    matrix = centres[rng.integers(0, topics, rows)] + rng.normal(scale=0.7, size=(rows, dim)).astype(np.float32)
+    return ann_index._normalise(matrix)
+
+
+def queries_from(matrix: np.ndarray, n: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    picks = matrix[rng.integers(0, matrix.shape[0], n)]
+    return ann_index._normalise(picks + rng.normal(scale=0.02, size=picks.shape).astype(np.float32))
+
+
+def exact_top_k(matrix: np.ndarray, q: np.ndarray, k: int) -> np.ndarray:
+    scores = matrix @ q
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def percentiles(samples: list) -> tuple:
+    ms = np.asarray(samples) * 1000
+    return float(np.percentile(ms, 50)), float(np.percentile(ms, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IVF ANN vs exact search")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default √rows)")
+    parser.add_argument("--probes", default="1,4,8,16,32")
+    args = parser.parse_args()
+
+    print(f"Building {args.rows} × {args.dim} matrix ({args.topics} topics)...")
+    matrix = synthetic_matrix(args.rows, args.dim, args.topics)
+    queries = queries_from(matrix, args.queries)
+
+    t0 = time.perf_counter()
+    index = ann_index.IVFIndex.build(matrix, n_lists=args.lists)
+    print(f"IVF build: {index.n_lists} lists in {time.perf_counter() - t0:.1f}s, "
+          f"{len(index.to_bytes()) / 1e6:.1f} MB serialised")
+
+    exact, exact_times = [], []
+    for q in queries:
+        t = time.perf_counter()
+        exact.append(set(exact_top_k(matrix, q, args.k).tolist()))
+        exact_times.append(time.perf_counter() - t)
+    p50, p95 = percentiles(exact_times)
+    print(f"\n  {'search':<12}{'recall@' + str(args.k):>10}{'scored':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    print(f"  {'exact':<12}{1.0:>10.3f}{'100%':>9}{p50:>9.2f}{p95:>9.2f}")
+
+    for n_probe in (int(p) for p in args.probes.split(",")):
+        hits, scored, times = 0, 0, []
+        for q, truth in zip(queries, exact):
+            t = time.perf_counter()
+            _, rows = index.search(matrix, q, args.k, n_probe=n_probe)
+            times.append(time.perf_counter() - t)
+            hits += len(truth & set(rows.tolist()))
+            scored += len(index.candidates(q, n_probe))
+        p50, p95 = percentiles(times)
+        share = scored / (len(queries) * matrix.shape[0])
+        print(f"  {'ivf/' + str(n_probe):<12}{hits / (len(queries) * args.k):>10.3f}{share:>8.1%}{p50:>9.2f}{p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark the shared language ID (lambdas/call_handler/lang_id.py) against the
+character-loop detector the call handler used before it.
+
+Runs a labelled set of caller utterances: Hindi (Devanagari and romanised),
+Marathi, Tamil, English, and the web agent's Telugu, Kannada and Bengali. It
+prints accuracy per language for both detectors and the time per utterance.
+
+The old detector only knew Devanagari, Tamil and a romanised-Hindi word list, so
+it answers "en" for the other scripts.
+
+A second set checks short and ambiguous utterances against the caller's current
+language, the way the handlers call detect() (default=current language,
+min_confidence=LANG_ID_MIN_CONFIDENCE): text without evidence must keep it.
+
+Run: python scripts/bench_lang_id.py [--rounds N] [--errors]
+"""
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambdas", "call_handler"))
+
+import lang_id  # noqa: E402
+
+# ── Labelled utterances ──────────────────────────────────────
+LABELLED = [
+    # Hindi — Devanagari
+    ("hi", "मुझे पीएम किसान योजना के बारे में बताओ"),
+    ("hi", "मेरा राशन कार्ड कैसे बनेगा"),
+    ("hi", "आयुष्मान भारत में कितना पैसा मिलता है"),
+    ("hi", "हाँ ठीक है और बताइए"),
+    ("hi", "बच्चे को बुखार है क्या करूँ"),
+    ("hi", "मेरी फसल खराब हो गई मुआवजा चाहिए"),
+    ("hi", "पेंशन कब आएगी"),
+    ("hi", "विधवा पेंशन के लिए आवेदन कहाँ करें"),
+    # Hindi — romanised (Hinglish)
+    ("hi", "PM Kisan ka paisa kab aayega"),
+    ("hi", "mujhe ration card ke baare mein batao"),
+    ("hi", "kya main Ayushman card ke liye apply kar sakta hoon"),
+    ("hi", "haan theek hai aur batao"),
+    ("hi", "mera naam Ramesh hai aur main Bihar se hoon"),
+    ("hi", "scheme ka status kaise check kare"),
+    # Marathi
+    ("mr", "मला शेतकरी योजनेची माहिती हवी आहे"),
+    ("mr", "माझे रेशन कार्ड कसे बनवायचे"),
+    ("mr", "तुम्ही मला पीएम किसान बद्दल सांगा"),
+    ("mr", "आमच्या गावाचा रस्ता खराब आहे"),
+    ("mr", "होय, आणि पुढे काय करायचे"),
+    ("mr", "बाळासाठी कोणती योजना आहे"),
+    ("mr", "पैसे कधी मिळतील"),
+    ("mr", "मी शेतकरी आहे, मला कर्ज हवे"),
+    # Tamil
+    ("ta", "பிஎம் கிசான் திட்டம் பற்றி சொல்லுங்கள்"),
+    ("ta", "எனக்கு ரேஷன் கார்டு வேண்டும்"),
+    ("ta", "தமிழில் பேசுங்கள்"),
+    ("ta", "ஆம், சரி"),
+    ("ta", "ஓய்வூதியம் எப்போது வரும்"),
+    # English
+    ("en", "What is the PM Kisan scheme"),
+    ("en", "How do I apply for a ration card"),
+    ("en", "Tell me about Ayushman Bharat"),
+    ("en", "I am a farmer from Maharashtra"),
+    ("en", "Can you help me with my pension"),
+    ("en", "Where is the nearest hospital"),
+    # Web agent languages
+    ("te", "నాకు పీఎం కిసాన్ పథకం గురించి చెప్పండి"),
+    ("te", "రేషన్ కార్డు ఎలా పొందాలి"),
+    ("kn", "ನನಗೆ ಪಿಎಂ ಕಿಸಾನ್ ಯೋಜನೆ ಬಗ್ಗೆ ಹೇಳಿ"),
+    ("kn", "ಪಡಿತರ ಚೀಟಿ ಹೇಗೆ ಪಡೆಯುವುದು"),
+    ("bn", "আমাকে পিএম কিষাণ প্রকল্প সম্পর্কে বলুন"),
+    ("bn", "রেশন কার্ড কীভাবে পাব"),
+]
+
+# (expected, current language, text) — short or ambiguous utterances mid-call
+WITH_DEFAULT = [
+    ("hi", "hi", "PM Kisan yojana"),
+    ("en", "en", "PM Kisan yojana"),
+    ("ta", "ta", "PM Kisan yojana"),
+    ("mr", "mr", "ration card status"),
+    ("te", "te", "Aadhaar OTP"),
+    ("kn", "kn", "ok"),
+    ("mr", "mr", "पीएम किसान योजना"),
+    ("hi", "hi", "पीएम किसान योजना"),
+    ("hi", "en", "पीएम किसान योजना"),
+    ("mr", "mr", "राशन कार्ड"),
+    ("en", "ta", "How do I apply for a ration card"),
+    ("hi", "mr", "mujhe ration card ke baare mein batao"),
+    ("hi", "en", "haan theek hai"),
+    ("mr", "hi", "मला शेतकरी योजनेची माहिती हवी आहे"),
+    ("hi", "mr", "मुझे राशन कार्ड चाहिए"),
+]
+MIN_CONFIDENCE = 0.6   # LANG_ID_MIN_CONFIDENCE default in the handlers
+
+
+def legacy_detect(speech_text: str) -> str:
+    """The call handler's detector before lang_id.py, kept verbatim for comparison."""
+    if not speech_text or not speech_text.strip():
+        return "hi"
+    text  = speech_text.strip()
+    total = max(len(text), 1)
+    tamil = sum(1 for c in text if '\u0B80' <= c <= '\u0BFF')
+    deva  = sum(1 for c in text if '\u0900' <= c <= '\u097F')
+    if tamil / total > 0.15:
+        return "ta"
+    if deva / total > 0.15:
+        if any(w in text for w in ["आहे", "आहात", "आहेत", "नाही", "केला", "बोला", "सांगा",
+                                    "आम्ही", "तुम्ही", "आणि", "करा", "होय", "मला",
+                                    "तुम्हाला", "आपण", "करतो", "जाते", "आलो"]):
+            return "mr"
+        return "hi"
+    t = text.lower()
+    if any(f" {w} " in f" {t} " or t.startswith(w + " ") or t.endswith(" " + w)
+           for w in ["hai", "hain", "kya", "nahi", "aur", "mera", "mujhe", "karo",
+                     "bolo", "batao", "haan", "acha", "theek", "matlab", "yaar",
+                     "bhai", "kaise", "kyun", "kaun", "kab", "abhi"]):
+        return "hi"
+    return "en"
+
+
+def lang_id_detect(text: str) -> str:
+    return lang_id.detect(text)[0]
+
+
+DETECTORS = (("legacy", legacy_detect), ("lang_id", lang_id_detect))
+
+
+def accuracy(show_errors: bool) -> None:
+    langs = sorted({lang for lang, _ in LABELLED})
+    print(f"  {'lang':<6}" + "".join(f"{name:>10}" for name, _ in DETECTORS))
+    totals = defaultdict(int)
+    for lang in langs:
+        rows = [text for l, text in LABELLED if l == lang]
+        cells = []
+        for name, fn in DETECTORS:
+            correct = sum(1 for text in rows if fn(text) == lang)
+            totals[name] += correct
+            cells.append(f"{correct:>4}/{len(rows):<5}")
+        print(f"  {lang:<6}" + "".join(cells))
+    print(f"  {'all':<6}" + "".join(f"{totals[name]:>4}/{len(LABELLED):<5}" for name, _ in DETECTORS))
+
+    if show_errors:
+        for lang, text in LABELLED:
+            got, confidence = lang_id.detect(text)
+            if got != lang:
+                print(f"  ❌ {lang} → {got} ({confidence:.2f}): {text}")
+
+
+def with_default(show_errors: bool) -> None:
+    correct = 0
+    for expected, current, text in WITH_DEFAULT:
+        got, confidence = lang_id.detect(text, default=current, min_confidence=MIN_CONFIDENCE)
+        correct += got == expected
+        if show_errors and got != expected:
+            print(f"  ❌ {current} → {got} ({confidence:.2f}), expected {expected}: {text}")
+    print(f"  lang_id {correct}/{len(WITH_DEFAULT)}")
+
+
+def speed(rounds: int) -> None:
+    texts = [text for _, text in LABELLED]
+    for name, fn in DETECTORS:
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for text in texts:
+                fn(text)
+        per_call = (time.perf_counter() - t0) / (rounds * len(texts)) * 1e6
+        print(f"  {name:<8} {per_call:7.1f} µs/utterance")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark language identification")
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--errors", action="store_true", help="list lang_id misclassifications")
+    args = parser.parse_args()
+
+    print(f"Accuracy on {len(LABELLED)} labelled utterances:")
+    accuracy(args.errors)
+    print(f"\nShort / ambiguous utterances with the current language as default ({len(WITH_DEFAULT)}):")
+    with_default(args.errors)
+    print(f"\nSpeed ({args.rounds} rounds):")
+    speed(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Check and benchmark the intent phrase matcher (lambdas/call_handler/intent_phrases.py).
+
+Runs a table-driven corpus of caller utterances in Hindi, Marathi, Tamil and
+English (Devanagari, Tamil script and romanised) through intent_phrases.match and
+compares the categories found against the expected ones, then times the matcher
+against the per-list `any(kw in text)` substring scans it replaced.
+
+Each corpus row is (utterance, categories that must be present, categories that
+must NOT be present). The negatives are the substring false positives the old
+scans had: "ok" in "lok sabha", "asha" in "bhasha", "aria" in "malaria", "up" in
+"group".
+
+Run: python scripts/bench_phrase_matcher.py [--check] [--rounds N]
+  --check   corpus only, exit 1 on any mismatch (no timing)
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambdas", "call_handler"))
+
+import intent_phrases  # noqa: E402
+
+# ── Corpus ───────────────────────────────────────────────────
+CORPUS = [
+    # Hindi — Devanagari
+    ("फोन रखो अब",                         {"bye"},                          set()),
+    ("धन्यवाद, बहुत मदद मिली",                 {"bye"},                          set()),
+    ("हिंदी में बात करो",                     {"lang_switch", "lang:hi"},       set()),
+    ("आवाज़ बदलो",                           {"voice_change"},                 set()),
+    ("मेरी फसल खराब हो गई",                   {"agriculture"},                  {"health"}),
+    ("बच्चे को बुखार है, दवाई चाहिए",            {"health"},                       set()),
+    ("टमाटर का भाव क्या है बिहार में",           {"mandi", "commodity:Tomato", "state:Bihar", "live_data"}, set()),
+    ("हाँ ठीक है",                           {"rag_skip"},                     set()),
+    ("मेरा बेटा विद्यार्थी है छात्रवृत्ति चाहिए",      set(),                            {"agent:vidya"}),
+    # Hindi — romanised
+    ("bhasha badlo please",                 {"lang_switch"},                  {"health"}),
+    ("vidya se baat karao",                 {"agent:vidya", "switch"},        set()),
+    ("aloo ka rate kya hai UP mein",        {"mandi", "commodity:Potato", "state:Uttar Pradesh"}, set()),
+    ("lok sabha chunav ke baare mein batao", set(),                           {"rag_skip"}),
+    ("group insurance yojana kya hai",      set(),                            {"state:Uttar Pradesh"}),
+    ("kisanon ke liye yojana",              {"agriculture"},                  set()),
+    ("bimari ka ilaaj",                     {"health"},                       set()),
+    ("call kaat do",                        {"bye"},                          set()),
+    # Marathi
+    ("मराठी मध्ये बोला, भाषा बदला",             {"lang_switch", "lang:mr"},       set()),
+    ("शेतकऱ्यांसाठी खत योजना, किसान सन्मान",     {"agriculture"},                  set()),
+    ("कांद्याचा भाव काय आहे महाराष्ट्र मध्ये",      {"mandi", "state:Maharashtra"}, set()),
+    ("रुग्णालय आणि डॉक्टर",                    set(),                            {"agent:arya"}),
+    # Tamil
+    ("தமிழில் பேசுங்கள், भाषा बदलो",           {"lang:ta", "lang_switch"},       set()),
+    ("போதும், நன்றி",                        {"bye"},                          set()),
+    ("குரல் மாற்றுங்கள்",                      {"voice_change"},                 set()),
+    ("வித்யாவிடம் பேச வேண்டும்",                 {"agent:vidya"},                  set()),
+    # English
+    ("please hang up the call",             {"bye"},                          set()),
+    ("thanks bye",                          {"bye_word"},                     set()),
+    ("switch to english",                   {"lang_switch", "lang:en"},       set()),
+    ("what is the malaria treatment scheme", set(),                           {"agent:arya"}),
+    ("connect me to hitesh",                {"agent:hitesh", "switch"},       set()),
+    ("wheat prices in madhya pradesh",      {"mandi", "commodity:Wheat", "state:Madhya Pradesh", "live_data"}, set()),
+    ("ok",                                  {"rag_skip"},                     set()),
+    ("tell me about the weather today",     {"live_data"},                    {"mandi"}),
+]
+
+
+def check() -> int:
+    failures = 0
+    for text, expected, forbidden in CORPUS:
+        hits = set(intent_phrases.match(text))
+        missing = expected - hits
+        wrong = forbidden & hits
+        if missing or wrong:
+            failures += 1
+            print(f"  ❌ {text!r}\n       missing={sorted(missing)} unexpected={sorted(wrong)} got={sorted(hits)}")
+    print(f"Corpus: {len(CORPUS) - failures}/{len(CORPUS)} utterances OK")
+    return failures
+
+
+# ── Benchmark ────────────────────────────────────────────────
+def _substring_scan(text: str) -> set:
+    """The old hot-path shape: one lowercase copy, then any(kw in text) per list."""
+    text_lower = text.lower()
+    found = set()
+    for category, phrases in intent_phrases.CATEGORIES.items():
+        if any(p.rstrip("*").lower() in text_lower for p in phrases):
+            found.add(category)
+    return found
+
+
+def bench(rounds: int) -> None:
+    texts = [row[0] for row in CORPUS]
+    for name, fn in (("substring scans", _substring_scan),
+                     ("PhraseMatcher", intent_phrases.match)):
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for text in texts:
+                fn(text)
+        elapsed = time.perf_counter() - t0
+        per_call = elapsed / (rounds * len(texts)) * 1e6
+        print(f"  {name:<16} {per_call:7.1f} µs/utterance")
+
+    phrases = sum(len(p) for p in intent_phrases.CATEGORIES.values())
+    print(f"  ({len(intent_phrases.CATEGORIES)} categories, {phrases} phrases, "
+          f"{rounds} rounds × {len(texts)} utterances)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the intent phrase matcher")
+    parser.add_argument("--check", action="store_true", help="run the corpus only")
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    failures = check()
+    if not args.check:
+        bench(args.rounds)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark quantised knowledge vectors (lambdas/call_handler/quantize.py) against
+full-precision float32 search.
+
+Uses the same synthetic clustered matrix as bench_ann_index.py. For each scheme
+it prints recall@k against exact float32 search, in-memory bytes per row, and
+p50/p95 query latency:
+
+  float32          — exact brute force (the baseline)
+  int8             — ranking on int8 codes alone, no rescoring
+  int8+rescore     — int8 shortlist of --rescore rows, rescored in float32
+  binary+rescore   — Hamming prefilter to --prefilter rows, int8 shortlist,
+                     float32 rescoring
+
+Run: python scripts/bench_quantization.py [--rows N] [--dim D] [--queries Q] [--k K]
+                                          [--rescore R] [--prefilter P]
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambdas", "call_handler"))
+
+import quantize  # noqa: E402
+from bench_ann_index import synthetic_matrix, queries_from, exact_top_k, percentiles  # noqa: E402
+
+
+def top_k(scores: np.ndarray, rows: np.ndarray, k: int) -> set:
+    k = min(k, len(scores))
+    return set(rows[np.argpartition(-scores, k - 1)[:k]].tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark int8 / binary quantised search")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore", type=int, default=quantize.RESCORE_CANDIDATES)
+    parser.add_argument("--prefilter", type=int, default=quantize.BINARY_PREFILTER)
+    args = parser.parse_args()
+
+    print(f"Building {args.rows} × {args.dim} matrix ({args.topics} topics)...")
+    matrix = synthetic_matrix(args.rows, args.dim, args.topics)
+    queries = queries_from(matrix, args.queries)
+    t0 = time.perf_counter()
+    quant = quantize.QuantizedVectors.build(matrix)
+    print(f"Quantised in {time.perf_counter() - t0:.1f}s")
+
+    all_rows = np.arange(args.rows)
+    truth = [set(exact_top_k(matrix, q, args.k).tolist()) for q in queries]
+    schemes = [
+        ("float32", matrix.nbytes, lambda q: top_k(matrix @ q, all_rows, args.k)),
+        ("int8", quant.codes.nbytes + quant.scales.nbytes,
+         lambda q: top_k(quant.int8_scores(q), all_rows, args.k)),
+        ("int8+rescore", quant.codes.nbytes + quant.scales.nbytes,
+         lambda q: top_k(*reversed(quant.search(matrix, q, mode="int8", rescore=args.rescore)), args.k)),
+        ("binary+rescore", quant.nbytes,
+         lambda q: top_k(*reversed(quant.search(matrix, q, mode="binary", rescore=args.rescore,
+                                                prefilter=args.prefilter)), args.k)),
+    ]
+
+    print(f"\n  {'scheme':<16}{'recall@' + str(args.k):>10}{'B/row':>8}{'memory':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    for name, nbytes, fn in schemes:
+        hits, times = 0, []
+        for q, expected in zip(queries, truth):
+            t = time.perf_counter()
+            found = fn(q)
+            times.append(time.perf_counter() - t)
+            hits += len(expected & found)
+        p50, p95 = percentiles(times)
+        print(f"  {name:<16}{hits / (len(queries) * args.k):>10.3f}{nbytes / args.rows:>8.0f}"
+              f"{nbytes / 1e6:>8.0f}MB{p50:>9.2f}{p95:>9.2f}")
+    print("\n  Rescoring reads float32 rows from the memory-mapped snapshot, so only the in-memory codes count.")
+    print(f"  The index searches codes from {quantize.MIN_ROWS} rows (VECTOR_QUANTIZATION_MIN_ROWS).")
+
+
+if __name__ == "__main__":
+    main()
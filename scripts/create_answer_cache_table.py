@@ -0,0 +1,47 @@
+"""
+Create the semantic answer cache table (lambdas/call_handler/answer_cache.py).
+
+vaaniseva-answer-cache: bucket (hash, "{language}#{agent}#v{index version}") +
+entry_id (range), on-demand billing, TTL on "ttl". Safe to re-run.
+
+Run: python scripts/create_answer_cache_table.py
+"""
+import os
+import boto3
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REGION     = os.environ.get("AWS_REGION", "us-east-1")
+TABLE_NAME = os.environ.get("DYNAMODB_ANSWER_CACHE_TABLE", "vaaniseva-answer-cache")
+
+client = boto3.Session(region_name=REGION,
+                       aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+                       aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY")).client("dynamodb")
+
+
+def main():
+    if TABLE_NAME in client.list_tables()["TableNames"]:
+        print(f"  {TABLE_NAME}: exists")
+        return
+    print(f"  {TABLE_NAME}: creating")
+    client.create_table(
+        TableName=TABLE_NAME,
+        AttributeDefinitions=[
+            {"AttributeName": "bucket", "AttributeType": "S"},
+            {"AttributeName": "entry_id", "AttributeType": "S"},
+        ],
+        KeySchema=[
+            {"AttributeName": "bucket", "KeyType": "HASH"},
+            {"AttributeName": "entry_id", "KeyType": "RANGE"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    client.get_waiter("table_exists").wait(TableName=TABLE_NAME)
+    client.update_time_to_live(TableName=TABLE_NAME,
+                               TimeToLiveSpecification={"Enabled": True, "AttributeName": "ttl"})
+    print(f"  {TABLE_NAME}: ACTIVE")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ load_dotenv(override=True)
 
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 PORT = 5050
+TURNS_TABLE = os.environ.get("DYNAMODB_TURNS_TABLE", "vaaniseva-turns")
 
 
 def decimal_default(obj):
@@ -23,16 +24,33 @@ def decimal_default(obj):
     raise TypeError
 
 
-def fetch_data():
-    ddb = boto3.resource("dynamodb", region_name=AWS_REGION)
-    table = ddb.Table("vaaniseva-calls")
-
+def scan_all(table):
     items = []
     resp = table.scan()
     items += resp["Items"]
     while "LastEvaluatedKey" in resp:
         resp = table.scan(ExclusiveStartKey=resp["LastEvaluatedKey"])
         items += resp["Items"]
+    return items
+
+
+def fetch_turns(ddb):
+    """{call_id: {turn_no: turn}} from the per-turn table (empty if it doesn't exist yet)."""
+    by_call = {}
+    try:
+        rows = scan_all(ddb.Table(TURNS_TABLE))
+    except Exception as e:
+        print(f"  (turns table unavailable: {e})")
+        return by_call
+    for row in rows:
+        by_call.setdefault(str(row["call_id"]), {})[int(row["turn_no"])] = row
+    return by_call
+
+
+def fetch_data():
+    ddb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    items = scan_all(ddb.Table("vaaniseva-calls"))
+    turns_by_call = fetch_turns(ddb)
 
     # Filter out background job entries and empty sessions
     calls = []
@@ -45,7 +63,13 @@ def fetch_data():
             hist = json.loads(hist_raw) if isinstance(hist_raw, str) else hist_raw
         except Exception:
             hist = []
-        turns = len(hist) if isinstance(hist, list) else 0
+        if not isinstance(hist, list):
+            hist = []
+        # Legacy list turns are numbered 1..len; the turns table holds the rest
+        merged = {i + 1: t for i, t in enumerate(hist)}
+        merged.update(turns_by_call.get(cid, {}))
+        hist = [merged[n] for n in sorted(merged)]
+        turns = len(hist)
 
         ts = int(item.get("timestamp", 0))
         dt = datetime.datetime.fromtimestamp(ts) if ts else None
@@ -60,7 +84,7 @@ def fetch_data():
             "turns":      turns,
             "timestamp":  ts,
             "datetime":   dt.strftime("%d %b %Y, %H:%M:%S") if dt else "Unknown",
-            "history":    hist if isinstance(hist, list) else [],
+            "history":    hist,
             "voice":      str(item.get("voice_speaker", "")),
         })
 
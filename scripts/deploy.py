@@ -64,14 +64,15 @@ def package_lambda():
 
     # Install binary deps with Linux-compatible wheels (Lambda runs on Amazon Linux)
     # twilio has compiled C extensions so needs --platform + --only-binary
-    run(f"pip install twilio --platform manylinux2014_x86_64 --only-binary=:all: --python-version 311 -t {pkg_dir} -q")
+    run(f"pip install twilio numpy --platform manylinux2014_x86_64 --only-binary=:all: --python-version 311 -t {pkg_dir} -q")
     # Pure-Python packages don't have manylinux wheels — install normally
     run(f"pip install requests pyjwt aiohttp aiohttp-retry -t {pkg_dir} -q")
 
-    # Copy handler + connect_handler
-    shutil.copy("lambdas/call_handler/handler.py", f"{pkg_dir}/handler.py")
-    if os.path.exists("lambdas/call_handler/connect_handler.py"):
-        shutil.copy("lambdas/call_handler/connect_handler.py", f"{pkg_dir}/connect_handler.py")
+    # Copy handler + sibling modules (connect_handler, vector_index, ...) and the
+    # static audio manifest from scripts/generate_welcome_audio.py
+    for name in sorted(os.listdir("lambdas/call_handler")):
+        if name.endswith((".py", ".json")):
+            shutil.copy(f"lambdas/call_handler/{name}", f"{pkg_dir}/{name}")
 
     # Verify requests is present before zipping
     if not os.path.exists(os.path.join(pkg_dir, "requests")):
@@ -99,6 +100,8 @@ def deploy_lambda(zip_path, role_arn):
         "DYNAMODB_VECTORS_TABLE":   os.environ["DYNAMODB_VECTORS_TABLE"],
         "DYNAMODB_USERS_TABLE":          os.environ.get("DYNAMODB_USERS_TABLE", "vaaniseva-users"),
         "DYNAMODB_PHONE_PROFILES_TABLE": os.environ.get("DYNAMODB_PHONE_PROFILES_TABLE", "vaaniseva-phone-profiles"),
+        "DYNAMODB_TURNS_TABLE":          os.environ.get("DYNAMODB_TURNS_TABLE", "vaaniseva-turns"),
+        "DYNAMODB_ANSWER_CACHE_TABLE":   os.environ.get("DYNAMODB_ANSWER_CACHE_TABLE", "vaaniseva-answer-cache"),
         "S3_DOCUMENTS_BUCKET":      os.environ["S3_DOCUMENTS_BUCKET"],
         "BEDROCK_MODEL_ID":         os.environ["BEDROCK_MODEL_ID"],
         "BEDROCK_EMBEDDING_MODEL_ID": os.environ["BEDROCK_EMBEDDING_MODEL_ID"],
@@ -118,6 +121,7 @@ def deploy_lambda(zip_path, role_arn):
         "DATA_GOV_API_KEY":          os.environ.get("DATA_GOV_API_KEY", ""),
         "CARTESIA_API_KEY":          os.environ.get("CARTESIA_API_KEY", ""),
         "TTS_PROVIDER":              os.environ.get("TTS_PROVIDER", "cartesia"),
+        "TTS_DELIVERY":              os.environ.get("TTS_DELIVERY", "s3"),
         "LOG_LEVEL":                "INFO",
     }
 
@@ -278,6 +282,20 @@ def create_api_gateway(lambda_arn):
     add_post_method(poll_id,     "/voice/poll")
     add_options_method(poll_id,  "/voice/poll")
 
+    # /voice/audio/{key} — TTS audio served by the Lambda (TTS_DELIVERY=lambda)
+    audio_id     = get_or_create_resource(voice_id, "audio")
+    audio_key_id = get_or_create_resource(audio_id, "{key}")
+    add_get_method(audio_key_id, "/voice/audio/{key}")
+    try:
+        apigw_client.update_rest_api(restApiId=api_id, patchOperations=[
+            {"op": "add", "path": "/binaryMediaTypes/audio~1*"},
+            {"op": "add", "path": "/binaryMediaTypes/audio~1wav"},
+        ])
+    except apigw_client.exceptions.ConflictException:
+        pass
+    except Exception as e:
+        print(f"    ⚠ binaryMediaTypes not updated: {e}")
+
     voice_select_id = get_or_create_resource(voice_id, "voice-select")
     add_post_method(voice_select_id, "/voice/voice-select")
     add_options_method(voice_select_id, "/voice/voice-select")
@@ -378,6 +396,25 @@ def add_connect_permission(lambda_arn):
         print("  ✓ Connect permission already exists")
 
 
+def add_self_invoke_permission(lambda_arn):
+    """Let the call handler start its async jobs (snapshot rebuild, memory compaction) by invoking itself."""
+    print("Adding self-invoke permission to the Lambda role...")
+    try:
+        iam_client.put_role_policy(
+            RoleName="vaaniseva-lambda-role",
+            PolicyName="vaaniseva-call-handler-self-invoke",
+            PolicyDocument=json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [{"Effect": "Allow", "Action": "lambda:InvokeFunction", "Resource": lambda_arn}],
+            }),
+        )
+        print("  ✓ Self-invoke permission set")
+    except Exception as e:
+        print(f"  ✗ Could not update the role ({e})")
+        print(f"  Add lambda:InvokeFunction on {lambda_arn} to vaaniseva-lambda-role manually —")
+        print("  without it, admin RAG edits never rebuild the knowledge snapshot")
+
+
 WEB_AGENT_LAMBDA_NAME = "vaaniseva-web-agent"
 WEB_AGENT_API_NAME    = "vaaniseva-web-agent-api"
 
@@ -396,6 +433,11 @@ def package_web_agent_lambda():
     run(f"pip install requests -t {pkg_dir} -q")
 
     shutil.copy("lambdas/web_agent/handler.py", f"{pkg_dir}/handler.py")
+    # Shared pooled HTTP client, language ID and prompt caching (web agent works without them)
+    shutil.copy("lambdas/call_handler/http_client.py", f"{pkg_dir}/http_client.py")
+    shutil.copy("lambdas/call_handler/lang_id.py", f"{pkg_dir}/lang_id.py")
+    shutil.copy("lambdas/call_handler/prompt_cache.py", f"{pkg_dir}/prompt_cache.py")
+    shutil.copy("lambdas/call_handler/metrics.py", f"{pkg_dir}/metrics.py")
 
     if not os.path.exists(os.path.join(pkg_dir, "requests")):
         raise RuntimeError("pip install failed — 'requests' not found in web agent package dir.")
@@ -562,6 +604,7 @@ def main():
     if not web_only:
         zip_path   = package_lambda()
         lambda_arn = deploy_lambda(zip_path, role_arn)
+        add_self_invoke_permission(lambda_arn)
         base_url   = create_api_gateway(lambda_arn)
         update_twilio_webhook(base_url)
         add_connect_permission(lambda_arn)
@@ -1,105 +1,89 @@
-# VaaniSeva - Generate & Upload Welcome Audio
-# Generates separate TTS clips per language using Sarvam AI and uploads to S3.
-# The Lambda plays them sequentially inside <Gather> — no audio stitching needed.
+# VaaniSeva - Pre-render the static prompt audio bank
+# Renders every static phrase the call handler can speak (welcome menu, agent
+# greetings, transfers, switch confirmations, goodbyes, follow-ups, hold and
+# error messages) for every language × voice, in parallel, through the handler's
+# own TTS path — so the audio lands on the exact content-addressed keys
+# (tts-cache/<sha256>.wav) the Lambda looks up at runtime.
 #
-# Run: python scripts/generate_welcome_audio.py
+# Writes lambdas/call_handler/static_audio_manifest.json, which deploy.py bundles
+# and the handler loads at import: static prompts then never touch the TTS API.
+# The manifest records the bucket it was rendered into; a Lambda deployed with a
+# different S3_DOCUMENTS_BUCKET ignores it, so re-run this script per bucket.
+#
+# Run before deploying (same .env as deploy.py):
+#   python scripts/generate_welcome_audio.py [--workers 8] [--dry-run]
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambdas", "call_handler"))
 
-import os, base64, uuid, boto3, requests
 from dotenv import load_dotenv
+load_dotenv(override=True)
+# deploy.py ships TTS_PROVIDER=cartesia unless .env says otherwise — render with the same provider
+os.environ.setdefault("TTS_PROVIDER", "cartesia")
+
+import handler
+import static_prompts
+import tts_cache
+
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "..", "lambdas", "call_handler", "static_audio_manifest.json")
 
-load_dotenv()
-
-SARVAM_API_KEY = os.environ["SARVAM_API_KEY"]
-S3_BUCKET      = os.environ["S3_DOCUMENTS_BUCKET"]
-AWS_REGION     = os.environ["AWS_REGION"]
-
-s3 = boto3.client("s3", region_name=AWS_REGION)
-
-# ── Clips to generate ────────────────────────────────────────
-# key → (text, sarvam_lang_code, sarvam_speaker, s3_key)
-CLIPS = {
-    "welcome_intro": (
-        "नमस्कार! वाणीसेवा में आपका स्वागत है। "
-        "मैं आपकी दीदी हूँ — सरकारी योजनाएँ हों, खेती का सवाल हो, या कुछ भी जानना हो, बस बोलिए!",
-        "hi-IN", "anushka", "static-audio/welcome_intro.wav"
-    ),
-    "welcome_hi": (
-        "हिंदी के लिए एक दबाइए।",
-        "hi-IN", "anushka", "static-audio/welcome_hi.wav"
-    ),
-    "welcome_mr": (
-        "मराठीसाठी दोन दाबा.",
-        "mr-IN", "manisha", "static-audio/welcome_mr.wav"
-    ),
-    "welcome_ta": (
-        "தமிழுக்கு மூன்று அழுத்தவும்.",
-        "ta-IN", "vidya", "static-audio/welcome_ta.wav"
-    ),
-    "welcome_en": (
-        "Press four for English.",
-        "en-IN", "arya", "static-audio/welcome_en.wav"
-    ),
-    "no_input": (
-        "अरे, कुछ सुनाई नहीं दिया। कोई बात नहीं, दोबारा कॉल कर लीजिए! मैं यहीं हूँ।",
-        "hi-IN", "anushka", "static-audio/no_input.wav"
-    ),
-}
-
-
-def generate_and_upload(label, text, lang_code, speaker, s3_key):
-    print(f"\n[{label}] Generating TTS...")
-    print(f"  lang={lang_code}, speaker={speaker}")
-    print(f"  text: {text[:60]}...")
-
-    resp = requests.post(
-        "https://api.sarvam.ai/text-to-speech",
-        json={
-            "inputs": [text],
-            "target_language_code": lang_code,
-            "speaker": speaker,
-            "model": "bulbul:v2",
-            "pace": 0.95,  # slightly slower for welcome / readability
-        },
-        headers={"api-subscription-key": SARVAM_API_KEY},
-        timeout=15,
-    )
-    resp.raise_for_status()
-
-    audio_bytes = base64.b64decode(resp.json()["audios"][0])
-    s3.put_object(
-        Bucket=S3_BUCKET,
-        Key=s3_key,
-        Body=audio_bytes,
-        ContentType="audio/wav",
-    )
-    url = s3.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": S3_BUCKET, "Key": s3_key},
-        ExpiresIn=3600,
-    )
-    print(f"  ✅ Uploaded → s3://{S3_BUCKET}/{s3_key}")
-    return url
+
+def render(text, language, speaker):
+    rendered = handler.tts_render(text, language, speaker=speaker)
+    if not rendered:
+        raise RuntimeError("all TTS providers failed")
+    return rendered[0]
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Pre-render static prompt audio")
+    parser.add_argument("--workers", type=int, default=8, help="parallel TTS requests")
+    parser.add_argument("--dry-run", action="store_true", help="list prompts without rendering")
+    args = parser.parse_args()
+
+    prompts = list(static_prompts.iter_static_prompts(handler.AGENT_REGISTRY))
+
     print("=" * 55)
-    print("VaaniSeva — Welcome Audio Generator")
+    print("VaaniSeva — Static Prompt Audio Bank")
     print("=" * 55)
-    print(f"Bucket : {S3_BUCKET}")
-    print(f"Region : {AWS_REGION}")
+    print(f"Bucket   : {handler.S3_BUCKET}")
+    print(f"Prefix   : {handler.tts_cache.prefix}")
+    print(f"Provider : {handler.TTS_PROVIDER}")
+    print(f"Prompts  : {len(prompts)}")
+
+    if args.dry_run:
+        for text, language, speaker in prompts:
+            print(f"  [{language}/{speaker or 'default'}] {text}")
+        return
+
+    entries, failed = [], 0
+    t0 = time.time()
+    with ThreadPoolExecutor(max_workers=args.workers) as ex:
+        futures = {ex.submit(render, *p): p for p in prompts}
+        for i, fut in enumerate(as_completed(futures), 1):
+            text, language, speaker = futures[fut]
+            try:
+                key = fut.result()
+                entries.append({"key": key, "text": text, "language": language, "speaker": speaker})
+                print(f"  ✅ [{i}/{len(prompts)}] {language}/{speaker or 'default'}: {text[:40]}")
+            except Exception as e:
+                failed += 1
+                print(f"  ❌ [{i}/{len(prompts)}] {language}/{speaker or 'default'}: {e}")
 
-    for label, (text, lang, speaker, key) in CLIPS.items():
-        try:
-            generate_and_upload(label, text, lang, speaker, key)
-        except Exception as e:
-            print(f"  ❌ FAILED for {label}: {e}")
+    tts_cache.write_manifest(MANIFEST_PATH, entries, bucket=handler.tts_cache.bucket,
+                             prefix=handler.tts_cache.prefix, provider=handler.TTS_PROVIDER)
 
     print("\n" + "=" * 55)
-    print("Done! S3 keys created:")
-    for _, (_, _, _, key) in CLIPS.items():
-        print(f"  static-audio/{key.split('/')[-1]}")
-    print("\nThe Lambda will now play each clip sequentially in its")
-    print("native voice: Intro (Hindi) → 1 Hindi → 2 Marathi → 3 Tamil → 4 English")
+    print(f"Done in {time.time() - t0:.1f}s — {len(entries)} rendered, {failed} failed")
+    print(f"Manifest: {os.path.normpath(MANIFEST_PATH)}")
+    if failed:
+        print("Failed prompts fall back to runtime TTS; re-run to fill them in.")
+    print("Now run: python scripts/deploy.py")
     print("=" * 55)
 
 
@@ -0,0 +1,125 @@
+"""
+Move conversation history out of vaaniseva-calls into the per-turn table.
+
+Creates vaaniseva-turns (call_id + turn_no) if it doesn't exist, then for every
+call record that still carries a conversation_history list:
+  - writes each entry as turn 1..len
+  - sets queries_count to at least len (it is the turn counter from now on)
+  - REMOVEs conversation_history (only if the list hasn't changed meanwhile)
+
+Safe to re-run: turns are overwritten in place, migrated records are skipped.
+Until a record is migrated the call handler reads the list and the table together.
+
+Run: python scripts/migrate_turns.py [--dry-run] [--keep-legacy]
+"""
+import os
+import time
+import argparse
+import boto3
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REGION      = os.environ.get("AWS_REGION", "us-east-1")
+CALLS_TABLE = os.environ.get("DYNAMODB_CALLS_TABLE", "vaaniseva-calls")
+TURNS_TABLE = os.environ.get("DYNAMODB_TURNS_TABLE", "vaaniseva-turns")
+
+session  = boto3.Session(region_name=REGION,
+                         aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+                         aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"))
+client   = session.client("dynamodb")
+dynamodb = session.resource("dynamodb")
+
+TURN_FIELDS = ("query", "answer", "language", "ts")
+
+
+def ensure_turns_table(dry_run: bool) -> None:
+    if TURNS_TABLE in client.list_tables()["TableNames"]:
+        print(f"  {TURNS_TABLE}: exists")
+        return
+    print(f"  {TURNS_TABLE}: creating")
+    if dry_run:
+        return
+    client.create_table(
+        TableName=TURNS_TABLE,
+        AttributeDefinitions=[
+            {"AttributeName": "call_id", "AttributeType": "S"},
+            {"AttributeName": "turn_no", "AttributeType": "N"},
+        ],
+        KeySchema=[
+            {"AttributeName": "call_id", "KeyType": "HASH"},
+            {"AttributeName": "turn_no", "KeyType": "RANGE"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    client.get_waiter("table_exists").wait(TableName=TURNS_TABLE)
+    # Chat-session turns inherit the session's 24-hour ttl
+    client.update_time_to_live(TableName=TURNS_TABLE,
+                               TimeToLiveSpecification={"Enabled": True, "AttributeName": "ttl"})
+    print(f"  {TURNS_TABLE}: ACTIVE")
+
+
+def migrate(dry_run: bool, keep_legacy: bool) -> None:
+    calls = dynamodb.Table(CALLS_TABLE)
+    turns = dynamodb.Table(TURNS_TABLE)
+    scanned = migrated = turn_rows = 0
+    kwargs = {"FilterExpression": "attribute_exists(conversation_history)"}
+    t0 = time.time()
+    while True:
+        resp = calls.scan(**kwargs)
+        for item in resp.get("Items", []):
+            scanned += 1
+            call_id = str(item["call_id"])
+            history = item.get("conversation_history")
+            if call_id.startswith("job#") or not isinstance(history, list):
+                continue
+            migrated += 1
+            turn_rows += len(history)
+            print(f"  {call_id}: {len(history)} turns")
+            if dry_run:
+                continue
+
+            with turns.batch_writer(overwrite_by_pkeys=["call_id", "turn_no"]) as batch:
+                for n, entry in enumerate(history, start=1):
+                    row = {"call_id": call_id, "turn_no": n}
+                    row.update({k: entry[k] for k in TURN_FIELDS if k in entry})
+                    if item.get("ttl"):
+                        row["ttl"] = item["ttl"]
+                    batch.put_item(Item=row)
+
+            count = max(int(item.get("queries_count", 0)), len(history))
+            update = "SET queries_count = :c" + ("" if keep_legacy else " REMOVE conversation_history")
+            try:
+                calls.update_item(
+                    Key={"call_id": item["call_id"], "timestamp": item["timestamp"]},
+                    UpdateExpression=update,
+                    ConditionExpression="size(conversation_history) = :len",
+                    ExpressionAttributeValues={":c": count, ":len": len(history)},
+                )
+            except client.exceptions.ConditionalCheckFailedException:
+                print(f"    ⚠️ {call_id} changed during migration — re-run to pick it up")
+        if "LastEvaluatedKey" not in resp:
+            break
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    verb = "would migrate" if dry_run else "migrated"
+    print(f"Scanned {scanned} records, {verb} {migrated} calls ({turn_rows} turns) "
+          f"in {time.time() - t0:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate conversation history to the turns table")
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    parser.add_argument("--keep-legacy", action="store_true",
+                        help="copy turns but leave conversation_history on the call records")
+    args = parser.parse_args()
+
+    print("=" * 55)
+    print(f"VaaniSeva — {CALLS_TABLE}.conversation_history → {TURNS_TABLE}")
+    print("=" * 55)
+    ensure_turns_table(args.dry_run)
+    migrate(args.dry_run, args.keep_legacy)
+
+
+if __name__ == "__main__":
+    main()
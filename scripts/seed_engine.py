@@ -0,0 +1,340 @@
+"""
+Seeding engine shared by seed_knowledge.py and seed_task1c.py.
+
+Writes knowledge items and their per-language vector rows in chunks:
+  1. knowledge items → DynamoDB batch_writer (25-item BatchWriteItem, unprocessed
+     items retried by boto3)
+  2. texts → EmbeddingService.embed_many (bounded worker pool, S3 embedding cache,
+     throttle back-off) behind a token-bucket RateLimiter
+  3. vector rows → batch_writer, float32 Binary embeddings
+  4. checkpoint → a local JSON file, rewritten atomically after every chunk
+
+The checkpoint maps each knowledge key and embedding_id to a hash of what was
+written, so a rerun after a crash or a throttling storm skips everything already
+stored and picks up where it stopped — and an edited entry is re-seeded because
+its hash no longer matches. Rows whose embedding failed are left out of the
+checkpoint and retried on the next run.
+
+Sync mode (--sync) diffs against the tables instead of the local checkpoint:
+every knowledge item and vector row carries a content_hash attribute, so only
+rows whose (scheme_id, section_id, language) text or metadata changed are
+re-embedded, rows whose source entry disappeared are deleted, and --dry-run
+prints the diff without writing. Use it after editing seed_knowledge.py or
+running add_translations.py / add_faq_translations.py.
+
+Progress lines show rows done, throughput and ETA.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+
+import embeddings
+import passages
+
+LANGUAGES      = ["en", "hi", "mr", "ta"]
+CHUNK_ITEMS    = int(os.environ.get("SEED_CHUNK_ITEMS", "25"))
+RATE_PER_SEC   = float(os.environ.get("SEED_EMBED_RATE", "10"))    # Titan calls per second
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".seed_checkpoints")
+
+
+# ── Rate limiting ─────────────────────────────────────────────
+class RateLimiter:
+    """Thread-safe token bucket: acquire() blocks until a call may go out."""
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate   = max(rate, 0.001)
+        self.burst  = burst or max(1, int(rate))
+        self.tokens = float(self.burst)
+        self.last   = time.monotonic()
+        self._lock  = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1          # reserve a slot even if it is in the future
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+# ── Checkpoint ────────────────────────────────────────────────
+def content_hash(obj) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """{"knowledge": {key: hash}, "vectors": {embedding_id: hash}} persisted to a local file."""
+
+    def __init__(self, path: str, fresh: bool = False):
+        self.path = path
+        self.data = {"knowledge": {}, "vectors": {}}
+        if not fresh and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.data.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"  ⚠ Ignoring unreadable checkpoint {path}: {e}")
+
+    def done(self, kind: str, key: str, digest: str) -> bool:
+        return self.data[kind].get(key) == digest
+
+    def mark(self, kind: str, key: str, digest: str):
+        self.data[kind][key] = digest
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f)
+        os.replace(tmp, self.path)
+
+
+# ── Progress ──────────────────────────────────────────────────
+class Progress:
+    def __init__(self, total: int):
+        self.total = total
+        self.done  = 0
+        self.t0    = time.time()
+
+    def advance(self, n: int, note: str = ""):
+        self.done += n
+        elapsed = max(time.time() - self.t0, 1e-6)
+        rate = self.done / elapsed
+        eta = (self.total - self.done) / rate if rate else 0
+        print(f"    {self.done}/{self.total} rows  {rate:5.1f} rows/s  "
+              f"ETA {int(eta // 60)}m{int(eta % 60):02d}s  {note}".rstrip(), flush=True)
+
+
+# ── Engine ────────────────────────────────────────────────────
+def vector_rows(item: dict, languages=LANGUAGES) -> list:
+    """Vector rows (without the embedding) for every language the item has text for.
+
+    Short texts get one row, "{scheme}#{section}#{lang}". Long FAQ texts are split
+    by passages.split_passages() into "{scheme}#{section}#{lang}#p{n}" rows that
+    carry parent_id, chunk_no and chunk_count.
+    """
+    sid = item["scheme_id"]
+    sec = item.get("section_id", "overview")
+    rows = []
+    for lang in languages:
+        chunks = passages.split_passages(item.get(f"text_{lang}", ""))
+        for n, text in enumerate(chunks):
+            row = {
+                "embedding_id": f"{sid}#{sec}#{lang}",
+                "scheme_id": sid,
+                "section_id": sec,
+                "language": lang,
+                "text": text,
+                f"text_{lang}": text,
+                "category": item.get("category", "general"),
+            }
+            if len(chunks) > 1:
+                row.update({"embedding_id": f"{sid}#{sec}#{lang}#p{n}", "parent_id": f"{sid}#{sec}",
+                            "chunk_no": n, "chunk_count": len(chunks)})
+            rows.append(row)
+    return rows
+
+
+class SeedEngine:
+    def __init__(self, knowledge_table, vectors_table, embedder, checkpoint_path: str | None = None,
+                 workers: int = embeddings.BATCH_WORKERS, rate: float = RATE_PER_SEC,
+                 chunk_items: int = CHUNK_ITEMS, fresh: bool = False):
+        self.knowledge_table = knowledge_table
+        self.vectors_table   = vectors_table
+        self.embedder        = embedder
+        self.workers         = workers
+        self.chunk_items     = max(1, chunk_items)
+        if rate > 0:
+            embedder.rate_limiter = RateLimiter(rate, burst=workers)
+        path = checkpoint_path or os.path.join(CHECKPOINT_DIR, f"{vectors_table.name}.json")
+        self.checkpoint = Checkpoint(path, fresh=fresh)
+
+    def _vector_digest(self, row: dict) -> str:
+        return content_hash([self.embedder.model_id, row])
+
+    def seed(self, items: list) -> dict:
+        """Write items and their vectors, skipping what the checkpoint says is done.
+
+        Returns counts: knowledge, vectors, skipped, failed.
+        """
+        pending = []
+        skipped = 0
+        for item in items:
+            key = item_key(item)
+            digest = content_hash(item)
+            rows = [r for r in vector_rows(item)
+                    if not self.checkpoint.done("vectors", r["embedding_id"], self._vector_digest(r))]
+            write_item = not self.checkpoint.done("knowledge", key, digest)
+            if not write_item and not rows:
+                skipped += 1
+                continue
+            pending.append((key, digest, item if write_item else None, rows))
+
+        total_rows = sum(len(rows) for _, _, _, rows in pending)
+        print(f"  {len(pending)} items to write ({skipped} already seeded), {total_rows} vectors to embed "
+              f"— {self.workers} workers, checkpoint {self.checkpoint.path}")
+        return self._write(pending, skipped)
+
+    # ── Diff sync ─────────────────────────────────────────────
+    def _scan(self, table, attributes: list) -> list:
+        names = {f"#a{i}": a for i, a in enumerate(attributes)}
+        kwargs = {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+        items = []
+        while True:
+            resp = table.scan(**kwargs)
+            items.extend(resp.get("Items", []))
+            if "LastEvaluatedKey" not in resp:
+                return items
+            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    def plan(self, items: list, scheme_ids=None) -> dict:
+        """Diff items against the tables by content hash.
+
+        scheme_ids: limit orphan detection to these schemes (a partial seed such as
+        Task 1C); None treats items as the whole seeded corpus. Only seed-managed
+        rows (one per language in LANGUAGES) can be orphans — admin-portal entries
+        use language "all" and are never touched.
+        """
+        remote_vectors = {r["embedding_id"]: r for r in
+                          self._scan(self.vectors_table, ["embedding_id", "scheme_id", "section_id", "language", "content_hash"])}
+        remote_items = {item_key(r): r.get("content_hash") for r in
+                        self._scan(self.knowledge_table, ["scheme_id", "section_id", "content_hash"])}
+
+        pending, new, changed, unchanged = [], [], [], 0
+        wanted_vectors, wanted_items = set(), set()
+        for item in items:
+            key = item_key(item)
+            digest = content_hash(item)
+            wanted_items.add(key)
+            rows = []
+            for row in vector_rows(item):
+                wanted_vectors.add(row["embedding_id"])
+                remote = remote_vectors.get(row["embedding_id"])
+                if remote is None:
+                    new.append(row["embedding_id"])
+                elif remote.get("content_hash") != self._vector_digest(row):
+                    changed.append(row["embedding_id"])
+                else:
+                    unchanged += 1
+                    continue
+                rows.append(row)
+            write_item = remote_items.get(key) != digest
+            if write_item or rows:
+                pending.append((key, digest, item if write_item else None, rows))
+
+        def _in_scope(scheme_id):
+            return scheme_ids is None or scheme_id in scheme_ids
+
+        orphan_vectors = sorted(
+            eid for eid, r in remote_vectors.items()
+            if eid not in wanted_vectors and r.get("language") in LANGUAGES and _in_scope(r.get("scheme_id"))
+        )
+        orphan_keys = {item_key(remote_vectors[eid]) for eid in orphan_vectors}
+        orphan_items = sorted(
+            key for key, digest in remote_items.items()
+            if key not in wanted_items and (digest or key in orphan_keys) and _in_scope(key.split("#", 1)[0])
+        )
+        return {"pending": pending, "new": new, "changed": changed, "unchanged": unchanged,
+                "orphan_vectors": orphan_vectors, "orphan_items": orphan_items}
+
+    def sync(self, items: list, scheme_ids=None, dry_run: bool = False, prune: bool = True) -> dict:
+        """Embed and write only rows whose content hash differs from the table; delete orphans."""
+        plan = self.plan(items, scheme_ids)
+        print_plan(plan)
+        if dry_run:
+            return plan
+
+        counts = self._write(plan["pending"], 0)
+        if prune and (plan["orphan_vectors"] or plan["orphan_items"]):
+            with self.vectors_table.batch_writer() as batch:
+                for eid in plan["orphan_vectors"]:
+                    batch.delete_item(Key={"embedding_id": eid})
+            with self.knowledge_table.batch_writer() as batch:
+                for key in plan["orphan_items"]:
+                    scheme_id, section_id = key.split("#", 1)
+                    batch.delete_item(Key={"scheme_id": scheme_id, "section_id": section_id})
+            print(f"  ✓ Deleted {len(plan['orphan_vectors'])} orphan vectors, {len(plan['orphan_items'])} orphan items")
+        counts["deleted"] = len(plan["orphan_vectors"]) + len(plan["orphan_items"]) if prune else 0
+        return counts
+
+    # ── Writing ───────────────────────────────────────────────
+    def _write(self, pending: list, skipped: int) -> dict:
+        """Write (key, digest, item or None, rows) entries chunk by chunk, checkpointing each chunk."""
+        counts = {"knowledge": 0, "vectors": 0, "skipped": skipped, "failed": 0}
+        progress = Progress(sum(len(rows) for _, _, _, rows in pending))
+
+        for start in range(0, len(pending), self.chunk_items):
+            chunk = pending[start:start + self.chunk_items]
+
+            with self.knowledge_table.batch_writer(overwrite_by_pkeys=["scheme_id", "section_id"]) as batch:
+                for _, digest, item, _ in chunk:
+                    if item is not None:
+                        batch.put_item(Item={**item, "content_hash": digest})
+
+            rows = [row for _, _, _, item_rows in chunk for row in item_rows]
+            vectors = self.embedder.embed_many([row["text"] for row in rows], workers=self.workers)
+
+            stored = 0
+            with self.vectors_table.batch_writer(overwrite_by_pkeys=["embedding_id"]) as batch:
+                for row, vector in zip(rows, vectors):
+                    if vector is None:
+                        print(f"    ✗ Embedding failed for {row['embedding_id']} — will retry on the next run")
+                        counts["failed"] += 1
+                        continue
+                    batch.put_item(Item={**row, "content_hash": self._vector_digest(row),
+                                         "embedding": embeddings.encode(vector)})
+                    stored += 1
+
+            # Only after both batch writers have flushed
+            for key, digest, item, _ in chunk:
+                if item is not None:
+                    self.checkpoint.mark("knowledge", key, digest)
+                    counts["knowledge"] += 1
+            for row, vector in zip(rows, vectors):
+                if vector is not None:
+                    self.checkpoint.mark("vectors", row["embedding_id"], self._vector_digest(row))
+            self.checkpoint.save()
+
+            counts["vectors"] += stored
+            progress.advance(len(rows), f"({chunk[-1][0]})")
+
+        print(f"  ✓ {counts['knowledge']} knowledge items, {counts['vectors']} vectors written, "
+              f"{counts['skipped']} items skipped, {counts['failed']} failed  {self.embedder.stats}")
+        return counts
+
+
+def item_key(item: dict) -> str:
+    return f"{item['scheme_id']}#{item.get('section_id', 'overview')}"
+
+
+def print_plan(plan: dict, limit: int = 20):
+    """Human-readable diff of a sync plan."""
+    def _list(sign, ids):
+        for eid in ids[:limit]:
+            print(f"    {sign} {eid}")
+        if len(ids) > limit:
+            print(f"    … and {len(ids) - limit} more")
+
+    print(f"  Sync plan: {len(plan['new'])} new, {len(plan['changed'])} changed, {plan['unchanged']} unchanged vectors; "
+          f"{len(plan['orphan_vectors'])} orphan vectors, {len(plan['orphan_items'])} orphan items")
+    _list("+", plan["new"])
+    _list("~", plan["changed"])
+    _list("-", plan["orphan_vectors"])
+    _list("- item", plan["orphan_items"])
+    print(f"  Bedrock embedding calls needed: at most {len(plan['new']) + len(plan['changed'])}")
+
+
+def add_arguments(parser):
+    """CLI flags shared by the seed scripts."""
+    parser.add_argument("--fresh", action="store_true", help="ignore the checkpoint and rewrite everything")
+    parser.add_argument("--workers", type=int, default=embeddings.BATCH_WORKERS, help="parallel embedding calls")
+    parser.add_argument("--rate", type=float, default=RATE_PER_SEC, help="max Titan calls per second (0 = unlimited)")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file (default: per vectors table)")
+    parser.add_argument("--sync", action="store_true",
+                        help="diff against the tables by content hash: write only changed rows, delete orphans")
+    parser.add_argument("--dry-run", action="store_true", help="with --sync: print the diff and write nothing")
+    parser.add_argument("--keep-orphans", action="store_true", help="with --sync: do not delete orphans")
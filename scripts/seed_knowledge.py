@@ -1,21 +1,25 @@
 # VaaniSeva - Seed Script
 # Run this ONCE to populate DynamoDB with government scheme data
-# python scripts/seed_knowledge.py
+# python scripts/seed_knowledge.py [--fresh] [--workers N] [--rate N]
+# python scripts/seed_knowledge.py --sync [--dry-run]     ← after editing entries
+#
+# Safe to rerun: scripts/seed_engine.py keeps a local checkpoint and only
+# writes entries that are new or have changed since the last run. --sync diffs
+# against the tables themselves and also deletes rows for removed entries.
 
-import boto3
-import json
+import argparse
 import os
-import math
-from decimal import Decimal
+import sys
+import boto3
 from dotenv import load_dotenv
 
 load_dotenv()
 
-dynamodb = boto3.resource("dynamodb", region_name=os.environ["AWS_REGION"])
-bedrock  = boto3.client("bedrock-runtime", region_name=os.environ["AWS_REGION"])
+# Snapshot builder and embedding service live next to the Lambda handler
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambdas", "call_handler"))
 
-knowledge_table = dynamodb.Table(os.environ["DYNAMODB_KNOWLEDGE_TABLE"])
-vectors_table   = dynamodb.Table(os.environ["DYNAMODB_VECTORS_TABLE"])
+import embeddings   # noqa: E402
+import seed_engine  # noqa: E402
 
 # ── Scheme data ───────────────────────────────────────────────
 SCHEMES = [
@@ -4181,48 +4185,56 @@ EXTRA_SECTIONS = [
 ]
 
 
-def get_embedding(text: str) -> list:
-    response = bedrock.invoke_model(
-        modelId=os.environ["BEDROCK_EMBEDDING_MODEL_ID"],
-        body=json.dumps({"inputText": text}),
-        contentType="application/json",
-        accept="application/json"
-    )
-    result = json.loads(response["body"].read())
-    return result["embedding"]
+def connect():
+    """(knowledge table, vectors table, s3 client, embedding service) from the environment.
 
+    Clients are created here rather than at import so seed_task1c.py can import
+    the scheme data without AWS credentials in scope.
+    """
+    region   = os.environ["AWS_REGION"]
+    dynamodb = boto3.resource("dynamodb", region_name=region)
+    bedrock  = boto3.client("bedrock-runtime", region_name=region)
+    s3       = boto3.client("s3", region_name=region)
+    # Shares the Lambda's S3 embedding cache: unchanged texts are not re-embedded
+    embedder = embeddings.EmbeddingService(bedrock, s3, os.environ["S3_DOCUMENTS_BUCKET"],
+                                           model_id=os.environ["BEDROCK_EMBEDDING_MODEL_ID"])
+    return (dynamodb.Table(os.environ["DYNAMODB_KNOWLEDGE_TABLE"]),
+            dynamodb.Table(os.environ["DYNAMODB_VECTORS_TABLE"]), s3, embedder)
 
-def seed():
-    print("Seeding knowledge base...")
-    all_items = SCHEMES + EXTRA_SECTIONS
-    for item in all_items:
-        # Save to knowledge table
-        knowledge_table.put_item(Item=item)
-        print(f"  ✓ Knowledge: {item['scheme_id']} ({item['section_id']})")
 
-        # Generate embeddings for English and Hindi text, save to vectors table
-        for lang in ["en", "hi", "mr", "ta"]:
-            text_key = f"text_{lang}"
-            text = item.get(text_key, "")
-            if not text:
-                continue
+def seed(fresh: bool = False, workers: int = embeddings.BATCH_WORKERS,
+         rate: float = seed_engine.RATE_PER_SEC, checkpoint: str | None = None,
+         sync: bool = False, dry_run: bool = False, prune: bool = True):
+    print("Syncing knowledge base..." if sync else "Seeding knowledge base...")
+    knowledge_table, vectors_table, s3, embedder = connect()
+    engine = seed_engine.SeedEngine(knowledge_table, vectors_table, embedder, checkpoint_path=checkpoint,
+                                    workers=workers, rate=rate, fresh=fresh)
+    if sync:
+        result = engine.sync(SCHEMES + EXTRA_SECTIONS, dry_run=dry_run, prune=prune)
+        if dry_run:
+            print("\nDry run — nothing written.")
+            return
+        if not (result["knowledge"] or result["vectors"] or result["deleted"]):
+            print("\nAlready in sync — snapshot left as is.")
+            return
+    else:
+        engine.seed(SCHEMES + EXTRA_SECTIONS)
 
-            print(f"    Generating embedding for {item['scheme_id']}#{item['section_id']} ({lang})...")
-            embedding = [Decimal(str(v)) for v in get_embedding(text)]
+    print(f"\nDone! Knowledge base seeded with {len(SCHEMES)} scheme overviews and {len(EXTRA_SECTIONS)} FAQ sections ({len(SCHEMES) + len(EXTRA_SECTIONS)} total items).")
+    publish_snapshot(vectors_table, s3)
 
-            vectors_table.put_item(Item={
-                "embedding_id": f"{item['scheme_id']}#{item['section_id']}#{lang}",
-                "scheme_id": item["scheme_id"],
-                "section_id": item["section_id"],
-                "language": lang,
-                "text": text,
-                f"text_{lang}": text,
-                "embedding": embedding
-            })
-            print(f"    ✓ Vector stored: {item['scheme_id']}#{item['section_id']} ({lang})")
 
-    print(f"\nDone! Knowledge base seeded with {len(SCHEMES)} scheme overviews and {len(EXTRA_SECTIONS)} FAQ sections ({len(SCHEMES) + len(EXTRA_SECTIONS)} total items).")
+def publish_snapshot(vectors_table, s3):
+    """Rebuild the S3 embedding snapshot so Lambda cold starts skip the table scan."""
+    from vector_index import publish_snapshot as _publish
+    print("Publishing knowledge snapshot to S3...")
+    version = _publish(vectors_table, s3, os.environ["S3_DOCUMENTS_BUCKET"])
+    print(f"  ✓ Snapshot published (version={version})")
 
 
 if __name__ == "__main__":
-    seed()
+    parser = argparse.ArgumentParser(description="Seed the VaaniSeva knowledge and vector tables")
+    seed_engine.add_arguments(parser)
+    args = parser.parse_args()
+    seed(fresh=args.fresh, workers=args.workers, rate=args.rate, checkpoint=args.checkpoint,
+         sync=args.sync, dry_run=args.dry_run, prune=not args.keep_orphans)